@@ -1,268 +1,495 @@
-import re
-from dataclasses import dataclass
-import heapq
-
-INF = float("inf")
-#Определяем порядковый номер метрики в картеже для выбора критерия оценки
-CRITERION_NAMES = {
-    "Д": 0,
-    "В": 1,
-    "С": 2,
-}
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from components import Components
+from graph import CSRGraph, Graph, graph_fingerprint, iter_requests, np, read_input
+from landmarks import build_landmarks
+from pareto import solve_pareto
+from reach import find_reachable_many
+from route_cache import RouteCache
+from search import CRITERION_NAMES, ENGINES, compromise_key, restore_path, solve_route
+from search_stats import STATS_FORMATS, format_slowest, new_record, timed_solver, write_stats
+from tables import distance_table
+from trees import find_shortest_path_tree
+
 #Определяем полное наименование метрики
 CRITERION_FULL = {
     "Д": "ДЛИНА",
     "В": "ВРЕМЯ",
     "С": "СТОИМОСТЬ",
 }
-'''
-Создание структуры ребра, в которой отражены:
-    точка назначения - to
-    длина пути - length
-    стоимость пути - cost
-'''
-@dataclass
-class Edge:
-    to: int
-    length: int
-    time: int
-    cost: int
+#Наименьшее число городов, с которого plan_batch строит деревья векторным delta-stepping
+DELTA_STEPPING_MIN_VERTICES = 1000
 
-    def __str__(self):
-        return f" {self.to} (Д={self.length}, В={self.time}, С={self.cost})"
-
-'''
-Создание структуры графа, в который содержит словарь adj, где 
-u - вершина ребра, из которой оно исходит
-adj[u] - ребро из вершины u
-Так как граф двунаправленный, то необходимо добавлять два ребра с одинаковой стоимостью, временем и длиной,
-то есть из u в v и из v в u
 '''
-class Graph:
-    def __init__(self):
-        self.adj = {}
-
-    def add_vertex(self, v: int):
-        if v not in self.adj:
-            self.adj[v] = []
-
-    def add_edge(self, u: int, v: int, length: int, time: int, cost: int):
-        self.adj[u].append(Edge(v, length, time, cost))
-        self.adj[v].append(Edge(u, length, time, cost))
-
-    def __str__(self):
-        result = []
-        for u in sorted(self.adj):
-            edges = ", ".join(str(e) for e in self.adj[u])
-            result.append(f"{u}: {edges}")
-        return "\n".join(result)
-
-'''
-Функция read_input принимает на вход название файла в виде строки и извлекают из него:
-1. Названия городов и их идентификаторы
-2. Ребра для создания итогового графа, определенного структурой выше
-3. Запросы для создания маршрутов и параметры сортировки
-'''
-def read_input(filename):
-    cities = {}
-    city_name_to_id = {}
-    graph = Graph()
-    requests = []
-
-    section = None
-    try:
-        with open(filename, encoding="utf-8") as f:
-            for line in f:
-                #Очистка строки от пробелов с начал и конца строки, пустые строки пропускаются
-                line = line.strip()
-                if not line:
-                    continue
-                #Название секции с информацией о данных
-                if line.startswith("[") and line.endswith("]"):
-                    section = line
-                    continue
-                #Выделение города и его идентификатора из секции с городами(CITIES)
-                if section == "[CITIES]":
-                    city_id_str, name = line.split(":", 1)
-                    city_id = int(city_id_str.strip())
-                    name = name.strip()
-
-                    cities[city_id] = name
-                    city_name_to_id[name] = city_id
-                    graph.add_vertex(city_id)
-
-                # Выделение точек ребра и его основных характеристик в секции ROADS
-                elif section == "[ROADS]":
-                    left, right = line.split(":")
-                    u_str, v_str = left.split("-")
-
-                    u = int(u_str.strip())
-                    v = int(v_str.strip())
-
-                    length, time, cost = map(int, right.split(","))
-
-                    graph.add_edge(u, v, length, time, cost)
-
-                # Выделение маршрута и параметров сортировки в секции REQUESTS
-                elif section == "[REQUESTS]":
-                    path_part, priority_part = line.split("|")
-
-                    start_name, end_name = map(str.strip, path_part.split("->"))
-                    priorities = re.findall(r"[ДВС]", priority_part)
-
-                    requests.append((start_name, end_name, priorities))
-
-    except FileNotFoundError:
-        raise RuntimeError(f"Файл {filename} не найден")
-    except ValueError:
-        raise RuntimeError("Ошибка формата входных данных")
-
-    return cities, city_name_to_id, graph, requests
-
+Функция plan_batch группирует запросы по начальному городу и критерию и строит одно дерево
+кратчайших путей на группу, после чего отвечает на все конечные точки группы по общему prev.
+Для CSRGraph от DELTA_STEPPING_MIN_VERTICES городов с положительными весами и установленным NumPy деревья строятся
+алгоритмом delta-stepping (delta_stepping.py), который даёт те же деревья.
+Возвращает словарь (начало, конец, критерий) -> результат solve_route или ошибка восстановления пути
 '''
-Функция find_optimal_path принимает на вход:
-1. Граф, в котором надо найти путь, оптимизированный по параметру criterion
-2. Точку отправления - start
-3. Точку назначения - end
-4. Номер параметра, по которому будет оптимизироваться путь
-'''
-def find_optimal_path(graph:Graph, start: int, end: int, criterion: int):
+def plan_batch(graph: Graph, city_name_to_id: dict[str, int], requests: list) -> dict:
+    groups = {}
+    for start_name, end_name, priorities in requests:
+        #Неизвестные города пропускаются, ошибка о них возникнет при формировании ответа, как и без пакетного режима
+        if start_name not in city_name_to_id or end_name not in city_name_to_id:
+            continue
 
-    if start not in graph.adj or end not in graph.adj:
-        raise ValueError("Начальная или конечная вершина отсутствует в графе")
+        start_id = city_name_to_id[start_name]
+        end_id = city_name_to_id[end_name]
+        if start_id == end_id:
+            continue
 
-    if criterion not in (0, 1, 2):
-        raise ValueError("Некорректный критерий оптимизации")
+        for crit in priorities:
+            groups.setdefault((start_id, crit), set()).add(end_id)
 
-    dist = {v: INF for v in graph.adj} #Список минимальных значений по выбранному параметру
-    dist[start] = 0 #Начальная точка инициализируется 0, так как в неё не должен алгоритм вернуться
-    prev = {} #Кортеж предыдущих значений вершин для восстановления пути
+    vectorized = np is not None and isinstance(graph, CSRGraph) and len(graph) >= DELTA_STEPPING_MIN_VERTICES
+    if vectorized:
+        from delta_stepping import delta_stepping_routes
 
-    total_length = None
-    total_time = None
-    total_cost = None
+    answers = {}
+    for (start_id, crit), end_ids in groups.items():
+        criterion = CRITERION_NAMES[crit]
+        if vectorized and graph.weight_range(criterion)[0] >= 1:
+            for end_id, route in delta_stepping_routes(graph, start_id, criterion, end_ids).items():
+                answers[(start_id, end_id, crit)] = RuntimeError("Путь не существует") if route is None else route
+            continue
 
-    pq = [(0, start, 0, 0, 0)] #Инициализация значений для очереди, в стартовой точки расстояние, стоимость и время равны 0
+        prev, dist, totals = find_shortest_path_tree(graph, start_id, criterion)
 
+        for end_id in end_ids:
+            try:
+                path = restore_path(prev, start_id, end_id)
+            except RuntimeError as e:
+                answers[(start_id, end_id, crit)] = e
+                continue
 
-    while pq: #Алгоритм продолжается, пока в очереди есть значения
-        cur_weight, u, cur_length, cur_time, cur_cost = heapq.heappop(pq) #В отсортированной по убыванию очереди берется первое значение ребра с наименьшими параметрами
+            answers[(start_id, end_id, crit)] = (*totals[end_id], path)
 
-        if cur_weight > dist[u]:
-            continue
+    return answers
 
-        if u == end: #Алгоритм завершается, если достигнутна конечная точка
-            total_length = cur_length
-            total_time = cur_time
-            total_cost = cur_cost
-            break
-
-        for e in graph.adj[u]: #Рассматриваем ребра для вершины u
-            weights = [e.length, e.time, e.cost] #Извлекаем метрики ребра
-            new_weight = cur_weight + weights[criterion] #Суммируем текущее значение для достигнутой точки со следующим по оптимизируемой метрике
-
-            if new_weight < dist[e.to]:#Если полученное значение меньше определенного на прошлых шагах минимального, то обновляем минимальное значение
-                dist[e.to] = new_weight
-                prev[e.to] = u
-                heapq.heappush(
-                    pq,
-                    (new_weight, e.to,cur_length + e.length,cur_time + e.time,cur_cost + e.cost)
-                ) #Добавляем в очередь значения полученной новой точки
-
-    return prev, total_length, total_time, total_cost
 '''
-Функция restore_path восстанавливает путь по предыдущим значения из алгоритма по поиску оптимизированного пути
+Запрос таблицы "A,B,C -> X,Y,Z | (Д,В,С)" отличается от обычного запятыми в списке городов.
+Название, которое целиком совпадает с названием города, считается одним городом даже с запятой
 '''
-def restore_path(prev: dict[int, int], start: int, end: int) -> list[int]:
-    path = []
-    cur = end #Восстановление пути от конечной точки
-    visited = set() #Посещенные вершины
+def is_table_request(city_name_to_id: dict[str, int], request) -> bool:
+    start_name, end_name, _ = request
+    return any("," in name and name not in city_name_to_id for name in (start_name, end_name))
 
-    if cur not in prev:
-        raise RuntimeError("Путь не существует")
+def _table_names(city_name_to_id: dict[str, int], names: str) -> list[str]:
+    if names in city_name_to_id:
+        return [names]
+    return [name.strip() for name in names.split(",")]
 
-    while cur != start:
-        if cur in visited:
-            raise RuntimeError("Цикл в prev — путь некорректен")
+'''
+Функция build_table_block формирует текстовый блок ответа на запрос таблицы по первому критерию из приоритетов:
+по строке на каждую пару начального и конечного города.
+solve(начальные города, конечные города, критерий) возвращает DistanceTable
+'''
+def build_table_block(city_name_to_id: dict[str, int], request, solve) -> str:
+    start_names, end_names, priorities = request
+    origin_names = _table_names(city_name_to_id, start_names)
+    destination_names = _table_names(city_name_to_id, end_names)
+    crit = priorities[0]
+
+    table = solve([city_name_to_id[name] for name in origin_names],
+                  [city_name_to_id[name] for name in destination_names], crit)
+
+    block = f"{start_names} -> {end_names} | ({'|'.join(priorities)})\n"
+    block += f"ТАБЛИЦА ({CRITERION_FULL[crit]}):\n"
+    for i, origin_name in enumerate(origin_names):
+        for j, destination_name in enumerate(destination_names):
+            totals = table.get(i, j)
+            if totals is None:
+                block += f"{origin_name} -> {destination_name} | Путь не существует\n"
+            else:
+                block += f"{origin_name} -> {destination_name} | Д={totals[0]}, В={totals[1]}, С={totals[2]}\n"
+    return block
 
-        visited.add(cur)
-        path.append(cur)
-        cur = prev[cur] #Для текущей вершины берем значение предыдущей
+'''
+Запрос достижимости "Москва -> * | В<=300" или "A,B -> * | В<=300" для нескольких начальных городов.
+Вместо приоритетов в нём хранится одна строка "критерий<=бюджет"
+'''
+def is_reach_request(request) -> bool:
+    return request[1] == "*"
 
-    path.append(start)
-    path.reverse() #Так как восстановление идет от конечной точки, то необходимо перевернуть путь
-    return path
 '''
-Функция для определения положения итогового параметра в зависимости от его порядка из запроса
+Функция build_reach_block формирует текстовый блок ответа на запрос достижимости: для каждого начального города
+число достижимых из него городов и по строке на каждый город в порядке возрастания значения критерия.
+solve(начальные города, бюджет, критерий) возвращает результат в формате find_reachable_many
 '''
-def compromise_key(result, priorities):
-    values = {"Д": result[0], "В": result[1], "С": result[2]}
-    return tuple(values[p] for p in priorities)
+def build_reach_block(cities: dict[int, str], city_name_to_id: dict[str, int], request, solve) -> str:
+    start_names, _, (limit,) = request
+    crit, budget = limit.split("<=")
+    origin_names = list(dict.fromkeys(_table_names(city_name_to_id, start_names)))
+
+    results = solve([city_name_to_id[name] for name in origin_names], int(budget), crit)
+
+    lines = [f"{start_names} -> * | {limit}"]
+    for origin_name in origin_names:
+        _, dist, totals = results[city_name_to_id[origin_name]]
+        #При нескольких начальных городах перед каждым списком указывается, из какого он города
+        source = f"{origin_name}: " if len(origin_names) > 1 else ""
+        lines.append(f"{source}ДОСТИЖИМО ({CRITERION_FULL[crit]} <= {budget}): {len(dist)}")
+        for v in sorted(dist, key=lambda v: (dist[v], v)):
+            d, t, c = totals[v]
+            lines.append(f"{cities[v]} | Д={d}, В={t}, С={c}")
+    return "\n".join(lines) + "\n"
 
+'''
+Функция build_route_block формирует текстовый блок ответа на один запрос.
+solve(start_id, end_id, критерий) возвращает результат в формате solve_route
+'''
+def build_route_block(cities: dict[int, str], city_name_to_id: dict[str, int], request, solve) -> str:
+    start_name, end_name, priorities = request
+
+    start_id = city_name_to_id[start_name]
+    end_id = city_name_to_id[end_name]
+    routes = f"{start_name} -> {end_name} | ({'|'.join(priorities)})\n"
+
+    if start_id == end_id:
+        routes += "Вы уже находитесь в конечной точке\n"
+        return routes
+
+    #Для каждой метрики определяем полученные значения
+    results_metricks = {}
+
+    for i in priorities:#По приоритетам вычисляем оптимальный путь
+        #Если конечная точка не лежит в предыдущих, то завершаем обработку запроса, так как пути не существует
+        try:
+            results_metricks[i] = solve(start_id, end_id, i)
+        except RuntimeError as e:
+            routes += f"Ошибка восстановления пути: {e}\n"
+            return routes
+
+    #Нахождение метрики с компромиссным путем
+    best_metricks = min(
+        results_metricks.keys(),
+        key=lambda k: compromise_key(results_metricks[k], priorities)
+    )
+    #Преобразование результата в текстовый формат для записи в файл
+    for crit in ["Д", "В", "С"]:
+        d, t, c, path = results_metricks[crit]
+        route = " -> ".join(cities[v] for v in path)
+        routes += f"{CRITERION_FULL[crit]}: {route} | Д={d}, В={t}, С={c}\n"
 
+    d, t, c, path = results_metricks[best_metricks]
+    route = " -> ".join(cities[v] for v in path)
+    routes += f"КОМПРОМИСС: {route} | Д={d}, В={t}, С={c}\n"
+    return routes
 
-#Просматриваем запросы для поиска оптимального запроса
-try:
-    cities, city_name_to_id, graph, requests = read_input("input.txt")
+'''
+Функция ответа на запрос вместе с графом для процессов-обработчиков iter_parallel.
+Процессы создаются через fork и получают её копией памяти родителя, без повторной сериализации графа
+'''
+_worker_answer = None
 
-    all_result = []
+def _answer_chunk(requests: list) -> list:
+    return [_worker_answer(request) for request in requests]
 
-    for request in requests:
+'''
+Генератор iter_parallel применяет answer к запросам в workers процессах порциями по chunk_size запросов
+и возвращает ответы в исходном порядке. Запросы читаются из итератора постепенно: одновременно
+в обработке не больше двух порций на процесс, поэтому память не растёт с числом запросов.
+При workers=1 или если платформа не поддерживает fork (Windows), запросы обрабатываются в текущем процессе.
+Кэш маршрутов в каждом процессе свой, поэтому в файл кэша попадают только маршруты текущего процесса
+'''
+def iter_parallel(answer, requests, workers: int = 1, chunk_size: int = 64):
+    global _worker_answer
 
-        start_name, end_name, priorities = request
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("Некорректное число процессов или размер порции")
 
-        start_id = city_name_to_id[start_name]
-        end_id = city_name_to_id[end_name]
-        routes = f"{start_name} -> {end_name} | ({'|'.join(priorities)})\n"
+    if workers == 1 or "fork" not in multiprocessing.get_all_start_methods():
+        for request in requests:
+            yield answer(request)
+        return
 
-        if start_id == end_id:
-            routes += "Вы уже находитесь в конечной точке\n"
-            all_result.append(routes)
-            continue
+    requests = iter(requests)
+    _worker_answer = answer
+    try:
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as pool:
+            pending = deque()
+            while True:
+                chunk = [request for _, request in zip(range(chunk_size), requests)]
+                if chunk:
+                    pending.append(pool.submit(_answer_chunk, chunk))
+                if pending and (not chunk or len(pending) >= 2 * workers):
+                    yield from pending.popleft().result()
+                elif not chunk:
+                    break
+    finally:
+        _worker_answer = None
 
-        #Для каждой метрики определяем полученные значения
-        results_metricks = {}
+'''
+Функция run_parallel - обработка списка запросов через iter_parallel с результатом в виде списка
+'''
+def run_parallel(answer, requests: list, workers: int = 1, chunk_size: int = 64) -> list:
+    return list(iter_parallel(answer, requests, workers, chunk_size))
 
-        for i in priorities:#По приоритетам вычисляем оптимальный путь
-            prev, total_length, total_time, total_cost = find_optimal_path(graph, start_id, end_id, CRITERION_NAMES[i])
-            #Если не нашлось предыдущих или конечная точка не лежит в предыдущих, то завершаем цикл, так как пути не существует
+'''
+Обёртка над функцией solve, которая сначала ищет маршрут в кэше и сохраняет в него новые результаты,
+включая отсутствие пути
+'''
+def _cached_solver(cache: RouteCache, solve):
+    def cached_solve(start_id, end_id, crit):
+        answer = cache.get(start_id, end_id, crit)
+        if answer is None:
             try:
-                path = restore_path(prev, start_id, end_id)
+                answer = solve(start_id, end_id, crit)
             except RuntimeError as e:
-                routes += f"Ошибка восстановления пути: {e}\n"
-                all_result.append(routes)
-                break
-
-            results_metricks[i] = (total_length, total_time, total_cost, path)
-
-        if not results_metricks:
-            continue
-
-        #Нахождение метрики с компромиссным путем
-        best_metricks = min(
-            results_metricks.keys(),
-            key=lambda k: compromise_key(results_metricks[k], priorities)
-        )
-        #Преобразование результата в текстовый формат для записи в файл
-        for crit in ["Д", "В", "С"]:
-            d, t, c, path = results_metricks[crit]
-            route = " -> ".join(cities[v] for v in path)
-            routes += f"{CRITERION_FULL[crit]}: {route} | Д={d}, В={t}, С={c}\n"
-
-        d, t, c, path = results_metricks[best_metricks]
-        route = " -> ".join(cities[v] for v in path)
-        routes += f"КОМПРОМИСС: {route} | Д={d}, В={t}, С={c}\n"
-        all_result.append(routes)
-
-    # Запись результатов в итоговый файл
-    with open("output.txt", "w", encoding="utf-8") as f:
-        for block in all_result:
-            f.write(block)
-            f.write("\n\n")
+                answer = e
+            cache.put(start_id, end_id, crit, answer)
 
-except Exception as e:
-    print(f"Ошибка: {e}\n")
+        if isinstance(answer, RuntimeError):
+            raise answer
+        return answer
 
+    return cached_solve
 
+'''
+Функция _component_solver оборачивает solve проверкой компонент связности: если города лежат в разных компонентах,
+сразу выбрасывается та же ошибка, что и при неудачном поиске, без обхода всей компоненты начального города
+'''
+def _component_solver(components: Components, solve):
+    def checked_solve(start_id, end_id, crit):
+        if not components.connected(start_id, end_id):
+            raise RuntimeError("Путь не существует")
+        return solve(start_id, end_id, crit)
 
+    return checked_solve
 
+'''
+Функция main читает входной файл, просматривает запросы для поиска оптимального маршрута
+и записывает результаты в выходной файл.
+При batch=True запросы обрабатываются пакетно через plan_batch, результат при этом не меняется.
+При pareto=True маршруты выбираются из парето-фронта, построенного один раз на запрос (solve_pareto):
+лучший по критерию, а при равенстве - по остальным критериям в порядке приоритетов.
+engine задаёт алгоритм find_optimal_path, для "alt" после чтения графа строятся landmark_count ориентиров,
+а для "bucket" определяются диапазоны весов, по которым выбирается очередь.
+Если задан ch_index, маршруты ищутся по заранее построенным иерархиям сжатия из этого файла (contraction.py);
+значения критериев оптимальны, но при путях равного веса маршрут и компромисс могут отличаться от обычного поиска.
+cache_size включает кэш маршрутов RouteCache на заданное число записей, а cache_file сохраняет его между запусками.
+workers и chunk_size задают число процессов и размер порции запросов для iter_parallel.
+При stream=True запросы читаются из файла по одному, а каждый ответ сразу записывается в выходной файл,
+поэтому память не зависит от числа запросов; при ошибке в выходном файле остаются уже найденные ответы.
+Если задан snapshot, города и граф загружаются из двоичного снимка (snapshot.py), а из input_file читаются только запросы.
+При all_pairs=True заранее строятся таблицы путей между всеми парами городов (all_pairs.py), если они помещаются
+в all_pairs_memory мегабайт, иначе используется обычный поиск.
+Если задан формат stats ("json" или "csv"), для каждого запроса сохраняются время ответа и поиска по критериям,
+а для алгоритма Дейкстры - ещё и счётчики операций с очередью, в файл рядом с выходным (output.stats.json);
+stats_top самых медленных запросов выводятся в консоль.
+Запрос таблицы "A,B -> X,Y | (...)" отвечается одной таблицей distance_table по первому критерию из приоритетов.
+Запрос достижимости "A -> * | В<=300" (или "A,B -> * | ...") отвечается списком городов из find_reachable_many.
+При components=True после загрузки графа находятся компоненты связности (components.py), и запросы между городами
+разных компонент получают ответ "Путь не существует" без поиска.
+При simplify=True маршруты ищутся по упрощённому графу SimplifiedGraph (simplify.py) без доминируемых параллельных
+дорог и с цепочками городов степени 2, сжатыми в одну дорогу; маршруты при этом не меняются
+'''
+def main(input_file: str = "input.txt", output_file: str = "output.txt", compact: bool = False,
+         batch: bool = False, pareto: bool = False, engine: str = "dijkstra", landmark_count: int = 8,
+         ch_index: str | None = None, cache_size: int | None = None, cache_file: str | None = None,
+         workers: int = 1, chunk_size: int = 64, stream: bool = False, snapshot: str | None = None,
+         all_pairs: bool = False, all_pairs_memory: int = 1024, stats: str | None = None, stats_top: int = 5,
+         components: bool = True, simplify: bool = False):
+    try:
+        if batch and stream:
+            raise ValueError("Пакетный режим требует всех запросов сразу и несовместим с потоковой обработкой")
+        if simplify and engine != "dijkstra":
+            raise ValueError("Упрощённый граф поддерживается только алгоритмом Дейкстры")
+        if stats is not None and stats not in STATS_FORMATS:
+            raise ValueError("Некорректный формат файла статистики")
+
+        if snapshot is not None:
+            from snapshot import load_snapshot
+            cities, city_name_to_id, graph = load_snapshot(snapshot)
+            requests = iter_requests(input_file) if stream else list(iter_requests(input_file))
+        else:
+            cities, city_name_to_id, graph, requests = read_input(input_file, compact, stream)
+
+        table = None
+        if all_pairs and not batch and ch_index is None:
+            from all_pairs import AllPairs
+            table = AllPairs.build(graph, all_pairs_memory << 20)
+            if table is None:
+                print("Таблицы всех пар не помещаются в заданный объём памяти, используется обычный поиск")
+
+        #Счётчики текущего поиска для статистики, их заполняет только алгоритм Дейкстры
+        search = None
+        if batch:
+            answers = plan_batch(graph, city_name_to_id, requests)
+
+            def solve(start_id, end_id, crit):
+                answer = answers[(start_id, end_id, crit)]
+                if isinstance(answer, RuntimeError):
+                    raise answer
+                return answer
+        elif ch_index is not None:
+            from contraction import load_index
+            index = load_index(ch_index, graph)
+
+            def solve(start_id, end_id, crit):
+                prev, total_length, total_time, total_cost = index[crit].query(start_id, end_id)
+                return total_length, total_time, total_cost, restore_path(prev, start_id, end_id)
+        elif table is not None:
+            solve = table.route
+        elif simplify:
+            from simplify import SimplifiedGraph
+            #Начала и концы известных заранее запросов в цепочки не сжимаются
+            keep = [] if stream else [city_name_to_id[name] for request in requests for name in request[:2]
+                                      if name in city_name_to_id]
+            simplified = SimplifiedGraph.build(graph, keep)
+
+            def solve(start_id, end_id, crit):
+                if start_id not in simplified or end_id not in simplified:
+                    #Город внутри сжатой цепочки: поиск по исходному графу
+                    return solve_route(graph, start_id, end_id, crit)
+                prev, total_length, total_time, total_cost = simplified.find_optimal_path(
+                    start_id, end_id, CRITERION_NAMES[crit]
+                )
+                return total_length, total_time, total_cost, restore_path(prev, start_id, end_id)
+        else:
+            landmarks = build_landmarks(graph, landmark_count) if engine == "alt" else None
+            if engine == "bucket":
+                #Диапазоны весов считаются один раз до запуска процессов-обработчиков
+                for criterion in range(3):
+                    graph.weight_range(criterion)
+            if stats is not None and engine == "dijkstra" and not pareto:
+                search = [None]
+
+            def solve(start_id, end_id, crit):
+                return solve_route(graph, start_id, end_id, crit, engine, landmarks,
+                                   search[0] if search is not None else None)
+
+        cache = None
+        if cache_size is not None or cache_file is not None:
+            max_entries = cache_size if cache_size is not None else 100_000
+            if cache_file is not None:
+                cache = RouteCache.load(cache_file, graph_fingerprint(graph), max_entries)
+            else:
+                cache = RouteCache(max_entries)
+            solve = _cached_solver(cache, solve)
+
+        #В пакетном режиме и с таблицами всех пар недостижимые города и так определяются без поиска
+        component_index = None
+        if components and not batch and table is None:
+            component_index = Components.from_graph(graph)
+            solve = _component_solver(component_index, solve)
+
+        def answer(request):
+            if pareto:
+                fronts = {}
+
+                def solve_request(start_id, end_id, crit):
+                    return solve_pareto(graph, start_id, end_id, crit, request[2], fronts)
+
+                if component_index is not None:
+                    solve_request = _component_solver(component_index, solve_request)
+            else:
+                solve_request = solve
+
+            if is_reach_request(request):
+                def solve_request(origin_ids, budget, crit):
+                    return find_reachable_many(graph, origin_ids, CRITERION_NAMES[crit], budget)
+
+                def build_block(solve_block):
+                    return build_reach_block(cities, city_name_to_id, request, solve_block)
+            elif is_table_request(city_name_to_id, request):
+                def solve_request(origin_ids, destination_ids, crit):
+                    return distance_table(graph, origin_ids, destination_ids, CRITERION_NAMES[crit],
+                                          components=component_index)
+
+                def build_block(solve_block):
+                    return build_table_block(city_name_to_id, request, solve_block)
+            else:
+                def build_block(solve_block):
+                    return build_route_block(cities, city_name_to_id, request, solve_block)
+
+            if stats is None:
+                return build_block(solve_request)
+
+            #Вместе с ответом возвращается запись статистики, в том числе из процессов-обработчиков
+            record = new_record(request)
+            started = perf_counter()
+            block = build_block(timed_solver(solve_request, record, search))
+            record["time"] = perf_counter() - started
+            return block, record
+
+        records = []
+
+        def write_results(f, results):
+            for block in results:
+                if stats is not None:
+                    block, record = block
+                    records.append(record)
+                f.write(block)
+                f.write("\n\n")
+
+        if stream:
+            #Каждый ответ сразу попадает в буфер выходного файла
+            with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+                write_results(f, iter_parallel(answer, requests, workers, chunk_size))
+        else:
+            all_result = run_parallel(answer, requests, workers, chunk_size)
+
+            # Запись результатов в итоговый файл
+            with open(output_file, "w", encoding="utf-8") as f:
+                write_results(f, all_result)
+
+        if cache is not None:
+            if cache_file is not None:
+                cache.save(cache_file, graph_fingerprint(graph))
+            cache_stats = cache.stats()
+            print(f"Кэш маршрутов: попаданий {cache_stats['hits']} "
+                  f"(из них обратных без пути {cache_stats['reverse_hits']}), "
+                  f"промахов {cache_stats['misses']}, записей {cache_stats['entries']}")
+
+        if stats is not None:
+            stats_file = write_stats(records, output_file, stats, stats_top)
+            print(f"Статистика запросов сохранена в {stats_file}")
+            if records:
+                print(format_slowest(records, stats_top))
+
+    except Exception as e:
+        print(f"Ошибка: {e}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Поиск оптимальных маршрутов между городами")
+    parser.add_argument("input_file", nargs="?", default="input.txt")
+    parser.add_argument("output_file", nargs="?", default="output.txt")
+    parser.add_argument("--compact", action="store_true", help="хранить граф в формате CSR")
+    parser.add_argument("--batch", action="store_true", help="одно дерево кратчайших путей на начальный город и критерий")
+    parser.add_argument("--pareto", action="store_true", help="выбирать маршруты из парето-фронта")
+    parser.add_argument("--engine", choices=ENGINES, default="dijkstra", help="алгоритм поиска пути")
+    parser.add_argument("--landmarks", type=int, default=8, help="число ориентиров для --engine alt")
+    parser.add_argument("--ch", metavar="INDEX_FILE", default=None,
+                        help="искать маршруты по индексу иерархий сжатия (при путях равного веса маршрут "
+                             "может отличаться от обычного поиска)")
+    parser.add_argument("--cache-size", type=int, default=None, help="кэшировать до N маршрутов")
+    parser.add_argument("--cache-file", default=None, help="файл для хранения кэша маршрутов между запусками")
+    parser.add_argument("--workers", type=int, default=1, help="число процессов для обработки запросов")
+    parser.add_argument("--chunk-size", type=int, default=64, help="число запросов в одной порции для процесса")
+    parser.add_argument("--stream", action="store_true", help="читать запросы и записывать ответы по одному")
+    parser.add_argument("--snapshot", metavar="SNAPSHOT_FILE", default=None, help="загрузить граф из двоичного снимка")
+    parser.add_argument("--all-pairs", action="store_true", help="заранее найти пути между всеми парами городов")
+    parser.add_argument("--all-pairs-memory", type=int, default=1024, metavar="MB",
+                        help="ограничение памяти для --all-pairs в мегабайтах")
+    parser.add_argument("--stats", choices=STATS_FORMATS, default=None,
+                        help="сохранить статистику поиска по запросам рядом с выходным файлом")
+    parser.add_argument("--stats-top", type=int, default=5, help="число самых медленных запросов в сводке")
+    parser.add_argument("--no-components", action="store_true",
+                        help="не строить компоненты связности для быстрого ответа на недостижимые запросы")
+    parser.add_argument("--simplify", action="store_true",
+                        help="удалить доминируемые параллельные дороги и сжать цепочки городов степени 2")
+    args = parser.parse_args()
+
+    main(args.input_file, args.output_file, compact=args.compact, batch=args.batch,
+         pareto=args.pareto, engine=args.engine, landmark_count=args.landmarks,
+         ch_index=args.ch, cache_size=args.cache_size, cache_file=args.cache_file,
+         workers=args.workers, chunk_size=args.chunk_size, stream=args.stream,
+         snapshot=args.snapshot, all_pairs=args.all_pairs, all_pairs_memory=args.all_pairs_memory,
+         stats=args.stats, stats_top=args.stats_top, components=not args.no_components, simplify=args.simplify)
@@ -0,0 +1,174 @@
+from graph import np
+from search import CRITERION_NAMES
+from trees import find_shortest_path_tree
+
+#Ограничение памяти для таблиц всех пар по умолчанию, 1 ГиБ
+DEFAULT_MEMORY_LIMIT = 1 << 30
+#Значение "бесконечность" для расстояний int32: сумма двух таких значений ещё помещается в int32
+INF32 = (1 << 30) - 1
+
+'''
+Таблицы кратчайших путей между всеми парами городов, в которых отражены:
+    ids, index - идентификаторы городов по возрастанию и их позиции
+    pred[criterion] - матрица n x n, pred[s][v] - позиция предыдущего города на пути из s в v по критерию criterion,
+                      или n, если пути нет; хранится в uint16, если городов меньше 65535, иначе в int32
+    edges[criterion] - значения (длина, время, стоимость) дороги, выбранной между соседними городами пути
+Матрица предшественников вместо матрицы следующих вершин хранит для каждого начального города то же дерево,
+что строит find_shortest_path_tree, поэтому восстановленные пути совпадают с обычным поиском.
+Матрицы расстояний нужны только при построении и затем освобождаются
+'''
+class AllPairs:
+    def __init__(self, ids: list[int], pred: list, edges: list[dict]):
+        self.ids = ids
+        self.index = {v: i for i, v in enumerate(ids)}
+        self.pred = pred
+        self.edges = edges
+        #Многомерный memoryview даёт быстрый доступ к элементу без создания скаляров NumPy
+        self._pred_views = [memoryview(matrix) for matrix in pred]
+
+    '''
+    Оценка памяти в байтах для графа из n городов с наибольшим значением дороги max_value:
+    матрицы предшественников по трём критериям и на время построения матрица расстояний с временным массивом
+    '''
+    @staticmethod
+    def estimate_memory(n: int, max_value: int = 0) -> int:
+        pred_size = 2 if n < 65535 else 4
+        dist_size = 4 if max_value * max(n - 1, 1) < INF32 else 8
+        return 3 * n * n * pred_size + 2 * n * n * dist_size
+
+    '''
+    Построение таблиц. method: "floyd" - векторизованный алгоритм Флойда-Уоршелла (для критериев с дорогами
+    нулевого веса - поиск из каждого города), "dijkstra" - поиск из каждого города,
+    "auto" - выбор по плотности графа. Если таблицы не помещаются в memory_limit байт или NumPy не установлен,
+    возвращается None
+    '''
+    @classmethod
+    def build(cls, graph, memory_limit: int = DEFAULT_MEMORY_LIMIT, method: str = "auto") -> "AllPairs | None":
+        if method not in ("auto", "floyd", "dijkstra"):
+            raise ValueError("Некорректный способ построения таблиц всех пар")
+        if np is None:
+            return None
+
+        ids = sorted(graph.vertices())
+        index = {v: i for i, v in enumerate(ids)}
+        n = len(ids)
+
+        #Для каждой пары соседей и критерия - первая дорога с наименьшим весом, как выбирает алгоритм Дейкстры
+        edges = [{}, {}, {}]
+        max_value = 0
+        for u in ids:
+            for v, length, time, cost in graph.neighbors(u):
+                values = (length, time, cost)
+                max_value = max(max_value, *values)
+                key = (index[u], index[v])
+                for criterion in range(3):
+                    best = edges[criterion].get(key)
+                    if best is None or values[criterion] < best[criterion]:
+                        edges[criterion][key] = values
+
+        if cls.estimate_memory(n, max_value) > memory_limit:
+            return None
+
+        if method == "auto":
+            #Флойд-Уоршелл выполняет n^3 векторных операций, поиск из каждого города - около n * m операций
+            #интерпретатора, каждая из которых по замерам примерно в 600 раз медленнее
+            method = "floyd" if n * n < 600 * len(edges[0]) else "dijkstra"
+
+        pred_type = np.uint16 if n < 65535 else np.int32
+        pred = []
+        for criterion in range(3):
+            #Правило выбора предка в _floyd_pred верно только при положительных весах: при дорогах нулевого веса
+            #алгоритм Дейкстры извлекает вершины с равным расстоянием не по возрастанию номера
+            positive = all(values[criterion] > 0 for values in edges[criterion].values())
+            if method == "floyd" and positive:
+                pred.append(_floyd_pred(n, edges[criterion], criterion, max_value, pred_type))
+            else:
+                pred.append(_dijkstra_pred(graph, ids, index, criterion, pred_type))
+
+        return cls(ids, pred, edges)
+
+    '''
+    Маршрут start_id -> end_id по критерию crit в формате solve_route: (длина, время, стоимость, путь)
+    '''
+    def route(self, start_id: int, end_id: int, crit: str):
+        criterion = CRITERION_NAMES[crit]
+        if start_id not in self.index or end_id not in self.index:
+            raise ValueError("Начальная или конечная вершина отсутствует в графе")
+
+        s = self.index[start_id]
+        cur = self.index[end_id]
+        view = self._pred_views[criterion]
+        edges = self.edges[criterion]
+        n = len(self.ids)
+
+        if view[s, cur] == n:
+            raise RuntimeError("Путь не существует")
+
+        path = [end_id]
+        total_length = total_time = total_cost = 0
+        while cur != s:
+            #Путь не длиннее числа городов, иначе матрица предшественников содержит цикл
+            if len(path) > n:
+                raise RuntimeError("Матрица предшественников содержит цикл")
+            before = view[s, cur]
+            length, time, cost = edges[(before, cur)]
+            total_length += length
+            total_time += time
+            total_cost += cost
+            path.append(self.ids[before])
+            cur = before
+
+        path.reverse()
+        return total_length, total_time, total_cost, path
+
+'''
+Матрица предшественников из деревьев find_shortest_path_tree для каждого начального города
+'''
+def _dijkstra_pred(graph, ids: list[int], index: dict[int, int], criterion: int, pred_type):
+    n = len(ids)
+    pred = np.full((n, n), n, dtype=pred_type)
+    for s, start in enumerate(ids):
+        prev = find_shortest_path_tree(graph, start, criterion)[0]
+        if prev:
+            row = pred[s]
+            row[[index[v] for v in prev]] = [index[u] for u in prev.values()]
+    return pred
+
+'''
+Матрица предшественников по расстояниям алгоритма Флойда-Уоршелла. Граф неориентированный, поэтому матрица
+расстояний симметрична и столбец dist[:, u] совпадает со строкой dist[u]. Предок v на пути из s выбирается
+по правилу алгоритма Дейкстры: среди соседей u с dist[s][u] + вес = dist[s][v] - с наименьшей парой (dist[s][u], u).
+Вершины извлекаются в порядке таких пар только при положительных весах, поэтому для критерия с дорогами
+нулевого веса build использует _dijkstra_pred
+'''
+def _floyd_pred(n: int, edges: dict, criterion: int, max_value: int, pred_type):
+    dist_type = np.int32 if max_value * max(n - 1, 1) < INF32 else np.int64
+    infinity = INF32 if dist_type == np.int32 else np.iinfo(np.int64).max // 2
+
+    dist = np.full((n, n), infinity, dtype=dist_type)
+    for (u, v), values in edges.items():
+        if u != v:
+            dist[u, v] = values[criterion]
+    np.fill_diagonal(dist, 0)
+
+    for k in range(n):
+        np.minimum(dist, dist[:, k, None] + dist[k], out=dist)
+
+    neighbors = [[] for _ in range(n)]
+    for (u, v), values in edges.items():
+        if u != v:
+            neighbors[v].append((u, values[criterion]))
+
+    pred = np.full((n, n), n, dtype=pred_type)
+    for v in range(n):
+        target = dist[v]
+        best_dist = np.full(n, infinity, dtype=dist_type)
+        best = np.full(n, n, dtype=np.int64)
+        for u, weight in sorted(neighbors[v]):
+            through = dist[u]
+            #Соседи перебираются по возрастанию номера, поэтому при равных расстояниях остаётся меньший номер
+            better = (through < infinity) & (through + weight == target) & (through < best_dist)
+            best_dist[better] = through[better]
+            best[better] = u
+        pred[:, v] = best
+    return pred
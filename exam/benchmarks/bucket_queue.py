@@ -0,0 +1,77 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from buckets import DialQueue, RadixHeap, choose_queue, find_optimal_path_bucket
+from graph import CSRGraph
+from search import find_optimal_path
+
+#Диапазоны весов дорог по умолчанию: малые целые веса и большие веса, при которых корзины Дайала почти пусты
+WEIGHT_RANGES = ("1-30", "30000-65000")
+
+'''
+Сетка из cities городов, соседние по строке и столбцу города соединены дорогами со случайными
+длиной, временем и стоимостью от low до high
+'''
+def build_grid(cities: int, low: int, high: int, seed: int) -> CSRGraph:
+    rnd = random.Random(seed)
+    side = math.isqrt(cities - 1) + 1 if cities > 1 else 1
+    edges_u, edges_v, lengths, times, costs = [], [], [], [], []
+    for v in range(1, cities + 1):
+        for u in (v + 1 if v % side != 0 else None, v + side):
+            if u is not None and u <= cities:
+                edges_u.append(v)
+                edges_v.append(u)
+                lengths.append(rnd.randint(low, high))
+                times.append(rnd.randint(low, high))
+                costs.append(rnd.randint(low, high))
+    return CSRGraph.from_edges(range(1, cities + 1), edges_u, edges_v, lengths, times, costs)
+
+'''
+Замер одного диапазона весов: суммарное время поиска обычным алгоритмом Дейкстры, с корзинами Дайала,
+с radix-кучей и движком "bucket", который выбирает между корзинами и кучей.
+Возвращает времена и признак совпадения маршрутов
+'''
+def bench_range(graph: CSRGraph, pairs: list, high: int) -> tuple[dict, bool]:
+    searches = {
+        "heapq": lambda start, end: find_optimal_path(graph, start, end, 0),
+        "Dial": lambda start, end: find_optimal_path_bucket(graph, start, end, 0, DialQueue(high)),
+        "radix": lambda start, end: find_optimal_path_bucket(graph, start, end, 0, RadixHeap()),
+        "bucket": lambda start, end: find_optimal_path(graph, start, end, 0, "bucket"),
+    }
+    times = dict.fromkeys(searches, 0.0)
+    same = True
+    for start, end in pairs:
+        expected = find_optimal_path(graph, start, end, 0)
+        for name, search in searches.items():
+            started = time.perf_counter()
+            result = search(start, end)
+            times[name] += time.perf_counter() - started
+            same = same and result == expected
+    return times, same
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Поиск пути с очередями для целых весов против heapq")
+    parser.add_argument("--cities", type=int, default=3600)
+    parser.add_argument("--weights", nargs="+", default=list(WEIGHT_RANGES), metavar="LOW-HIGH",
+                        help="диапазоны весов дорог")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    pairs = [(rnd.randint(1, args.cities), rnd.randint(1, args.cities)) for _ in range(args.requests)]
+    print(f"Городов: {args.cities}, запросов: {args.requests}")
+    for weights in args.weights:
+        low, high = map(int, weights.split("-"))
+        graph = build_grid(args.cities, low, high, args.seed)
+        times, same = bench_range(graph, pairs, high)
+        chosen = "корзины Дайала" if choose_queue(graph, 0) is not None else "heapq"
+        print(f"Веса {low}-{high}: " + ", ".join(f"{name} {value:.2f} с" for name, value in times.items())
+              + f" (bucket использует {chosen}), маршруты совпадают: {'да' if same else 'нет'}")
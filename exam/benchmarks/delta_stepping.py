@@ -0,0 +1,67 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.generator import TOPOLOGIES, write_input
+from delta_stepping import delta_stepping
+from graph import np, read_input
+from trees import find_shortest_path_tree
+
+'''
+Функция same_tree проверяет, что массивы delta_stepping совпадают с деревом find_shortest_path_tree
+'''
+def same_tree(graph, start: int, criterion: int, dist, prev) -> bool:
+    tree_prev, tree_dist, _ = find_shortest_path_tree(graph, start, criterion)
+    ids = graph.ids
+    for i, v in enumerate(ids):
+        if tree_dist.get(v, -1) != dist[i]:
+            return False
+        if tree_prev.get(v, -1) != (ids[prev[i]] if prev[i] >= 0 else -1):
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Деревья кратчайших путей: delta-stepping на NumPy против heapq")
+    parser.add_argument("--cities", type=int, default=100_000)
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="grid")
+    parser.add_argument("--sources", type=int, default=5, help="число начальных городов")
+    parser.add_argument("--delta", type=int, default=None, help="ширина корзины, по умолчанию - удвоенный средний вес")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("Для замера необходим NumPy")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "input.txt")
+        roads = write_input(filename, args.topology, args.cities, 0, args.seed)
+        _, _, graph, _ = read_input(filename, compact=True)
+
+    rnd = random.Random(args.seed)
+    sources = rnd.sample(list(graph.ids), args.sources)
+    heap = vectorized = 0.0
+    same = True
+    for start in sources:
+        for criterion in range(3):
+            started = time.perf_counter()
+            find_shortest_path_tree(graph, start, criterion)
+            heap += time.perf_counter() - started
+
+            started = time.perf_counter()
+            dist, prev = delta_stepping(graph, start, criterion, args.delta)
+            vectorized += time.perf_counter() - started
+
+            same = same and same_tree(graph, start, criterion, dist, prev)
+
+    trees = 3 * len(sources)
+    print(f"Городов: {args.cities}, дорог: {roads}, деревьев: {trees}")
+    print(f"heapq:          {heap:.2f} с ({1000 * heap / trees:.0f} мс на дерево)")
+    print(f"delta-stepping: {vectorized:.2f} с ({1000 * vectorized / trees:.0f} мс на дерево, "
+          f"ускорение {heap / vectorized:.1f}x)")
+    print(f"Деревья совпадают: {'да' if same else 'нет'}")
@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from dynamic import DynamicRouter
+from graph import Graph
+from trees import find_shortest_path_tree
+
+'''
+Функция build_grid строит сетку side x side со случайными значениями дорог, похожую на городскую сеть
+'''
+def build_grid(side: int, rnd: random.Random) -> Graph:
+    graph = Graph()
+    for v in range(side * side):
+        graph.add_vertex(v)
+    for v in range(side * side):
+        if v % side + 1 < side:
+            graph.add_edge(v, v + 1, rnd.randint(1, 100), rnd.randint(1, 100), rnd.randint(1, 100))
+        if v + side < side * side:
+            graph.add_edge(v, v + side, rnd.randint(1, 100), rnd.randint(1, 100), rnd.randint(1, 100))
+    return graph
+
+'''
+Функция random_change применяет к маршрутизатору случайное изменение: новое время дороги (2/3 случаев),
+закрытие дороги или новую дорогу между соседними по номеру городами
+'''
+def random_change(router: DynamicRouter, rnd: random.Random, n: int) -> None:
+    u = rnd.randrange(n)
+    edges = router.graph.adj[u]
+    kind = rnd.random()
+    if edges and kind < 0.66:
+        router.update_road(u, rnd.choice(edges).to, time=rnd.randint(1, 100))
+    elif edges and kind < 0.83:
+        router.close_road(u, rnd.choice(edges).to)
+    else:
+        router.add_road(u, (u + 1) % n, rnd.randint(1, 100), rnd.randint(1, 100), rnd.randint(1, 100))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Исправление деревьев кратчайших путей против полного пересчёта")
+    parser.add_argument("--side", type=int, default=100, help="сторона сетки городов")
+    parser.add_argument("--sources", type=int, default=4, help="число начальных городов")
+    parser.add_argument("--updates", type=int, default=50, help="число изменений дорог")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    graph = build_grid(args.side, rnd)
+    n = args.side * args.side
+    router = DynamicRouter(graph, max_trees=3 * args.sources)
+    sources = rnd.sample(range(n), args.sources)
+    for start in sources:
+        for criterion in range(3):
+            router.tree(start, criterion)
+
+    incremental = full = 0.0
+    same = True
+    for _ in range(args.updates):
+        started = time.perf_counter()
+        random_change(router, rnd, n)
+        incremental += time.perf_counter() - started
+
+        started = time.perf_counter()
+        fresh = {key: find_shortest_path_tree(graph, *key) for key in router.trees}
+        full += time.perf_counter() - started
+
+        same = same and all(fresh[key] == (tree.prev, tree.dist, tree.totals) for key, tree in router.trees.items())
+
+    print(f"Городов: {n}, деревьев: {len(router.trees)}, изменений: {args.updates}")
+    print(f"Исправление деревьев: {incremental:.3f} с ({1000 * incremental / args.updates:.2f} мс на изменение, "
+          f"в среднем {router.repaired / args.updates / len(router.trees):.0f} вершин на дерево)")
+    print(f"Полный пересчёт:      {full:.3f} с (ускорение {full / incremental:.1f}x)")
+    print(f"Деревья совпадают: {'да' if same else 'нет'}")
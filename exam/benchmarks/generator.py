@@ -0,0 +1,126 @@
+import argparse
+import math
+import random
+
+#Топологии синтетических дорожных сетей
+TOPOLOGIES = ("grid", "geometric", "hub")
+PRIORITIES = ("Д,В,С", "Д,С,В", "В,Д,С", "В,С,Д", "С,Д,В", "С,В,Д")
+
+'''
+Значения дороги по её расстоянию в километрах: длина, время в минутах при случайной скорости 40-110 км/ч
+и стоимость со случайным тарифом
+'''
+def _road(u: int, v: int, distance: float, rnd: random.Random) -> tuple:
+    length = max(1, round(distance))
+    time = max(1, round(length * 60 / rnd.uniform(40, 110)))
+    cost = max(1, round(length * rnd.uniform(1.5, 4.0)))
+    return u, v, length, time, cost
+
+'''
+Сетка: города 1..n расположены по строкам квадрата со стороной ceil(sqrt(n)), соседние по строке и столбцу
+соединены дорогами 5-30 км, а 5% клеток имеют ещё и диагональную дорогу
+'''
+def grid_roads(n: int, rnd: random.Random):
+    side = math.isqrt(n - 1) + 1 if n > 1 else 1
+    for v in range(1, n + 1):
+        if v % side != 0 and v + 1 <= n:
+            yield _road(v, v + 1, rnd.uniform(5, 30), rnd)
+        if v + side <= n:
+            yield _road(v, v + side, rnd.uniform(5, 30), rnd)
+            if v % side != 0 and v + side + 1 <= n and rnd.random() < 0.05:
+                yield _road(v, v + side + 1, rnd.uniform(10, 40), rnd)
+
+'''
+Случайный геометрический граф: города разбросаны по квадрату с плотностью один город на 100 км²,
+дорогой соединены города на расстоянии не больше радиуса, при котором у города в среднем degree соседей.
+Пары ищутся по клеткам размером с радиус, поэтому генерация линейна по числу городов
+'''
+def geometric_roads(n: int, rnd: random.Random, degree: int = 6):
+    size = math.sqrt(n) * 10
+    radius = math.sqrt(degree * 100 / math.pi)
+    points = [(rnd.uniform(0, size), rnd.uniform(0, size)) for _ in range(n)]
+
+    cells = {}
+    for i, (x, y) in enumerate(points):
+        cells.setdefault((int(x // radius), int(y // radius)), []).append(i)
+
+    for i, (x, y) in enumerate(points):
+        cx, cy = int(x // radius), int(y // radius)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in cells.get((cx + dx, cy + dy), ()):
+                    if j <= i:
+                        continue
+                    distance = math.hypot(x - points[j][0], y - points[j][1])
+                    if distance <= radius:
+                        #Дорога длиннее расстояния по прямой
+                        yield _road(i + 1, j + 1, distance * 1.3, rnd)
+
+'''
+Сеть "хабы и спицы": около sqrt(n) / 2 крупных городов соединены в кольцо магистралями и дополнительно
+двумя случайными дальними трассами каждый, остальные города подключены короткой дорогой к случайному хабу,
+а треть из них - ещё и к ранее подключённому городу того же хаба
+'''
+def hub_roads(n: int, rnd: random.Random):
+    if n < 2:
+        return
+    hubs = min(n, max(2, round(math.sqrt(n) / 2)))
+    for h in range(1, hubs + 1):
+        if h < hubs or hubs > 2:
+            yield _road(h, h % hubs + 1, rnd.uniform(100, 400), rnd)
+        for _ in range(2):
+            other = rnd.randint(1, hubs)
+            if other != h:
+                yield _road(h, other, rnd.uniform(300, 1500), rnd)
+
+    spokes = {}
+    for v in range(hubs + 1, n + 1):
+        hub = rnd.randint(1, hubs)
+        yield _road(hub, v, rnd.uniform(5, 80), rnd)
+        local = spokes.setdefault(hub, [])
+        if local and rnd.random() < 1 / 3:
+            yield _road(rnd.choice(local), v, rnd.uniform(5, 40), rnd)
+        local.append(v)
+
+'''
+Функция write_input записывает сеть из cities городов заданной топологии и requests случайных запросов
+во входной файл Main.py. Возвращает число дорог
+'''
+def write_input(filename: str, topology: str, cities: int, requests: int, seed: int = 1) -> int:
+    generators = {"grid": grid_roads, "geometric": geometric_roads, "hub": hub_roads}
+    if topology not in generators:
+        raise ValueError(f"Неизвестная топология {topology}")
+    if cities < 1:
+        raise ValueError("Число городов должно быть положительным")
+
+    rnd = random.Random(seed)
+    roads = 0
+    with open(filename, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write("[CITIES]\n")
+        for v in range(1, cities + 1):
+            f.write(f"{v}: Город {v}\n")
+
+        f.write("[ROADS]\n")
+        for u, v, length, time, cost in generators[topology](cities, rnd):
+            f.write(f"{u} - {v}: {length}, {time}, {cost}\n")
+            roads += 1
+
+        f.write("[REQUESTS]\n")
+        for _ in range(requests):
+            start, end = rnd.randint(1, cities), rnd.randint(1, cities)
+            f.write(f"Город {start} -> Город {end} | ({rnd.choice(PRIORITIES)})\n")
+
+    return roads
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Генерация входного файла с синтетической дорожной сетью")
+    parser.add_argument("output_file", nargs="?", default="input.txt")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="grid")
+    parser.add_argument("--cities", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    roads = write_input(args.output_file, args.topology, args.cities, args.requests, args.seed)
+    print(f"{args.output_file}: городов {args.cities}, дорог {roads}, запросов {args.requests}")
@@ -0,0 +1,66 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from graph import np, read_input
+
+'''
+Функция write_network записывает во входной файл случайную сеть из cities городов и roads дорог
+'''
+def write_network(filename: str, cities: int, roads: int, seed: int = 1) -> None:
+    rnd = random.Random(seed)
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("[CITIES]\n")
+        for i in range(1, cities + 1):
+            f.write(f"{i}: Город {i}\n")
+        f.write("[ROADS]\n")
+        for _ in range(roads):
+            u, v = rnd.randint(1, cities), rnd.randint(1, cities)
+            f.write(f"{u} - {v}: {rnd.randint(1, 999)}, {rnd.randint(1, 999)}, {rnd.randint(1, 999)}\n")
+        f.write("[REQUESTS]\nГород 1 -> Город 2 | (Д,В,С)\n")
+
+'''
+Функция measure возвращает лучшее время чтения файла из repeat запусков и результат последнего
+'''
+def measure(filename: str, bulk: bool, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = read_input(filename, compact=True, bulk=bulk)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение построчного и блочного разбора секции [ROADS]")
+    parser.add_argument("input_file", nargs="?", default=None, help="входной файл, по умолчанию случайная сеть")
+    parser.add_argument("--cities", type=int, default=100_000)
+    parser.add_argument("--roads", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if np is None:
+        print("NumPy не установлен, блочный разбор недоступен")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = args.input_file
+        if filename is None:
+            filename = os.path.join(tmp, "input.txt")
+            write_network(filename, args.cities, args.roads)
+
+        line_time, (_, _, line_graph, _) = measure(filename, False, args.repeat)
+        bulk_time, (_, _, bulk_graph, _) = measure(filename, True, args.repeat)
+
+    same = all(bytes(getattr(line_graph, name)) == bytes(getattr(bulk_graph, name))
+               for name in ("ids", "offsets", "targets", "lengths", "times", "costs"))
+    print(f"Дорог: {len(line_graph.targets) // 2}")
+    print(f"Построчный разбор: {line_time:.3f} с")
+    print(f"Блочный разбор:    {bulk_time:.3f} с (ускорение {line_time / bulk_time:.1f}x)")
+    print(f"Графы совпадают: {'да' if same else 'нет'}")
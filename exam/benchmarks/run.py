@@ -0,0 +1,172 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Main import main
+from benchmarks.generator import TOPOLOGIES, write_input
+from graph import INF, read_input
+from search import CRITERION_NAMES, find_optimal_path, restore_path
+
+#Версия формата файла результатов
+RESULTS_VERSION = 1
+#Показатели, по которым сравниваются два файла результатов
+METRICS = ("read_input", "find_optimal_path", "restore_path", "end_to_end")
+
+'''
+Сводка по списку времён отдельных вызовов в секундах
+'''
+def summarize(times: list[float]) -> dict:
+    ordered = sorted(times)
+    count = len(ordered)
+    return {
+        "count": count,
+        "total": sum(ordered),
+        "mean": sum(ordered) / count if count else 0.0,
+        "p50": ordered[count // 2] if count else 0.0,
+        "p95": ordered[min(count - 1, int(count * 0.95))] if count else 0.0,
+        "max": ordered[-1] if count else 0.0,
+    }
+
+'''
+Функция bench_case генерирует сеть в каталоге directory и отдельно замеряет чтение файла, поиск пути
+и восстановление пути для каждого запроса и критерия, а также полный прогон main.
+Для чтения файла и main берётся лучшее время из repeat запусков
+'''
+def bench_case(directory: str, topology: str, cities: int, requests: int, seed: int, repeat: int = 3) -> dict:
+    input_file = os.path.join(directory, f"{topology}_{cities}.txt")
+    output_file = os.path.join(directory, f"{topology}_{cities}_output.txt")
+    roads = write_input(input_file, topology, cities, requests, seed)
+
+    read_time = INF
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _, city_name_to_id, graph, parsed = read_input(input_file)
+        read_time = min(read_time, time.perf_counter() - started)
+
+    search_times, restore_times = [], []
+    unreachable = 0
+    for start_name, end_name, priorities in parsed:
+        start_id, end_id = city_name_to_id[start_name], city_name_to_id[end_name]
+        for crit in priorities:
+            started = time.perf_counter()
+            prev = find_optimal_path(graph, start_id, end_id, CRITERION_NAMES[crit])[0]
+            search_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            try:
+                restore_path(prev, start_id, end_id)
+            except RuntimeError:
+                unreachable += 1
+            restore_times.append(time.perf_counter() - started)
+
+    #main сообщает об ошибках через print, вывод не нужен в отчёте
+    end_to_end = INF
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(input_file, output_file)
+        end_to_end = min(end_to_end, time.perf_counter() - started)
+
+    os.remove(input_file)
+    os.remove(output_file)
+    return {
+        "topology": topology,
+        "cities": cities,
+        "roads": roads,
+        "requests": requests,
+        "unreachable": unreachable,
+        "read_input": read_time,
+        "find_optimal_path": summarize(search_times),
+        "restore_path": summarize(restore_times),
+        "end_to_end": end_to_end,
+    }
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+'''
+Время показателя metric в результате одного прогона: для поиска и восстановления пути - медиана одного вызова,
+которая меньше зависит от случайных задержек, чем сумма
+'''
+def _metric_time(case: dict, metric: str) -> float:
+    value = case[metric]
+    return value["p50"] if isinstance(value, dict) else value
+
+'''
+Функция compare сравнивает текущие результаты с сохранёнными ранее и возвращает строки с замедлениями
+больше threshold (доля) и больше min_delta секунд, общие прогоны определяются по топологии, числу городов и запросов
+'''
+def compare(current: dict, baseline: dict, threshold: float, min_delta: float = 1e-4) -> list[str]:
+    previous = {(case["topology"], case["cities"], case["requests"]): case for case in baseline["results"]}
+    regressions = []
+    for case in current["results"]:
+        old = previous.get((case["topology"], case["cities"], case["requests"]))
+        if old is None:
+            continue
+        for metric in METRICS:
+            before, after = _metric_time(old, metric), _metric_time(case, metric)
+            if before > 0 and after > before * (1 + threshold) and after - before > min_delta:
+                regressions.append(f"{case['topology']} {case['cities']}: {metric} {before:.4f} с -> {after:.4f} с "
+                                   f"(+{100 * (after / before - 1):.0f}%)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замеры времени поиска маршрутов на синтетических сетях")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="числа городов")
+    parser.add_argument("--topologies", nargs="+", choices=TOPOLOGIES, default=list(TOPOLOGIES))
+    parser.add_argument("--requests", type=int, default=100, help="число запросов в каждом файле")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов чтения файла и main")
+    parser.add_argument("--output", default="bench_results.json", help="файл результатов JSON")
+    parser.add_argument("--compare", metavar="BASELINE", default=None, help="сравнить с сохранёнными результатами")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимое замедление при сравнении")
+    args = parser.parse_args()
+
+    report = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for cities in args.sizes:
+            for topology in args.topologies:
+                case = bench_case(directory, topology, cities, args.requests, args.seed, args.repeat)
+                report["results"].append(case)
+                print(f"{topology:>9} {cities:>8}: read_input {case['read_input']:.3f} с, "
+                      f"find_optimal_path {case['find_optimal_path']['mean'] * 1000:.2f} мс, "
+                      f"restore_path {case['restore_path']['mean'] * 1000:.3f} мс, "
+                      f"main {case['end_to_end']:.3f} с", flush=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"Замедление: {line}")
+        if regressions:
+            sys.exit(1)
+        print("Замедлений нет")
@@ -0,0 +1,84 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.generator import TOPOLOGIES, geometric_roads, grid_roads, hub_roads
+from graph import Graph
+from search import find_optimal_path, restore_path
+from simplify import SimplifiedGraph
+
+'''
+Сеть, похожая на настоящую дорожную: каждая дорога сети заданной топологии проходит через segments - 1
+промежуточных посёлков, а часть участков дублируется параллельной дорогой, которая хуже по всем значениям.
+Возвращает граф и число перекрёстков - городов исходной сети
+'''
+def build_network(topology: str, cities: int, segments: int, parallel: float, seed: int):
+    generators = {"grid": grid_roads, "geometric": geometric_roads, "hub": hub_roads}
+    rnd = random.Random(seed)
+    graph = Graph()
+    for v in range(1, cities + 1):
+        graph.add_vertex(v)
+
+    next_id = cities + 1
+    for u, v, length, time_, cost in list(generators[topology](cities, rnd)):
+        stops = [u]
+        for _ in range(segments - 1):
+            graph.add_vertex(next_id)
+            stops.append(next_id)
+            next_id += 1
+        stops.append(v)
+
+        for before, after in zip(stops, stops[1:]):
+            graph.add_edge(before, after, length, time_, cost)
+            if rnd.random() < parallel:
+                graph.add_edge(before, after, length + 1, time_ + 1, cost + 1)
+    return graph, cities
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Поиск пути по упрощённому графу против поиска по исходному")
+    parser.add_argument("--cities", type=int, default=10_000, help="число перекрёстков")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="grid")
+    parser.add_argument("--segments", type=int, default=4, help="число участков на каждой дороге")
+    parser.add_argument("--parallel", type=float, default=0.1, help="доля участков с доминируемой параллельной дорогой")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    graph, junctions = build_network(args.topology, args.cities, args.segments, args.parallel, args.seed)
+    rnd = random.Random(args.seed)
+    pairs = [(rnd.randint(1, junctions), rnd.randint(1, junctions)) for _ in range(args.requests)]
+
+    started = time.perf_counter()
+    simplified = SimplifiedGraph.build(graph, [v for pair in pairs for v in pair])
+    build = time.perf_counter() - started
+
+    original = reduced = 0.0
+    same = True
+    for start, end in pairs:
+        for criterion in range(3):
+            started = time.perf_counter()
+            prev, *totals = find_optimal_path(graph, start, end, criterion)
+            original += time.perf_counter() - started
+
+            started = time.perf_counter()
+            simple_prev, *simple_totals = simplified.find_optimal_path(start, end, criterion)
+            reduced += time.perf_counter() - started
+
+            if totals[0] is not None:
+                same = same and restore_path(prev, start, end) == restore_path(simple_prev, start, end)
+            same = same and totals == simple_totals
+
+    searches = 3 * len(pairs)
+    kept = len(simplified.adj)
+    print(f"Городов: {len(graph.adj)}, после упрощения: {kept}, в цепочках: {simplified.contracted}, "
+          f"удалено дорог: {simplified.removed}")
+    print(f"Упрощение графа: {build:.2f} с")
+    print(f"Исходный граф:    {original:.2f} с ({1000 * original / searches:.1f} мс на поиск)")
+    print(f"Упрощённый граф:  {reduced:.2f} с ({1000 * reduced / searches:.1f} мс на поиск, "
+          f"ускорение {original / reduced:.1f}x)")
+    print(f"Маршруты совпадают: {'да' if same else 'нет'}")
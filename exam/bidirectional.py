@@ -0,0 +1,98 @@
+import heapq
+
+from graph import INF, Graph
+
+'''
+Двунаправленный алгоритм Дейкстры: поиск ведётся одновременно из start и из end (граф неориентированный),
+на каждом шаге продвигается направление с меньшим значением в очереди.
+Для каждой вершины хранится лучшая найденная сумма расстояний с двух сторон, поиск завершается,
+когда сумма минимумов двух очередей не меньше этой суммы - длины кратчайшего пути.
+Прямой поиск извлекает вершины в том же порядке, что и find_optimal_path, поэтому после встречи он продолжается
+функцией finish_dijkstra до точки end: расстояния обратного поиска отсекают вершины вне кратчайших путей,
+а prev и суммы совпадают с обычным алгоритмом Дейкстры, включая выбор среди равных путей
+'''
+def find_optimal_path_bidirectional(graph: Graph, start: int, end: int, criterion: int):
+    if start == end:
+        return {}, 0, 0, 0
+
+    #Данные прямого (0) и обратного (1) поиска: расстояния и очереди.
+    #Предыдущие вершины и суммы метрик нужны только прямому поиску
+    dist = ({start: 0}, {end: 0})
+    queues = ([(0, start)], [(0, end)])
+    prev = {}
+    totals = {start: (0, 0, 0)}
+
+    best = INF
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        side_dist, other_dist = dist[side], dist[1 - side]
+        pq = queues[side]
+
+        cur_weight, u = heapq.heappop(pq)
+        if cur_weight > side_dist[u]:
+            continue
+
+        if side == 0 and u == end:
+            return prev, *totals[end]
+
+        for v, length, time, cost in graph.neighbors(u):
+            new_weight = cur_weight + (length, time, cost)[criterion]
+
+            if new_weight < side_dist.get(v, INF):
+                side_dist[v] = new_weight
+                if side == 0:
+                    prev[v] = u
+                    cur_length, cur_time, cur_cost = totals[u]
+                    totals[v] = (cur_length + length, cur_time + time, cur_cost + cost)
+                heapq.heappush(pq, (new_weight, v))
+
+                #Вершина достигнута с обеих сторон - кандидат на точку встречи
+                if v in other_dist and new_weight + other_dist[v] < best:
+                    best = new_weight + other_dist[v]
+
+    if best == INF:
+        return prev, None, None, None
+
+    #Окончательные расстояния обратного поиска не больше минимума его очереди, а до остальных вершин - не меньше
+    backward = dist[1]
+    radius = queues[1][0][0] if queues[1] else INF
+
+    def estimate(v):
+        return min(backward.get(v, INF), radius)
+
+    return finish_dijkstra(graph, end, criterion, queues[0], dist[0], prev, totals, best, estimate)
+
+'''
+Продолжение алгоритма Дейкстры из точки start до точки end в том же порядке извлечения вершин, что и в
+find_optimal_path: pq - очередь пар (расстояние, вершина), dist, prev и totals - текущее состояние поиска.
+limit - длина кратчайшего пути, уже найденная ускоренным поиском, estimate(v) - нижняя оценка пути от v до end.
+Вершина не кладётся в очередь, если её расстояние вместе с оценкой больше limit: через неё не проходит
+ни один кратчайший путь. У вершин кратчайших путей расстояния и порядок извлечения от этого не меняются,
+поэтому prev и суммы для end совпадают с обычным алгоритмом Дейкстры, включая выбор среди равных путей.
+Возвращает то же, что и find_optimal_path
+'''
+def finish_dijkstra(graph: Graph, end: int, criterion: int, pq: list, dist: dict, prev: dict, totals: dict,
+                    limit: int, estimate):
+    while pq:
+        cur_weight, u = heapq.heappop(pq)
+        if cur_weight > dist[u]:
+            continue
+
+        if u == end:
+            return prev, *totals[end]
+
+        cur_length, cur_time, cur_cost = totals[u]
+        for v, length, time, cost in graph.neighbors(u):
+            new_weight = cur_weight + (length, time, cost)[criterion]
+
+            if new_weight < dist.get(v, INF) and new_weight + estimate(v) <= limit:
+                dist[v] = new_weight
+                prev[v] = u
+                totals[v] = (cur_length + length, cur_time + time, cur_cost + cost)
+                heapq.heappush(pq, (new_weight, v))
+
+    return prev, None, None, None
@@ -0,0 +1,200 @@
+import math
+
+from graph import INF, CSRGraph, Graph
+
+#Во сколько раз наибольший вес ребра может превышать корень из числа городов, чтобы движок "bucket"
+#использовал корзины Дейкстры-Дайала, а не обычную кучу
+DIAL_WEIGHT_FACTOR = 4
+
+'''
+Очередь с приоритетами для целых весов рёбер от 1 до max_weight (корзины Дейкстры-Дайала): вершина с расстоянием key
+лежит в корзине key. Пока обрабатывается расстояние key, все расстояния в очереди не больше key + max_weight,
+поэтому хватает max_weight + 1 корзин, используемых по кругу
+'''
+class DialQueue:
+    def __init__(self, max_weight: int):
+        self.buckets = [None] * (max_weight + 1)
+        self.key = 0
+        self.size = 0
+
+    def push(self, key: int, v: int):
+        i = key % len(self.buckets)
+        bucket = self.buckets[i]
+        if bucket is None:
+            self.buckets[i] = [v]
+        else:
+            bucket.append(v)
+        self.size += 1
+
+    '''
+    Извлечение всех вершин с наименьшим расстоянием, возвращается пара (расстояние, вершины по возрастанию).
+    Вызывается только для непустой очереди
+    '''
+    def pop_level(self) -> tuple[int, list[int]]:
+        buckets = self.buckets
+        size = len(buckets)
+        key = self.key
+        while buckets[key % size] is None:
+            key += 1
+        level = buckets[key % size]
+        buckets[key % size] = None
+        self.key = key
+        self.size -= len(level)
+        level.sort()
+        return key, level
+
+'''
+Radix-куча для неубывающих целых расстояний: запись (key, v) лежит в корзине с номером старшего бита,
+в котором key отличается от последнего извлечённого расстояния last. Когда корзина 0 пуста, наименьшая запись
+ищется в первой непустой корзине, и её записи раскладываются заново по корзинам с меньшими номерами
+'''
+class RadixHeap:
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+
+    def push(self, key: int, v: int):
+        self.buckets[(key ^ self.last).bit_length()].append((key, v))
+        self.size += 1
+
+    '''
+    Извлечение всех вершин с наименьшим расстоянием, возвращается пара (расстояние, вершины по возрастанию).
+    Вызывается только для непустой очереди
+    '''
+    def pop_level(self) -> tuple[int, list[int]]:
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            items = buckets[i]
+            buckets[i] = []
+            last = min(items)[0]
+            self.last = last
+            for item in items:
+                buckets[(item[0] ^ last).bit_length()].append(item)
+
+        level = buckets[0]
+        buckets[0] = []
+        self.size -= len(level)
+        return self.last, sorted(v for _, v in level)
+
+'''
+Очередь для поиска по критерию criterion или None, если обычный алгоритм Дейкстры с heapq будет быстрее.
+Корзины Дайала просматриваются по одному целому расстоянию, в том числе пустые: на сети, похожей на сетку,
+поиск до вершин на расстоянии r дорог просматривает около r * вес корзин и извлекает около r^2 вершин,
+поэтому корзины выгодны, пока наибольший вес не больше DIAL_WEIGHT_FACTOR * sqrt(число городов).
+Radix-куча в CPython медленнее heapq при любых весах (benchmarks/bucket_queue.py), поэтому сама не выбирается.
+При рёбрах нулевого веса возвращается None
+'''
+def choose_queue(graph: Graph, criterion: int):
+    low, high = graph.weight_range(criterion)
+    if low < 1 or high > DIAL_WEIGHT_FACTOR * math.isqrt(len(graph)):
+        return None
+    return DialQueue(high)
+
+'''
+Алгоритм Дейкстры с очередью для целых весов queue (DialQueue или RadixHeap).
+В очереди лежат только номера вершин без сумм длины, времени и стоимости: для вершины запоминается ребро,
+по которому она достигнута, а суммы считаются по найденному пути.
+Вершины с равным расстоянием обрабатываются по возрастанию номера, в том же порядке, в каком их извлекает heapq,
+поэтому маршруты совпадают с обычным алгоритмом Дейкстры. Веса рёбер должны быть положительными
+'''
+def find_optimal_path_bucket(graph: Graph, start: int, end: int, criterion: int, queue):
+    if isinstance(graph, CSRGraph):
+        return _bucket_search_csr(graph, start, end, criterion, queue)
+
+    push = queue.push
+    pop_level = queue.pop_level
+    dist = {start: 0}
+    prev = {}
+    reached_by = {}
+    found = False
+    push(0, start)
+
+    while queue.size and not found:
+        cur_weight, level = pop_level()
+        for u in level:
+            if dist[u] != cur_weight:
+                continue
+
+            if u == end:
+                found = True
+                break
+
+            for e in graph.adj[u]:
+                new_weight = cur_weight + (e.length if criterion == 0 else e.time if criterion == 1 else e.cost)
+
+                if new_weight < dist.get(e.to, INF):
+                    dist[e.to] = new_weight
+                    prev[e.to] = u
+                    reached_by[e.to] = e
+                    push(new_weight, e.to)
+
+    if not found:
+        return prev, None, None, None
+
+    total_length = total_time = total_cost = 0
+    v = end
+    while v != start:
+        e = reached_by[v]
+        total_length += e.length
+        total_time += e.time
+        total_cost += e.cost
+        v = prev[v]
+    return prev, total_length, total_time, total_cost
+
+'''
+Поиск с очередью queue по массивам CSRGraph, для ребра достигнутой вершины запоминается его позиция в массивах
+'''
+def _bucket_search_csr(graph: CSRGraph, start: int, end: int, criterion: int, queue):
+    ids = graph.ids
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = (graph.lengths, graph.times, graph.costs)[criterion]
+    push = queue.push
+    pop_level = queue.pop_level
+
+    source = graph.index[start]
+    target = graph.index[end]
+    dist = [INF] * len(ids)
+    dist[source] = 0
+    prev_index = {}
+    reached_by = {}
+    found = False
+    push(0, source)
+
+    while queue.size and not found:
+        cur_weight, level = pop_level()
+        for u in level:
+            if dist[u] != cur_weight:
+                continue
+
+            if u == target:
+                found = True
+                break
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                new_weight = cur_weight + weights[k]
+
+                if new_weight < dist[v]:
+                    dist[v] = new_weight
+                    prev_index[v] = u
+                    reached_by[v] = k
+                    push(new_weight, v)
+
+    prev = {ids[v]: ids[u] for v, u in prev_index.items()}
+    if not found:
+        return prev, None, None, None
+
+    total_length = total_time = total_cost = 0
+    v = target
+    while v != source:
+        k = reached_by[v]
+        total_length += graph.lengths[k]
+        total_time += graph.times[k]
+        total_cost += graph.costs[k]
+        v = prev_index[v]
+    return prev, total_length, total_time, total_cost
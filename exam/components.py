@@ -0,0 +1,148 @@
+from collections import Counter
+
+#NumPy ускоряет построение компонент CSRGraph, без него граф обходится в цикле
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+'''
+Компоненты связности графа на системе непересекающихся множеств (union-find), в которой отражены:
+    parent - родитель города в дереве своей компоненты, корень дерева - метка компоненты
+    size - число городов в компоненте, хранится для корней
+Компоненты строятся один раз после загрузки графа, после чего деревья сжимаются до одного уровня,
+поэтому проверка двух городов - два обращения к словарю. Дорога, добавленная позже через add_road, объединяет компоненты.
+При закрытии дороги компоненты не разделяются: если города лежат в разных компонентах, пути между ними нет и после
+закрытия дорог, а для городов одной компоненты выполняется обычный поиск
+'''
+class Components:
+    def __init__(self, vertices=()):
+        self.parent = {v: v for v in vertices}
+        self.size = dict.fromkeys(self.parent, 1)
+
+    '''
+    Построение компонент по всем дорогам графа (Graph или CSRGraph). Начальные метки находятся обходом графа,
+    а для CSRGraph при установленном NumPy - векторным объединением деревьев, после чего каждый город
+    сразу подвешен к корню своей компоненты
+    '''
+    @classmethod
+    def from_graph(cls, graph) -> "Components":
+        if hasattr(graph, "adj"):
+            parent = _traverse_labels(graph.adj)
+        elif np is not None:
+            parent = _csr_labels_numpy(graph)
+        else:
+            parent = _csr_labels(graph)
+
+        components = cls()
+        components.parent = parent
+        components.size = Counter(parent.values())
+        return components
+
+    def find(self, v: int) -> int:
+        parent = self.parent
+        while parent[v] != v:
+            #Сокращение пути вдвое: каждая вершина на пути переподвешивается к деду
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    '''
+    Подвешивание каждого города прямо к корню его компоненты
+    '''
+    def compress(self) -> None:
+        find = self.find
+        parent = self.parent
+        for v in parent:
+            parent[v] = find(v)
+
+    def add_vertex(self, v: int) -> None:
+        if v not in self.parent:
+            self.parent[v] = v
+            self.size[v] = 1
+
+    '''
+    Объединение компонент городов u и v, меньшая компонента подвешивается к большей
+    '''
+    def add_road(self, u: int, v: int) -> None:
+        u, v = self.find(u), self.find(v)
+        if u == v:
+            return
+        if self.size[u] < self.size[v]:
+            u, v = v, u
+        self.parent[v] = u
+        self.size[u] += self.size.pop(v)
+
+    def connected(self, u: int, v: int) -> bool:
+        return self.find(u) == self.find(v)
+
+    '''
+    Число компонент
+    '''
+    def __len__(self) -> int:
+        return len(self.size)
+
+'''
+Метки компонент обходом в глубину по спискам смежности Graph: меткой служит первый найденный город компоненты
+'''
+def _traverse_labels(adj: dict) -> dict[int, int]:
+    label = {}
+    for root in adj:
+        if root in label:
+            continue
+        label[root] = root
+        stack = [root]
+        while stack:
+            for e in adj[stack.pop()]:
+                if e.to not in label:
+                    label[e.to] = root
+                    stack.append(e.to)
+    return label
+
+'''
+Метки компонент CSRGraph обходом в глубину по внутренним номерам вершин
+'''
+def _csr_labels(graph) -> dict[int, int]:
+    ids, offsets, targets = graph.ids, graph.offsets, graph.targets
+    label = [-1] * len(ids)
+    for root in range(len(ids)):
+        if label[root] >= 0:
+            continue
+        label[root] = root
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if label[v] < 0:
+                    label[v] = root
+                    stack.append(v)
+    return {ids[v]: ids[root] for v, root in enumerate(label)}
+
+'''
+Метки компонент CSRGraph на NumPy: на каждом шаге корень дерева подвешивается к наименьшему корню соседнего
+по ребру дерева, затем пути сжимаются удвоением указателей. Число деревьев на каждом шаге уменьшается
+не меньше чем вдвое, поэтому шагов - O(log n)
+'''
+def _csr_labels_numpy(graph) -> dict[int, int]:
+    ids = np.frombuffer(graph.ids, dtype=np.int64)
+    offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+    targets = np.frombuffer(graph.targets, dtype=np.int64)
+    n = len(ids)
+
+    sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    parent = np.arange(n, dtype=np.int64)
+    while True:
+        roots_u, roots_v = parent[sources], parent[targets]
+        crossing = roots_u != roots_v
+        if not crossing.any():
+            break
+        roots_u, roots_v = roots_u[crossing], roots_v[crossing]
+        np.minimum.at(parent, np.maximum(roots_u, roots_v), np.minimum(roots_u, roots_v))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    return dict(zip(ids.tolist(), ids[parent].tolist()))
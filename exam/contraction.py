@@ -0,0 +1,290 @@
+import argparse
+import heapq
+import json
+import time
+
+from graph import INF, graph_fingerprint, read_input
+from search import CRITERION_NAMES
+
+#Версия формата файла индекса, при изменении формата старые индексы перестают загружаться
+INDEX_VERSION = 1
+
+'''
+Иерархия сжатия (Contraction Hierarchies) для одного критерия, в которой отражены:
+    criterion - номер критерия, по которому построена иерархия
+    up - для каждой вершины рёбра к вершинам, сжатым позже неё: {вершина: (вес, длина, время, стоимость, middle)},
+         где middle - вершина, через которую проходит ребро-ярлык, или None для настоящей дороги
+    settled - число вершин, извлечённых из очередей при последнем запросе
+Запрос - двунаправленный поиск только по рёбрам вверх по иерархии, поэтому он затрагивает лишь малую часть графа
+'''
+class ContractionHierarchy:
+    def __init__(self, criterion: int, up: dict[int, dict[int, tuple]]):
+        self.criterion = criterion
+        self.up = up
+        self.settled = 0
+
+    '''
+    Построение иерархии: вершины по очереди удаляются из рабочего графа, начиная с наименее важных.
+    Если при удалении вершины v путь u - v - w между её соседями может быть единственным кратчайшим,
+    вместо него добавляется ребро-ярлык u - w. Важность вершины - разность числа добавляемых ярлыков
+    и удаляемых рёбер плюс число уже сжатых соседей, она пересчитывается лениво при извлечении из очереди
+    '''
+    @classmethod
+    def build(cls, graph, criterion: int, witness_limit: int = 64) -> "ContractionHierarchy":
+        if criterion not in (0, 1, 2):
+            raise ValueError("Некорректный критерий оптимизации")
+
+        #Рабочий граф: для каждой пары соседей хранится одно лучшее по критерию ребро,
+        #при равенстве - первое, как и при поиске find_optimal_path
+        overlay = {v: {} for v in graph.vertices()}
+        for u in overlay:
+            for v, length, travel_time, cost in graph.neighbors(u):
+                weight = (length, travel_time, cost)[criterion]
+                best = overlay[u].get(v)
+                if v != u and (best is None or weight < best[0]):
+                    overlay[u][v] = (weight, length, travel_time, cost, None)
+
+        contracted_neighbors = dict.fromkeys(overlay, 0)
+        up = {}
+
+        def priority(v, shortcuts):
+            return len(shortcuts) - len(overlay[v]) + contracted_neighbors[v]
+
+        pq = [(priority(v, _shortcuts(overlay, v, witness_limit)), v) for v in overlay]
+        heapq.heapify(pq)
+
+        while pq:
+            _, v = heapq.heappop(pq)
+
+            #Ленивое обновление: если важность выросла, вершина возвращается в очередь
+            shortcuts = _shortcuts(overlay, v, witness_limit)
+            current = priority(v, shortcuts)
+            if pq and current > pq[0][0]:
+                heapq.heappush(pq, (current, v))
+                continue
+
+            for u, w, edge in shortcuts:
+                best = overlay[u].get(w)
+                if best is None or edge[0] < best[0]:
+                    overlay[u][w] = edge
+                    overlay[w][u] = edge
+
+            up[v] = overlay.pop(v)
+            for u in up[v]:
+                del overlay[u][v]
+                contracted_neighbors[u] += 1
+
+        return cls(criterion, up)
+
+    '''
+    Поиск пути start -> end: прямой и обратный поиск идут только вверх по иерархии (граф неориентированный,
+    поэтому рёбра обоих направлений одни и те же), кратчайший путь проходит через вершину с наибольшим рангом.
+    Возвращает тот же кортеж (prev, длина, время, стоимость), что и find_optimal_path. Значение критерия
+    совпадает с find_optimal_path, но среди нескольких путей равного веса может быть выбран другой путь
+    с другими значениями остальных двух метрик: порядок обхода в иерархии не связан с порядком алгоритма Дейкстры
+    '''
+    def query(self, start: int, end: int):
+        if start not in self.up or end not in self.up:
+            raise ValueError("Начальная или конечная вершина отсутствует в графе")
+
+        self.settled = 0
+        if start == end:
+            return {}, 0, 0, 0
+
+        dist = ({start: 0}, {end: 0})
+        links = ({}, {})
+        queues = ([(0, start)], [(0, end)])
+
+        best = INF
+        meet = None
+
+        while True:
+            sides = [side for side in (0, 1) if queues[side] and queues[side][0][0] < best]
+            if not sides:
+                break
+            side = min(sides, key=lambda k: queues[k][0][0])
+
+            cur_weight, u = heapq.heappop(queues[side])
+            if cur_weight > dist[side][u]:
+                continue
+            self.settled += 1
+
+            if u in dist[1 - side] and cur_weight + dist[1 - side][u] < best:
+                best = cur_weight + dist[1 - side][u]
+                meet = u
+
+            for v, edge in self.up[u].items():
+                new_weight = cur_weight + edge[0]
+                if new_weight < dist[side].get(v, INF):
+                    dist[side][v] = new_weight
+                    links[side][v] = (u, edge)
+                    heapq.heappush(queues[side], (new_weight, v))
+
+        if meet is None:
+            return {}, None, None, None
+
+        #Цепочка рёбер иерархии от start до end через точку встречи
+        chain = []
+        cur = meet
+        while cur != start:
+            u, edge = links[0][cur]
+            chain.append((u, cur, edge))
+            cur = u
+        chain.reverse()
+        cur = meet
+        while cur != end:
+            u, edge = links[1][cur]
+            chain.append((cur, u, edge))
+            cur = u
+
+        #Развёрнутый путь и дороги между его соседними городами. При дорогах нулевого веса путь может пройти
+        #через город дважды: цикл между двумя проходами имеет нулевой вес по критерию и вырезается
+        path = [start]
+        roads = []
+        position = {start: 0}
+        for a, b, edge in chain:
+            for v, road in self._unpack(a, b, edge):
+                if v in position:
+                    k = position[v]
+                    for x in path[k + 1:]:
+                        del position[x]
+                    del path[k + 1:]
+                    del roads[k:]
+                    continue
+                position[v] = len(path)
+                path.append(v)
+                roads.append(road)
+
+        prev = {v: u for u, v in zip(path, path[1:])}
+        return prev, sum(road[1] for road in roads), sum(road[2] for road in roads), sum(road[3] for road in roads)
+
+    '''
+    Разворачивание ребра a - b в последовательность пар (город, дорога до него) после a. Ярлык через middle
+    заменяется рёбрами a - middle и middle - b, которые сохранены у middle, так как она сжата раньше a и b
+    '''
+    def _unpack(self, a: int, b: int, edge: tuple) -> list[tuple]:
+        result = []
+        stack = [(a, b, edge)]
+        while stack:
+            a, b, edge = stack.pop()
+            middle = edge[4]
+            if middle is None:
+                result.append((b, edge))
+                continue
+            stack.append((middle, b, self.up[middle][b]))
+            stack.append((a, middle, self.up[middle][a]))
+        return result
+
+'''
+Функция _shortcuts возвращает ярлыки (u, w, ребро), которые нужны при сжатии вершины v.
+Для каждой пары соседей ищется обходной путь без v (поиск-свидетель) не длиннее пути через v,
+поиск ограничен witness_limit вершинами, поэтому иногда добавляются лишние, но корректные ярлыки
+'''
+def _shortcuts(overlay: dict, v: int, witness_limit: int) -> list:
+    neighbors = list(overlay[v].items())
+    result = []
+
+    for i, (u, edge_u) in enumerate(neighbors):
+        others = neighbors[i + 1:]
+        if not others:
+            break
+
+        limit = edge_u[0] + max(edge_w[0] for _, edge_w in others)
+        remaining = {w for w, _ in others}
+        dist = {u: 0}
+        pq = [(0, u)]
+        settled = 0
+
+        #Поиск останавливается, когда все остальные соседи достигнуты окончательно или превышен предел
+        while pq and remaining and settled < witness_limit:
+            cur_weight, x = heapq.heappop(pq)
+            if cur_weight > dist[x]:
+                continue
+            if cur_weight > limit:
+                break
+            settled += 1
+            remaining.discard(x)
+
+            for y, edge in overlay[x].items():
+                if y == v:
+                    continue
+                new_weight = cur_weight + edge[0]
+                if new_weight < dist.get(y, INF):
+                    dist[y] = new_weight
+                    heapq.heappush(pq, (new_weight, y))
+
+        for w, edge_w in others:
+            weight = edge_u[0] + edge_w[0]
+            if dist.get(w, INF) > weight:
+                shortcut = (weight, edge_u[1] + edge_w[1], edge_u[2] + edge_w[2], edge_u[3] + edge_w[3], v)
+                result.append((u, w, shortcut))
+
+    return result
+
+'''
+Функция build_index строит иерархии сжатия по всем критериям (Д, В, С)
+'''
+def build_index(graph, witness_limit: int = 64) -> dict[str, ContractionHierarchy]:
+    return {crit: ContractionHierarchy.build(graph, criterion, witness_limit)
+            for crit, criterion in CRITERION_NAMES.items()}
+
+'''
+Функция save_index сохраняет иерархии в файл JSON вместе с версией формата и хешем графа
+'''
+def save_index(index: dict[str, ContractionHierarchy], filename: str, fingerprint: str) -> None:
+    data = {
+        "version": INDEX_VERSION,
+        "fingerprint": fingerprint,
+        "criteria": {
+            crit: [[v, [[w, *edge] for w, edge in edges.items()]] for v, edges in ch.up.items()]
+            for crit, ch in index.items()
+        },
+    }
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+'''
+Функция load_index загружает иерархии из файла. Если передан граф, индекс проверяется на соответствие ему
+'''
+def load_index(filename: str, graph=None) -> dict[str, ContractionHierarchy]:
+    try:
+        with open(filename, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise RuntimeError(f"Файл {filename} не найден")
+    except ValueError:
+        raise RuntimeError("Ошибка формата файла индекса")
+
+    if data.get("version") != INDEX_VERSION:
+        raise RuntimeError("Неподдерживаемая версия файла индекса")
+
+    if graph is not None and data["fingerprint"] != graph_fingerprint(graph):
+        raise RuntimeError("Индекс построен для другого графа")
+
+    index = {}
+    for crit, vertices in data["criteria"].items():
+        up = {v: {w: tuple(edge) for w, *edge in edges} for v, edges in vertices}
+        index[crit] = ContractionHierarchy(CRITERION_NAMES[crit], up)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Построение иерархий сжатия для поиска маршрутов")
+    parser.add_argument("input_file", nargs="?", default="input.txt")
+    parser.add_argument("index_file", nargs="?", default="ch_index.json")
+    parser.add_argument("--witness-limit", type=int, default=64, help="ограничение поиска-свидетеля")
+    args = parser.parse_args()
+
+    try:
+        started = time.perf_counter()
+        cities, city_name_to_id, graph, requests = read_input(args.input_file)
+        index = build_index(graph, args.witness_limit)
+        save_index(index, args.index_file, graph_fingerprint(graph))
+
+        for crit, ch in index.items():
+            shortcuts = sum(edge[4] is not None for edges in ch.up.values() for edge in edges.values())
+            print(f"{crit}: ярлыков {shortcuts}")
+        print(f"Индекс сохранён в {args.index_file} за {time.perf_counter() - started:.2f} с")
+
+    except Exception as e:
+        print(f"Ошибка: {e}\n")
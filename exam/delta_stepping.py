@@ -0,0 +1,140 @@
+#Модуль работает только с NumPy, без него delta_stepping выбрасывает RuntimeError
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+#Расстояние до недостижимых вершин во время поиска, сумма с любым весом дороги помещается в int64
+_FAR = np.iinfo(np.int64).max // 4 if np is not None else None
+
+'''
+Функция delta_stepping строит дерево кратчайших путей из города source по критерию criterion для CSRGraph
+алгоритмом delta-stepping: вершины раскладываются по корзинам ширины delta по текущему расстоянию,
+и все рёбра вершин наименьшей корзины релаксируются сразу векторными операциями NumPy
+(выборка рёбер по offsets, минимум по концам рёбер через np.minimum.at), пока корзина не перестанет меняться.
+Возвращает массивы по внутренним номерам вершин:
+1. dist - значение критерия до вершины, -1 для недостижимых
+2. prev - внутренний номер предыдущей вершины, -1 для source и недостижимых
+Предки выбираются по правилу алгоритма Дейкстры (см. _predecessors), поэтому массивы совпадают с деревом
+find_shortest_path_tree. Веса дорог должны быть положительными. Если delta не задана, берётся удвоенный
+средний вес ребра
+'''
+def delta_stepping(graph, source: int, criterion: int, delta: int | None = None):
+    dist, edge = _search(graph, source, criterion, delta)
+    prev = np.full(len(dist), -1, dtype=np.int64)
+    reached = edge >= 0
+    prev[reached] = _edge_sources(graph)[edge[reached]]
+    dist[dist == _FAR] = -1
+    return dist, prev
+
+'''
+Функция delta_stepping_routes находит маршруты из source до городов targets в формате solve_route:
+словарь город -> (длина, время, стоимость, путь) или None, если пути нет
+'''
+def delta_stepping_routes(graph, source: int, criterion: int, targets, delta: int | None = None) -> dict:
+    _, edge = _search(graph, source, criterion, delta)
+    sources = _edge_sources(graph)
+    ids, lengths, times, costs = graph.ids, graph.lengths, graph.times, graph.costs
+    start = graph.index[source]
+
+    routes = {}
+    for target in targets:
+        v = graph.index[target]
+        if v != start and edge[v] < 0:
+            routes[target] = None
+            continue
+
+        path = [target]
+        total_length = total_time = total_cost = 0
+        while v != start:
+            k = int(edge[v])
+            total_length += lengths[k]
+            total_time += times[k]
+            total_cost += costs[k]
+            v = int(sources[k])
+            path.append(ids[v])
+
+        path.reverse()
+        routes[target] = (total_length, total_time, total_cost, path)
+    return routes
+
+'''
+Поиск расстояний и выбор рёбер дерева. Возвращает dist (с _FAR для недостижимых вершин) и edge - номер ребра
+в массивах CSR, по которому вершина достигнута, или -1
+'''
+def _search(graph, source: int, criterion: int, delta: int | None):
+    if np is None:
+        raise RuntimeError("Для алгоритма delta-stepping необходим NumPy")
+    if source not in graph:
+        raise ValueError("Начальная вершина отсутствует в графе")
+    if criterion not in (0, 1, 2):
+        raise ValueError("Некорректный критерий оптимизации")
+
+    offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+    targets = np.frombuffer(graph.targets, dtype=np.int64)
+    weights = np.frombuffer((graph.lengths, graph.times, graph.costs)[criterion], dtype=np.int64)
+    if len(weights) and weights.min() < 1:
+        raise ValueError("Для алгоритма delta-stepping веса дорог должны быть положительными")
+    if delta is None:
+        delta = max(1, int(2 * weights.mean())) if len(weights) else 1
+    if delta < 1:
+        raise ValueError("Ширина корзины delta должна быть положительной")
+
+    n = len(offsets) - 1
+    degrees = np.diff(offsets)
+    dist = np.full(n, _FAR, dtype=np.int64)
+    start = graph.index[source]
+    dist[start] = 0
+
+    #pending - вершины, расстояние до которых уменьшилось, а рёбра ещё не релаксированы
+    pending = np.array([start], dtype=np.int64)
+    while len(pending):
+        buckets = dist[pending] // delta
+        current = buckets == buckets.min()
+        frontier = pending[current]
+        pending = pending[~current]
+
+        counts = degrees[frontier]
+        total = int(counts.sum())
+        if not total:
+            continue
+
+        #Номера всех рёбер вершин корзины: для каждой вершины диапазон offsets[u]..offsets[u + 1]
+        shift = np.repeat(offsets[frontier] - (np.cumsum(counts) - counts), counts)
+        edges = shift + np.arange(total)
+        ends = targets[edges]
+        candidates = np.repeat(dist[frontier], counts) + weights[edges]
+
+        better = candidates < dist[ends]
+        if not better.any():
+            continue
+        ends = ends[better]
+        np.minimum.at(dist, ends, candidates[better])
+        pending = np.union1d(pending, ends)
+
+    return dist, _predecessors(offsets, targets, weights, dist)
+
+'''
+Выбор ребра дерева для каждой вершины по правилу алгоритма Дейкстры: среди рёбер u -> v с dist[u] + вес = dist[v]
+берётся ребро вершины u, извлекаемой из очереди раньше, то есть с наименьшей парой (dist[u], u), а среди рёбер одной
+вершины - первое. Рёбра вершины лежат в CSR подряд и по возрастанию u, поэтому достаточно пары (dist[u], номер ребра)
+'''
+def _predecessors(offsets, targets, weights, dist):
+    n = len(dist)
+    sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    from_dist = dist[sources]
+    tight = np.flatnonzero((from_dist < _FAR) & (from_dist + weights == dist[targets]))
+
+    order = np.lexsort((tight, from_dist[tight], targets[tight]))
+    tight = tight[order]
+    ends = targets[tight]
+    first = np.ones(len(tight), dtype=bool)
+    first[1:] = ends[1:] != ends[:-1]
+
+    edge = np.full(n, -1, dtype=np.int64)
+    edge[ends[first]] = tight[first]
+    return edge
+
+def _edge_sources(graph):
+    offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
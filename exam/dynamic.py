@@ -0,0 +1,261 @@
+import heapq
+from collections import OrderedDict
+
+from components import Components
+from graph import INF
+from search import CRITERION_NAMES, restore_path
+from trees import find_shortest_path_tree
+
+'''
+Дерево кратчайших путей из вершины start по критерию criterion, которое можно исправлять после изменения дорог.
+Помимо prev, dist и totals из find_shortest_path_tree хранится children - дочерние вершины каждой вершины дерева.
+Дерево всегда совпадает с тем, что построил бы find_shortest_path_tree заново: предком вершины v является
+та из вершин x с dist[x] + вес = dist[v], что извлекается алгоритмом Дейкстры раньше, то есть с наименьшей
+парой (dist[x], x), а ребром - первое такое ребро x - v. Это верно при положительных весах дорог
+'''
+class ShortestPathTree:
+    def __init__(self, graph, start: int, criterion: int):
+        self.start = start
+        self.criterion = criterion
+        self.prev, self.dist, self.totals = find_shortest_path_tree(graph, start, criterion)
+        self.children = {}
+        for v, u in self.prev.items():
+            self.children.setdefault(u, set()).add(v)
+
+    def _weight(self, e) -> int:
+        return e.length if self.criterion == 0 else e.time if self.criterion == 1 else e.cost
+
+    '''
+    Исправление дерева после изменения дороги u - v, вес которой по критерию дерева был old_weight, а стал new_weight
+    (INF для отсутствующей дороги). Граф уже должен быть изменён. Возвращает число пересчитанных вершин
+    '''
+    def repair(self, graph, u: int, v: int, old_weight, new_weight) -> int:
+        if new_weight > old_weight:
+            changed = self._raise(graph, u, v)
+        elif new_weight < old_weight:
+            changed = self._lower(graph, u, v)
+        else:
+            changed = set()
+
+        #Предок может смениться у вершин с новым расстоянием, у концов дороги и у соседей вершин,
+        #расстояние до которых уменьшилось
+        candidates = changed | {u, v}
+        if new_weight < old_weight:
+            for x in changed:
+                candidates.update(e.to for e in graph.adj[x])
+
+        marked = set()
+        for x in candidates:
+            if x == self.start:
+                continue
+            if x not in self.dist:
+                self._set_parent(x, None)
+                self.totals.pop(x, None)
+                continue
+            self._set_parent(x, self._best_parent(graph, x)[0])
+            marked.add(x)
+
+        self._update_totals(graph, marked)
+        return len(candidates)
+
+    '''
+    Увеличение веса или закрытие дороги: если дорога входила в дерево, расстояния всего поддерева под ней
+    сбрасываются и находятся заново алгоритмом Дейкстры, начиная с границы поддерева
+    '''
+    def _raise(self, graph, u: int, v: int) -> set:
+        if self.prev.get(v) == u:
+            root = v
+        elif self.prev.get(u) == v:
+            root = u
+        else:
+            return set()
+
+        affected = {root}
+        stack = [root]
+        while stack:
+            for child in self.children.get(stack.pop(), ()):
+                affected.add(child)
+                stack.append(child)
+
+        for x in affected:
+            del self.dist[x]
+
+        pq = []
+        for x in affected:
+            best = INF
+            for e in graph.adj[x]:
+                if e.to not in affected and e.to in self.dist:
+                    best = min(best, self.dist[e.to] + self._weight(e))
+            if best < INF:
+                self.dist[x] = best
+                pq.append((best, x))
+        heapq.heapify(pq)
+
+        while pq:
+            cur_weight, x = heapq.heappop(pq)
+            if cur_weight > self.dist[x]:
+                continue
+            for e in graph.adj[x]:
+                if e.to in affected:
+                    new_weight = cur_weight + self._weight(e)
+                    if new_weight < self.dist.get(e.to, INF):
+                        self.dist[e.to] = new_weight
+                        heapq.heappush(pq, (new_weight, e.to))
+
+        return affected
+
+    '''
+    Уменьшение веса или новая дорога: улучшенные расстояния распространяются от концов дороги алгоритмом Дейкстры,
+    который останавливается на вершинах, расстояние до которых не уменьшилось
+    '''
+    def _lower(self, graph, u: int, v: int) -> set:
+        changed = set()
+        pq = []
+        for a, b in ((u, v), (v, u)):
+            if a not in self.dist:
+                continue
+            for e in graph.adj[a]:
+                if e.to == b and self.dist[a] + self._weight(e) < self.dist.get(b, INF):
+                    self.dist[b] = self.dist[a] + self._weight(e)
+                    heapq.heappush(pq, (self.dist[b], b))
+
+        while pq:
+            cur_weight, x = heapq.heappop(pq)
+            if cur_weight > self.dist[x]:
+                continue
+            changed.add(x)
+            for e in graph.adj[x]:
+                new_weight = cur_weight + self._weight(e)
+                if new_weight < self.dist.get(e.to, INF):
+                    self.dist[e.to] = new_weight
+                    heapq.heappush(pq, (new_weight, e.to))
+
+        return changed
+
+    '''
+    Предок вершины x и ребро к нему по правилу выбора алгоритма Дейкстры
+    '''
+    def _best_parent(self, graph, x: int):
+        best, best_edge = None, None
+        for e in graph.adj[x]:
+            y = e.to
+            if y == x or y not in self.dist or self.dist[y] + self._weight(e) != self.dist[x]:
+                continue
+            if best is None or (self.dist[y], y) < (self.dist[best], best):
+                best, best_edge = y, e
+        return best, best_edge
+
+    def _set_parent(self, x: int, parent) -> None:
+        old = self.prev.get(x)
+        if old == parent:
+            return
+        if old is not None:
+            self.children[old].discard(x)
+            del self.prev[x]
+        if parent is not None:
+            self.prev[x] = parent
+            self.children.setdefault(parent, set()).add(x)
+
+    '''
+    Пересчёт сумм длины, времени и стоимости для отмеченных вершин: отмеченный предок обрабатывается раньше потомков.
+    Если сумма вершины изменилась, она переносится на всё её поддерево, в том числе на отмеченные вершины,
+    которые отделены от неё неотмеченными и поэтому могли быть пересчитаны раньше
+    '''
+    def _update_totals(self, graph, marked: set) -> None:
+        order = []
+        seen = set()
+        for x in marked:
+            chain = []
+            while x in marked and x not in seen:
+                seen.add(x)
+                chain.append(x)
+                x = self.prev[x]
+            order.extend(reversed(chain))
+
+        for x in order:
+            if not self._refresh_totals(graph, x):
+                continue
+            stack = list(self.children.get(x, ()))
+            while stack:
+                y = stack.pop()
+                if self._refresh_totals(graph, y):
+                    stack.extend(self.children.get(y, ()))
+
+    def _refresh_totals(self, graph, x: int) -> bool:
+        parent, e = self._best_parent(graph, x)
+        length, time, cost = self.totals[parent]
+        new_totals = (length + e.length, time + e.time, cost + e.cost)
+        if self.totals.get(x) == new_totals:
+            return False
+        self.totals[x] = new_totals
+        return True
+
+'''
+Поиск маршрутов на изменяемом графе. Деревья кратчайших путей из начальных городов кэшируются (не более max_trees,
+давно не использованные вытесняются), а при изменении дороги исправляются только затронутые вершины каждого дерева.
+Граф должен быть Graph с положительными значениями длины, времени и стоимости дорог
+'''
+class DynamicRouter:
+    def __init__(self, graph, max_trees: int = 64):
+        if max_trees < 1:
+            raise ValueError("Некорректный размер кэша деревьев")
+        for edges in graph.adj.values():
+            for e in edges:
+                _check_values(e.length, e.time, e.cost)
+
+        self.graph = graph
+        #Компоненты связности только объединяются при добавлении дорог, после закрытия дороги они остаются верной
+        #проверкой: города из разных компонент недостижимы друг из друга
+        self.components = Components.from_graph(graph)
+        self.max_trees = max_trees
+        self.trees = OrderedDict()
+        self.repaired = 0
+
+    '''
+    Маршрут start -> end по критерию crit в формате solve_route: (длина, время, стоимость, путь)
+    '''
+    def route(self, start: int, end: int, crit: str):
+        if start in self.graph and end in self.graph and not self.components.connected(start, end):
+            raise RuntimeError("Путь не существует")
+        tree = self.tree(start, CRITERION_NAMES[crit])
+        path = restore_path(tree.prev, start, end)
+        return (*tree.totals[end], path)
+
+    def tree(self, start: int, criterion: int) -> ShortestPathTree:
+        key = (start, criterion)
+        if key in self.trees:
+            self.trees.move_to_end(key)
+            return self.trees[key]
+
+        tree = ShortestPathTree(self.graph, start, criterion)
+        self.trees[key] = tree
+        if len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+        return tree
+
+    def update_road(self, u: int, v: int, length: int | None = None, time: int | None = None,
+                    cost: int | None = None) -> None:
+        _check_values(*(value for value in (length, time, cost) if value is not None))
+        old = self.graph.update_edge(u, v, length, time, cost)
+        new = tuple(old[k] if value is None else value for k, value in enumerate((length, time, cost)))
+        self._repair(u, v, old, new)
+
+    def add_road(self, u: int, v: int, length: int, time: int, cost: int) -> None:
+        _check_values(length, time, cost)
+        if u not in self.graph or v not in self.graph:
+            raise ValueError("Начальная или конечная вершина отсутствует в графе")
+        self.graph.add_edge(u, v, length, time, cost)
+        self.components.add_road(u, v)
+        self._repair(u, v, (INF, INF, INF), (length, time, cost))
+
+    def close_road(self, u: int, v: int) -> None:
+        old = self.graph.remove_edge(u, v)
+        self._repair(u, v, old, (INF, INF, INF))
+
+    def _repair(self, u: int, v: int, old: tuple, new: tuple) -> None:
+        for (_, criterion), tree in self.trees.items():
+            self.repaired += tree.repair(self.graph, u, v, old[criterion], new[criterion])
+
+def _check_values(*values) -> None:
+    if any(value <= 0 for value in values):
+        raise ValueError("Длина, время и стоимость дороги должны быть положительными")
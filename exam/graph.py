@@ -0,0 +1,473 @@
+import hashlib
+import re
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+#tables импортирует graph, поэтому DistanceTable нужна только для аннотаций
+if TYPE_CHECKING:
+    from tables import DistanceTable
+
+#NumPy нужен только для быстрого разбора секции [ROADS], без него используется построчный разбор
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INF = float("inf")
+'''
+Создание структуры ребра, в которой отражены:
+    точка назначения - to
+    длина пути - length
+    стоимость пути - cost
+'''
+@dataclass
+class Edge:
+    to: int
+    length: int
+    time: int
+    cost: int
+
+    def __str__(self):
+        return f" {self.to} (Д={self.length}, В={self.time}, С={self.cost})"
+
+'''
+Создание структуры графа, в который содержит словарь adj, где 
+u - вершина ребра, из которой оно исходит
+adj[u] - ребро из вершины u
+Так как граф двунаправленный, то необходимо добавлять два ребра с одинаковой стоимостью, временем и длиной,
+то есть из u в v и из v в u
+'''
+class Graph:
+    def __init__(self):
+        self.adj = {}
+        self._weight_ranges = None
+
+    def add_vertex(self, v: int):
+        if v not in self.adj:
+            self.adj[v] = []
+
+    def add_edge(self, u: int, v: int, length: int, time: int, cost: int):
+        self.adj[u].append(Edge(v, length, time, cost))
+        self.adj[v].append(Edge(u, length, time, cost))
+        self._weight_ranges = None
+
+    '''
+    Позиции в adj[u] и adj[v] двух рёбер первой дороги между u и v.
+    Параллельные дороги лежат в обоих списках в порядке добавления, поэтому первые совпадения относятся к одной дороге
+    '''
+    def _find_edge(self, u: int, v: int) -> tuple[int, int]:
+        if u not in self.adj or v not in self.adj:
+            raise ValueError("Начальная или конечная вершина отсутствует в графе")
+
+        forward = next((i for i, e in enumerate(self.adj[u]) if e.to == v), None)
+        if forward is None:
+            raise ValueError(f"Дорога {u} - {v} отсутствует в графе")
+        #Петля хранится в adj[u] дважды, обратное ребро идёт следом за прямым
+        start = forward + 1 if u == v else 0
+        backward = next(i for i, e in enumerate(self.adj[v]) if e.to == u and i >= start)
+        return forward, backward
+
+    '''
+    Изменение длины, времени или стоимости первой дороги между u и v, None оставляет значение прежним.
+    Возвращает прежние значения (длина, время, стоимость)
+    '''
+    def update_edge(self, u: int, v: int, length: int | None = None, time: int | None = None,
+                    cost: int | None = None) -> tuple[int, int, int]:
+        forward, backward = self._find_edge(u, v)
+        old = self.adj[u][forward]
+        values = (old.length, old.time, old.cost)
+
+        for e in (self.adj[u][forward], self.adj[v][backward]):
+            e.length = values[0] if length is None else length
+            e.time = values[1] if time is None else time
+            e.cost = values[2] if cost is None else cost
+        self._weight_ranges = None
+        return values
+
+    '''
+    Удаление первой дороги между u и v. Возвращает её значения (длина, время, стоимость)
+    '''
+    def remove_edge(self, u: int, v: int) -> tuple[int, int, int]:
+        forward, backward = self._find_edge(u, v)
+        old = self.adj[u][forward]
+        #Для петли обратное ребро стоит позже прямого, поэтому оно удаляется первым
+        del self.adj[v][backward]
+        del self.adj[u][forward]
+        return old.length, old.time, old.cost
+
+    def __contains__(self, v: int) -> bool:
+        return v in self.adj
+
+    def __len__(self) -> int:
+        return len(self.adj)
+
+    def vertices(self) -> list[int]:
+        return list(self.adj)
+
+    def neighbors(self, v: int):
+        for e in self.adj[v]:
+            yield e.to, e.length, e.time, e.cost
+
+    '''
+    Наименьший и наибольший вес рёбер по критерию criterion, (0, 0) для графа без рёбер.
+    Диапазоны вычисляются при первом обращении и сбрасываются при добавлении или изменении дороги,
+    после удаления дороги диапазон может оказаться шире настоящего, что для выбора очереди не важно
+    '''
+    def weight_range(self, criterion: int) -> tuple[int, int]:
+        if self._weight_ranges is None:
+            ranges = [[INF, 0], [INF, 0], [INF, 0]]
+            for edges in self.adj.values():
+                for e in edges:
+                    for bounds, value in zip(ranges, (e.length, e.time, e.cost)):
+                        if value < bounds[0]:
+                            bounds[0] = value
+                        if value > bounds[1]:
+                            bounds[1] = value
+            self._weight_ranges = [(0 if low == INF else low, high) for low, high in ranges]
+        return self._weight_ranges[criterion]
+
+    '''
+    Таблица кратчайших путей между городами origins и destinations по критерию criterion, см. distance_table
+    '''
+    def distance_table(self, origins, destinations, criterion: int, paths: bool = False) -> "DistanceTable":
+        from tables import distance_table
+        return distance_table(self, origins, destinations, criterion, paths)
+
+    def __str__(self):
+        result = []
+        for u in sorted(self.adj):
+            edges = ", ".join(str(e) for e in self.adj[u])
+            result.append(f"{u}: {edges}")
+        return "\n".join(result)
+
+'''
+Компактное неизменяемое представление графа в формате CSR (compressed sparse row), в котором отражены:
+    ids - идентификаторы городов по возрастанию, позиция в массиве - внутренний номер вершины
+    offsets - рёбра вершины i лежат в диапазоне offsets[i]..offsets[i + 1]
+    targets - внутренний номер вершины, в которую ведёт ребро
+    lengths, times, costs - параллельные столбцы длины, времени и стоимости рёбер
+Вместо двух объектов Edge на каждую дорогу хранятся только массивы целых чисел.
+Порядок рёбер каждой вершины совпадает с порядком в Graph.adj, поэтому поиск пути даёт те же маршруты
+'''
+class CSRGraph:
+    __slots__ = ("ids", "index", "offsets", "targets", "lengths", "times", "costs", "_weight_ranges")
+
+    def __init__(self, ids, offsets, targets, lengths, times, costs):
+        #Массивы доступны только для чтения, поэтому граф нельзя изменить после построения
+        for name, values in (("ids", ids), ("offsets", offsets), ("targets", targets),
+                             ("lengths", lengths), ("times", times), ("costs", costs)):
+            object.__setattr__(self, name, memoryview(values).toreadonly())
+        object.__setattr__(self, "index", {v: i for i, v in enumerate(self.ids)})
+        object.__setattr__(self, "_weight_ranges", [None, None, None])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CSRGraph нельзя изменить после построения")
+
+    @classmethod
+    def from_edges(cls, vertices, edges_u, edges_v, lengths, times, costs) -> "CSRGraph":
+        ids = array("q", sorted(vertices))
+        index = {v: i for i, v in enumerate(ids)}
+        n = len(ids)
+
+        #Подсчёт степени каждой вершины, каждая дорога даёт по ребру в обе стороны
+        offsets = array("q", bytes(8 * (n + 1)))
+        for u, v in zip(edges_u, edges_v):
+            offsets[index[u] + 1] += 1
+            offsets[index[v] + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        m = offsets[n]
+        targets = array("q", bytes(8 * m))
+        out_lengths = array("q", bytes(8 * m))
+        out_times = array("q", bytes(8 * m))
+        out_costs = array("q", bytes(8 * m))
+        pos = offsets[:-1]
+
+        #Рёбра раскладываются по вершинам в порядке появления дорог, как в Graph.add_edge
+        for u, v, length, time, cost in zip(edges_u, edges_v, lengths, times, costs):
+            for a, b in ((index[u], index[v]), (index[v], index[u])):
+                k = pos[a]
+                targets[k] = b
+                out_lengths[k] = length
+                out_times[k] = time
+                out_costs[k] = cost
+                pos[a] = k + 1
+
+        return cls(ids, offsets, targets, out_lengths, out_times, out_costs)
+
+    '''
+    Построение по таблице дорог NumPy формы (m, 5) со столбцами u, v, длина, время, стоимость.
+    Результат совпадает с from_edges, но раскладка рёбер по вершинам выполняется устойчивой сортировкой
+    '''
+    @classmethod
+    def from_road_table(cls, vertices, roads) -> "CSRGraph":
+        ids = np.array(sorted(vertices), dtype=np.int64)
+        n = len(ids)
+
+        #Каждая дорога даёт ребро u -> v и следом v -> u, как в from_edges
+        ends = roads[:, :2].ravel()
+        if n and ids[-1] - ids[0] < 4 * n:
+            #Идентификаторы плотные: номер вершины берётся из таблицы по смещению идентификатора
+            table = np.full(ids[-1] - ids[0] + 1, -1, dtype=np.int64)
+            table[ids - ids[0]] = np.arange(n)
+            shifted = ends - ids[0]
+            inside = (shifted >= 0) & (shifted < len(table))
+            pos = table[np.where(inside, shifted, 0)]
+            missing = ~inside | (pos < 0)
+        elif n:
+            pos = np.searchsorted(ids, ends)
+            missing = (pos >= n) | (ids[np.minimum(pos, n - 1)] != ends)
+        else:
+            pos = ends
+            missing = np.ones(len(ends), dtype=bool)
+        if missing.any():
+            raise KeyError(int(ends[np.argmax(missing)]))
+
+        sources = pos
+        targets = pos.reshape(-1, 2)[:, ::-1].ravel()
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+
+        columns = [ids, offsets, targets[order]]
+        columns += [np.repeat(roads[:, k], 2)[order] for k in (2, 3, 4)]
+        return cls(*(array("q", column.astype(np.int64).tobytes()) for column in columns))
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "CSRGraph":
+        ids = array("q", sorted(graph.adj))
+        index = {v: i for i, v in enumerate(ids)}
+        offsets = array("q", [0])
+        targets = array("q")
+        lengths = array("q")
+        times = array("q")
+        costs = array("q")
+
+        for v in ids:
+            for e in graph.adj[v]:
+                targets.append(index[e.to])
+                lengths.append(e.length)
+                times.append(e.time)
+                costs.append(e.cost)
+            offsets.append(len(targets))
+
+        return cls(ids, offsets, targets, lengths, times, costs)
+
+    def __contains__(self, v: int) -> bool:
+        return v in self.index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def vertices(self) -> list[int]:
+        return list(self.ids)
+
+    def neighbors(self, v: int):
+        i = self.index[v]
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            yield self.ids[self.targets[k]], self.lengths[k], self.times[k], self.costs[k]
+
+    '''
+    Наименьший и наибольший вес рёбер по критерию criterion, (0, 0) для графа без рёбер.
+    Столбец просматривается при первом обращении, для отображённого в память снимка - только по нужному критерию
+    '''
+    def weight_range(self, criterion: int) -> tuple[int, int]:
+        if self._weight_ranges[criterion] is None:
+            weights = (self.lengths, self.times, self.costs)[criterion]
+            if not len(weights):
+                bounds = (0, 0)
+            elif np is not None:
+                column = np.frombuffer(weights, dtype=np.int64)
+                bounds = (int(column.min()), int(column.max()))
+            else:
+                bounds = (min(weights), max(weights))
+            self._weight_ranges[criterion] = bounds
+        return self._weight_ranges[criterion]
+
+    '''
+    Таблица кратчайших путей между городами origins и destinations по критерию criterion, см. distance_table
+    '''
+    def distance_table(self, origins, destinations, criterion: int, paths: bool = False) -> "DistanceTable":
+        from tables import distance_table
+        return distance_table(self, origins, destinations, criterion, paths)
+
+    def __str__(self):
+        result = []
+        for v in self.ids:
+            edges = ", ".join(str(Edge(*e)) for e in self.neighbors(v))
+            result.append(f"{v}: {edges}")
+        return "\n".join(result)
+
+'''
+Функция graph_fingerprint вычисляет хеш графа по вершинам и рёбрам, чтобы сохранённые на диск
+индексы можно было проверить на соответствие текущему графу. Для Graph и построенного из него CSRGraph хеш совпадает
+'''
+def graph_fingerprint(graph: Graph) -> str:
+    digest = hashlib.sha256()
+    for v in sorted(graph.vertices()):
+        digest.update(f"{v}:".encode())
+        for to, length, time, cost in graph.neighbors(v):
+            digest.update(f"{to},{length},{time},{cost};".encode())
+    return digest.hexdigest()
+
+'''
+Функция read_input принимает на вход название файла в виде строки и извлекают из него:
+1. Названия городов и их идентификаторы
+2. Ребра для создания итогового графа, определенного структурой выше
+3. Запросы для создания маршрутов и параметры сортировки
+При compact=True дороги складываются сразу в массивы и возвращается CSRGraph без промежуточного Graph,
+а если установлен NumPy и bulk=True, секция [ROADS] разбирается целиком функцией _parse_roads_bulk.
+При stream=True запросы не загружаются в память, а возвращаются генератором iter_requests
+'''
+def read_input(filename, compact: bool = False, stream: bool = False, bulk: bool = True):
+    bulk = bulk and compact and np is not None
+    cities = {}
+    city_name_to_id = {}
+    graph = Graph()
+    requests = []
+    #Столбцы дорог для построения CSRGraph
+    edges_u, edges_v = array("q"), array("q")
+    lengths, times, costs = array("q"), array("q"), array("q")
+    #Строки секции [ROADS] для разбора одним блоком
+    road_lines = []
+
+    section = None
+    line_number = 0
+    try:
+        with open(filename, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                #Очистка строки от пробелов с начал и конца строки, пустые строки пропускаются
+                line = line.strip()
+                if not line:
+                    continue
+                #Название секции с информацией о данных
+                if line.startswith("[") and line.endswith("]"):
+                    section = line
+                    continue
+                #Выделение города и его идентификатора из секции с городами(CITIES)
+                if section == "[CITIES]":
+                    city_id_str, name = line.split(":", 1)
+                    city_id = int(city_id_str.strip())
+                    name = name.strip()
+
+                    cities[city_id] = name
+                    city_name_to_id[name] = city_id
+                    graph.add_vertex(city_id)
+
+                # Выделение точек ребра и его основных характеристик в секции ROADS
+                elif section == "[ROADS]":
+                    if bulk:
+                        road_lines.append(line)
+                        continue
+
+                    left, right = line.split(":")
+                    u_str, v_str = left.split("-")
+
+                    u = int(u_str.strip())
+                    v = int(v_str.strip())
+
+                    length, time, cost = map(int, right.split(","))
+
+                    if compact:
+                        edges_u.append(u)
+                        edges_v.append(v)
+                        lengths.append(length)
+                        times.append(time)
+                        costs.append(cost)
+                    else:
+                        graph.add_edge(u, v, length, time, cost)
+
+                # Выделение маршрута и параметров сортировки в секции REQUESTS
+                elif section == "[REQUESTS]" and not stream:
+                    requests.append(_parse_request(line))
+
+    except FileNotFoundError:
+        raise RuntimeError(f"Файл {filename} не найден")
+    except ValueError:
+        raise RuntimeError(f"Ошибка формата входных данных (строка {line_number})")
+
+    if bulk:
+        roads = _parse_roads_bulk(road_lines)
+        if roads is None:
+            #В секции есть строки необычного вида: построчный разбор обработает их или укажет строку с ошибкой
+            return read_input(filename, compact, stream, bulk=False)
+        graph = CSRGraph.from_road_table(cities, roads)
+    elif compact:
+        graph = CSRGraph.from_edges(cities, edges_u, edges_v, lengths, times, costs)
+
+    if stream:
+        requests = iter_requests(filename)
+
+    return cities, city_name_to_id, graph, requests
+
+#Строка дороги "u-v:длина,время,стоимость" после удаления пробелов, числа до 18 цифр помещаются в int64
+_ROAD_LINE = rb"\d{1,18}-\d{1,18}:\d{1,18},\d{1,18},\d{1,18}"
+_ROAD_BLOCK = re.compile(rb"%s(?:\n%s)*" % (_ROAD_LINE, _ROAD_LINE))
+_ROAD_SEPARATORS = bytes.maketrans(b"-:,\n\t", b"     ")
+
+'''
+Функция _parse_roads_bulk разбирает все строки секции [ROADS] за один проход: блок без пробелов проверяется
+одним регулярным выражением, разделители заменяются пробелами, а числа читаются NumPy в массив формы (m, 5).
+Пробел внутри числа не виден регулярному выражению, но увеличивает число прочитанных чисел, поэтому
+проверка их количества отбрасывает такие строки. Если хотя бы одна строка имеет другой вид
+(знак числа, подчёркивания, очень большие числа), возвращается None
+'''
+def _parse_roads_bulk(road_lines: list[str]):
+    if not road_lines:
+        return np.zeros((0, 5), dtype=np.int64)
+
+    try:
+        block = "\n".join(road_lines).encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if _ROAD_BLOCK.fullmatch(block.translate(None, b" \t")) is None:
+        return None
+
+    numbers = np.fromstring(block.translate(_ROAD_SEPARATORS), dtype=np.int64, sep=" ")
+    if len(numbers) != 5 * len(road_lines):
+        return None
+    return numbers.reshape(-1, 5)
+
+'''
+Разбор строки запроса: Город_отправления -> Город_назначения | Приоритеты
+'''
+def _parse_request(line: str):
+    path_part, priority_part = line.split("|")
+
+    start_name, end_name = map(str.strip, path_part.split("->"))
+    if end_name == "*":
+        #Запрос достижимости "Москва -> * | В<=300": вместо приоритетов - критерий и бюджет
+        limit = re.fullmatch(r"\s*\(?\s*([ДВС])\s*<=\s*(\d+)\s*\)?\s*", priority_part)
+        if limit is None:
+            raise ValueError("Некорректный бюджет запроса достижимости")
+        return start_name, end_name, [f"{limit[1]}<={limit[2]}"]
+
+    priorities = re.findall(r"[ДВС]", priority_part)
+
+    return start_name, end_name, priorities
+
+'''
+Генератор iter_requests читает файл построчно и по одному возвращает запросы из секции [REQUESTS],
+поэтому объём памяти не зависит от числа запросов
+'''
+def iter_requests(filename):
+    section = None
+    line_number = 0
+    try:
+        with open(filename, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("[") and line.endswith("]"):
+                    section = line
+                    continue
+                if section == "[REQUESTS]":
+                    yield _parse_request(line)
+
+    except FileNotFoundError:
+        raise RuntimeError(f"Файл {filename} не найден")
+    except ValueError:
+        raise RuntimeError(f"Ошибка формата входных данных (строка {line_number})")
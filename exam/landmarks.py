@@ -0,0 +1,93 @@
+import heapq
+
+from bidirectional import finish_dijkstra
+from graph import INF, Graph
+from trees import find_shortest_path_tree
+
+'''
+Ориентиры для алгоритма ALT, в которых отражены:
+    vertices - выбранные вершины-ориентиры
+    tables[criterion] - для каждого ориентира словарь расстояний до всех достижимых вершин по критерию criterion
+'''
+class Landmarks:
+    def __init__(self, vertices: list[int], tables: list[list[dict[int, int]]]):
+        self.vertices = vertices
+        self.tables = tables
+
+'''
+Функция build_landmarks выбирает count ориентиров и вычисляет таблицы расстояний от них по всем критериям.
+Вызывается один раз после read_input. Ориентиры выбираются жадно: каждый следующий - самая удалённая
+по длине вершина от уже выбранных, недостижимые вершины считаются самыми удалёнными,
+поэтому ориентиры получают и отдельные компоненты связности
+'''
+def build_landmarks(graph: Graph, count: int = 8) -> Landmarks:
+    if count < 1:
+        raise ValueError("Некорректное число ориентиров")
+
+    vertices = []
+    length_tables = []
+    nearest = {}
+    candidates = sorted(graph.vertices())
+    if not candidates:
+        return Landmarks([], [[], [], []])
+
+    landmark = candidates[0]
+    while len(vertices) < min(count, len(candidates)):
+        vertices.append(landmark)
+        dist = find_shortest_path_tree(graph, landmark, 0)[1]
+        length_tables.append(dist)
+        for v in candidates:
+            nearest[v] = min(nearest.get(v, INF), dist.get(v, INF))
+        landmark = max((v for v in candidates if v not in vertices), key=lambda v: nearest[v], default=None)
+        if landmark is None:
+            break
+
+    tables = [length_tables] + [[find_shortest_path_tree(graph, v, criterion)[1] for v in vertices]
+                                for criterion in (1, 2)]
+    return Landmarks(vertices, tables)
+
+'''
+A* с нижними оценками по ориентирам (ALT). По неравенству треугольника для любого ориентира L
+расстояние от v до end не меньше |d(L, end) - d(L, v)|, в качестве оценки берётся максимум по ориентирам.
+Оценка согласованная, поэтому вершина, извлечённая из очереди, окончательна, как и в алгоритме Дейкстры.
+A* извлекает вершины в другом порядке, чем алгоритм Дейкстры, и среди равных путей может выбрать другой,
+поэтому он находит только длину кратчайшего пути, а сам путь ищет finish_dijkstra в порядке алгоритма Дейкстры
+с отсечением вершин по той же оценке. Результат совпадает с find_optimal_path
+'''
+def find_optimal_path_alt(graph: Graph, start: int, end: int, criterion: int, landmarks: Landmarks):
+    tables = landmarks.tables[criterion]
+    to_end = [table.get(end) for table in tables]
+    estimates = {}
+
+    def estimate(v):
+        bound = estimates.get(v)
+        if bound is None:
+            bound = 0
+            for table, d_end in zip(tables, to_end):
+                d_v = table.get(v)
+                if d_end is not None and d_v is not None:
+                    bound = max(bound, abs(d_end - d_v))
+            estimates[v] = bound
+        return bound
+
+    dist = {start: 0}
+    pq = [(estimate(start), 0, start)]
+
+    while pq:
+        _, cur_weight, u = heapq.heappop(pq)
+
+        if cur_weight > dist[u]:
+            continue
+
+        if u == end:
+            return finish_dijkstra(graph, end, criterion, [(0, start)], {start: 0}, {}, {start: (0, 0, 0)},
+                                   cur_weight, estimate)
+
+        for v, length, time, cost in graph.neighbors(u):
+            new_weight = cur_weight + (length, time, cost)[criterion]
+
+            if new_weight < dist.get(v, INF):
+                dist[v] = new_weight
+                heapq.heappush(pq, (new_weight + estimate(v), new_weight, v))
+
+    return {}, None, None, None
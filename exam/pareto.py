@@ -0,0 +1,185 @@
+import heapq
+
+from graph import INF, Graph
+from search import CRITERION_NAMES, compromise_key, restore_path
+
+#Ограничение числа окончательных меток на вершину по умолчанию: без него число меток на больших графах
+#растёт так быстро, что построение фронта занимает минуты
+PARETO_MAX_LABELS = 4
+
+'''
+Лексикографический поиск из source: значение пути - кортеж сумм метрик в порядке order (номера критериев),
+пути сравниваются сначала по первой метрике, при равенстве - по второй, затем по третьей. Такой путь оптимален
+по первой метрике и парето-оптимален. Вершины с равным значением извлекаются по возрастанию номера,
+как в find_optimal_path. Поиск останавливается, когда окончательно достигнута точка target.
+Возвращает словарь значений и prev или None, если target недостижима
+'''
+def _lexicographic_search(graph: Graph, source: int, target: int, order):
+    first, second, third = order
+    dist = {source: (0, 0, 0)}
+    prev = {}
+    far = (INF,)
+    pq = [((0, 0, 0), source)]
+
+    while pq:
+        key, u = heapq.heappop(pq)
+
+        if key > dist[u]:
+            continue
+        if u == target:
+            return dist, prev
+
+        for v, *values in graph.neighbors(u):
+            new_key = (key[0] + values[first], key[1] + values[second], key[2] + values[third])
+            if new_key < dist.get(v, far):
+                dist[v] = new_key
+                prev[v] = u
+                heapq.heappush(pq, (new_key, v))
+
+    return None
+
+'''
+Проверка, доминирует ли какая-либо из меток labels метку (length, time, cost)
+'''
+def _dominated(labels, length, time, cost) -> bool:
+    for l, t, c in labels:
+        if l <= length and t <= time and c <= cost:
+            return True
+    return False
+
+'''
+Функция find_pareto_front ищет все парето-оптимальные пути из start в end по трём метрикам сразу.
+Каждая метка - это кортеж (длина, время, стоимость) пути до вершины и ссылка на метку-предка.
+Извлечённая из очереди метка окончательна, если её не доминирует ни одна уже окончательная метка той же вершины,
+а метки, которые даже с нижней оценкой оставшегося пути доминирует найденный путь до end, отбрасываются.
+max_labels ограничивает число окончательных меток на вершину: с ограничением фронт может оказаться неполным,
+но в нём всегда есть путь, лучший по каждому критерию, а при равенстве - по остальным в порядке priorities
+(например "ВДС"). None - без ограничения, точный фронт, который на больших графах может строиться очень долго.
+Возвращает список (длина, время, стоимость, путь), упорядоченный по возрастанию
+'''
+def find_pareto_front(graph: Graph, start: int, end: int, max_labels: int | None = PARETO_MAX_LABELS,
+                      priorities="ДВС"):
+
+    if start not in graph or end not in graph:
+        raise ValueError("Начальная или конечная вершина отсутствует в графе")
+
+    if sorted(CRITERION_NAMES[p] for p in priorities) != [0, 1, 2]:
+        raise ValueError("Некорректный порядок критериев")
+
+    if max_labels is not None and max_labels < 1:
+        raise ValueError("Некорректное ограничение числа меток")
+
+    #Нижние оценки оставшегося пути до end по каждой метрике. Граф неориентированный, поэтому поиск идёт из end
+    #и останавливается на start: вершины дальше start находятся от end не ближе, чем start.
+    #Поиск лексикографический (сначала по метрике оценки, затем по остальным в порядке priorities),
+    #поэтому найденные при этом пути парето-оптимальны и сразу становятся начальными метками конечной точки
+    bounds = []
+    front = []
+    for crit in ("Д", "В", "С"):
+        order = [CRITERION_NAMES[crit]] + [CRITERION_NAMES[p] for p in priorities if p != crit]
+        found = _lexicographic_search(graph, end, start, order)
+        if found is None:
+            return []
+
+        dist, prev = found
+        bounds.append((dist, dist[start][0]))
+        path = restore_path(prev, end, start) if start != end else [start]
+        path.reverse()
+        totals = [0, 0, 0]
+        for k, value in zip(order, dist[start]):
+            totals[k] = value
+        if all(list(result[:3]) != totals for result in front):
+            front.append((*totals, path))
+
+    estimates = {}
+
+    def estimate(v):
+        est = estimates.get(v)
+        if est is None:
+            est = estimates[v] = tuple(min(dist[v][0], radius) if v in dist else radius for dist, radius in bounds)
+        return est
+
+    limit = max_labels if max_labels is not None else INF
+
+    #Окончательные метки по вершинам: список кортежей (длина, время, стоимость)
+    settled = {}
+    end_labels = settled[end] = [result[:3] for result in front]
+    #Все созданные метки: вершина и номер метки-предка
+    label_vertex = [start]
+    label_parent = [-1]
+
+    #Очередь упорядочена по сумме метрик с нижними оценками: если метка доминирует другую метку той же вершины,
+    #то и приоритет у неё не больше, поэтому извлечённую метку не может доминировать извлечённая позже
+    pq = [(sum(estimate(start)), 0, 0, 0, 0)]
+
+    while pq:
+        _, cur_length, cur_time, cur_cost, label = heapq.heappop(pq)
+        u = label_vertex[label]
+        est_length, est_time, est_cost = estimate(u)
+
+        #Метка может устареть, пока лежит в очереди: вершина или конечная точка получила лучший путь
+        if _dominated(end_labels, cur_length + est_length, cur_time + est_time, cur_cost + est_cost):
+            continue
+        labels = settled.get(u)
+        if labels is None:
+            labels = settled[u] = []
+        elif _dominated(labels, cur_length, cur_time, cur_cost):
+            continue
+        if u != end and len(labels) >= limit:
+            continue
+
+        labels.append((cur_length, cur_time, cur_cost))
+
+        if u == end:
+            path = []
+            while label != -1:
+                path.append(label_vertex[label])
+                label = label_parent[label]
+            path.reverse()
+            front.append((cur_length, cur_time, cur_cost, path))
+            continue
+
+        for v, length, time, cost in graph.neighbors(u):
+            new_length = cur_length + length
+            new_time = cur_time + time
+            new_cost = cur_cost + cost
+            est_length, est_time, est_cost = estimate(v)
+            low_length = new_length + est_length
+            low_time = new_time + est_time
+            low_cost = new_cost + est_cost
+
+            #Отсечение по доминированию: метка не нужна, если даже с нижней оценкой её доминирует метка конечной точки
+            #или её доминирует окончательная метка вершины
+            if _dominated(end_labels, low_length, low_time, low_cost):
+                continue
+            v_labels = settled.get(v)
+            if v_labels and ((v != end and len(v_labels) >= limit) or _dominated(v_labels, new_length, new_time, new_cost)):
+                continue
+
+            label_vertex.append(v)
+            label_parent.append(label)
+            heapq.heappush(pq, (low_length + low_time + low_cost, new_length, new_time, new_cost, len(label_vertex) - 1))
+
+    front.sort()
+    return front
+
+'''
+Функция solve_pareto выбирает путь для критерия crit из парето-фронта маршрутов start_id -> end_id:
+минимальный по crit, а при равенстве - по остальным критериям в порядке приоритетов priorities.
+Фронт строится find_pareto_front с ограничением max_labels один раз на пару городов и приоритеты и сохраняется
+в словаре fronts, поэтому все критерии запроса выбираются из одного фронта. Возвращает результат в формате solve_route
+'''
+def solve_pareto(graph: Graph, start_id: int, end_id: int, crit: str, priorities: list[str],
+                 fronts: dict | None = None, max_labels: int | None = PARETO_MAX_LABELS):
+    key = (start_id, end_id, tuple(priorities))
+    front = fronts.get(key) if fronts is not None else None
+    if front is None:
+        front = find_pareto_front(graph, start_id, end_id, max_labels, priorities)
+        if fronts is not None:
+            fronts[key] = front
+
+    if not front:
+        raise RuntimeError("Путь не существует")
+
+    order = [crit] + [p for p in priorities if p != crit]
+    return min(front, key=lambda result: compromise_key(result, order))
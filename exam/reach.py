@@ -0,0 +1,72 @@
+import heapq
+
+from graph import INF, Graph
+
+'''
+Функция find_reachable находит все города, до которых из start можно добраться, не превысив budget
+по критерию criterion. Возвращает prev, dist и totals в формате find_shortest_path_tree, но только для этих городов:
+поиск не кладёт в очередь вершины дальше бюджета и завершается, как только минимум очереди превысит budget
+'''
+def find_reachable(graph: Graph, start: int, criterion: int, budget: int):
+    return find_reachable_many(graph, [start], criterion, budget)[start]
+
+'''
+Функция find_reachable_many - пакетный вариант find_reachable для нескольких начальных городов starts.
+Возвращает словарь начальный город -> (prev, dist, totals), как в find_reachable, отдельно для каждого города.
+Поиски из разных городов используют общий список соседей с весами по критерию: если области начальных
+городов пересекаются, дороги общей части графа читаются из графа один раз
+'''
+def find_reachable_many(graph: Graph, starts, criterion: int, budget: int) -> dict[int, tuple]:
+    starts = list(dict.fromkeys(starts))
+    for start in starts:
+        if start not in graph:
+            raise ValueError("Начальная вершина отсутствует в графе")
+
+    if criterion not in (0, 1, 2):
+        raise ValueError("Некорректный критерий оптимизации")
+
+    if budget < 0:
+        raise ValueError("Бюджет поиска не может быть отрицательным")
+
+    #Для одного города общий список соседей не нужен
+    adjacency = {} if len(starts) > 1 else None
+    return {start: _bounded_search(graph, start, criterion, budget, adjacency) for start in starts}
+
+'''
+Поиск из start с ограничением budget. adjacency - общий для поисков словарь вершина -> список
+(сосед, длина, время, стоимость), который заполняется при первом обращении к вершине, или None
+'''
+def _bounded_search(graph: Graph, start: int, criterion: int, budget: int, adjacency: dict):
+    dist = {start: 0}
+    prev = {}
+    totals = {start: (0, 0, 0)}
+
+    pq = [(0, start)]
+
+    while pq:
+        cur_weight, u = heapq.heappop(pq)
+
+        if cur_weight > budget:
+            break
+
+        if cur_weight > dist[u]:
+            continue
+
+        if adjacency is None:
+            edges = graph.neighbors(u)
+        else:
+            edges = adjacency.get(u)
+            if edges is None:
+                edges = adjacency[u] = list(graph.neighbors(u))
+
+        cur_length, cur_time, cur_cost = totals[u]
+        for v, length, time, cost in edges:
+            new_weight = cur_weight + (length, time, cost)[criterion]
+
+            if new_weight <= budget and new_weight < dist.get(v, INF):
+                dist[v] = new_weight
+                prev[v] = u
+                totals[v] = (cur_length + length, cur_time + time, cur_cost + cost)
+                heapq.heappush(pq, (new_weight, v))
+
+    return prev, dist, totals
@@ -0,0 +1,123 @@
+import json
+import sys
+from collections import OrderedDict
+
+#Версия формата файла кэша, при изменении формата старые файлы не загружаются
+CACHE_VERSION = 1
+
+'''
+Кэш найденных маршрутов с вытеснением давно не использованных записей (LRU).
+Ключ - упорядоченная пара городов и критерий. Разворот маршрута A -> B не используется как ответ на B -> A:
+среди равных по критерию путей поиск из B может выбрать другой, с другими значениями остальных метрик,
+и ответ с кэшем отличался бы от ответа без него. Дороги двусторонние, поэтому для B -> A используется
+только сохранённое для A -> B отсутствие пути.
+Значение - кортеж (длина, время, стоимость, путь) или RuntimeError, если пути не существует.
+Размер ограничивается числом записей max_entries и, при необходимости, примерным объёмом памяти max_bytes
+'''
+class RouteCache:
+    def __init__(self, max_entries: int = 100_000, max_bytes: int | None = None):
+        if max_entries < 1 or (max_bytes is not None and max_bytes < 1):
+            raise ValueError("Некорректный размер кэша")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        #Ключ (начальный город, конечный город, критерий) -> (значение, размер)
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.reverse_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, start: int, end: int, crit: str):
+        key = (start, end, crit)
+        entry = self._entries.get(key)
+        if entry is None:
+            #Если из end нет пути в start, то нет и пути из start в end
+            reverse = self._entries.get((end, start, crit))
+            if reverse is None or not isinstance(reverse[0], RuntimeError):
+                self.misses += 1
+                return None
+            key, entry = (end, start, crit), reverse
+            self.reverse_hits += 1
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, start: int, end: int, crit: str, value) -> None:
+        key = (start, end, crit)
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+
+        size = _entry_size(value)
+        self._entries[key] = (value, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "reverse_hits": self.reverse_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    '''
+    Сохранение кэша в файл JSON вместе с хешем графа, для которого найдены маршруты
+    '''
+    def save(self, filename: str, fingerprint: str) -> None:
+        entries = []
+        for (start, end, crit), (value, _) in self._entries.items():
+            if isinstance(value, RuntimeError):
+                entries.append([crit, start, end, str(value)])
+            else:
+                entries.append([crit, start, end, *value])
+
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "fingerprint": fingerprint, "entries": entries},
+                      f, ensure_ascii=False, separators=(",", ":"))
+
+    '''
+    Загрузка кэша из файла. Если файла нет, он повреждён или сохранён для другого графа,
+    возвращается пустой кэш: устаревшие маршруты использовать нельзя
+    '''
+    @classmethod
+    def load(cls, filename: str, fingerprint: str, max_entries: int = 100_000,
+             max_bytes: int | None = None) -> "RouteCache":
+        cache = cls(max_entries, max_bytes)
+        try:
+            with open(filename, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return cache
+
+        if data.get("version") != CACHE_VERSION or data.get("fingerprint") != fingerprint:
+            return cache
+
+        for crit, start, end, *value in data["entries"]:
+            if len(value) == 1:
+                cache.put(start, end, crit, RuntimeError(value[0]))
+            else:
+                cache.put(start, end, crit, tuple(value))
+        return cache
+
+'''
+Примерный объём памяти записи кэша в байтах
+'''
+def _entry_size(value) -> int:
+    if isinstance(value, RuntimeError):
+        return 200
+    return 200 + sys.getsizeof(value[3]) + 32 * len(value[3])
@@ -0,0 +1,231 @@
+import heapq
+
+from buckets import choose_queue, find_optimal_path_bucket
+from bidirectional import find_optimal_path_bidirectional
+from graph import INF, CSRGraph, Graph
+from landmarks import Landmarks, find_optimal_path_alt
+from search_stats import SearchStats
+
+#Определяем порядковый номер метрики в картеже для выбора критерия оценки
+CRITERION_NAMES = {
+    "Д": 0,
+    "В": 1,
+    "С": 2,
+}
+#Алгоритмы поиска пути между двумя точками, доступные в find_optimal_path
+ENGINES = ("dijkstra", "bucket", "bidirectional", "alt")
+
+'''
+Функция find_optimal_path принимает на вход:
+1. Граф, в котором надо найти путь, оптимизированный по параметру criterion
+2. Точку отправления - start
+3. Точку назначения - end
+4. Номер параметра, по которому будет оптимизироваться путь
+5. Алгоритм поиска engine: "dijkstra" - обычный алгоритм Дейкстры, "bucket" - алгоритм Дейкстры с корзинами
+   Дайала для целых весов, если они выгодны для графа (см. choose_queue), "bidirectional" - двунаправленный поиск,
+   "alt" - A* с нижними оценками по ориентирам landmarks, построенным заранее функцией build_landmarks
+6. Счётчики stats (SearchStats), которые заполняются при engine="dijkstra"
+Граф может быть как Graph, так и CSRGraph
+'''
+def find_optimal_path(graph:Graph, start: int, end: int, criterion: int, engine: str = "dijkstra",
+                      landmarks: Landmarks | None = None, stats: SearchStats | None = None):
+
+    if start not in graph or end not in graph:
+        raise ValueError("Начальная или конечная вершина отсутствует в графе")
+
+    if criterion not in (0, 1, 2):
+        raise ValueError("Некорректный критерий оптимизации")
+
+    if engine not in ENGINES:
+        raise ValueError("Некорректный алгоритм поиска")
+
+    #Если очередь для целых весов не быстрее кучи или не применима из-за рёбер нулевого веса,
+    #используется обычный алгоритм
+    if engine == "bucket":
+        queue = choose_queue(graph, criterion)
+        if queue is not None:
+            return find_optimal_path_bucket(graph, start, end, criterion, queue)
+
+    if engine == "bidirectional":
+        return find_optimal_path_bidirectional(graph, start, end, criterion)
+
+    if engine == "alt":
+        if landmarks is None:
+            raise ValueError("Для алгоритма ALT необходимо заранее построить ориентиры")
+        return find_optimal_path_alt(graph, start, end, criterion, landmarks)
+
+    if stats is not None:
+        return _find_optimal_path_counted(graph, start, end, criterion, stats)
+
+    if isinstance(graph, CSRGraph):
+        return _find_optimal_path_csr(graph, start, end, criterion)
+
+    dist = {v: INF for v in graph.adj} #Список минимальных значений по выбранному параметру
+    dist[start] = 0 #Начальная точка инициализируется 0, так как в неё не должен алгоритм вернуться
+    prev = {} #Кортеж предыдущих значений вершин для восстановления пути
+
+    total_length = None
+    total_time = None
+    total_cost = None
+
+    pq = [(0, start, 0, 0, 0)] #Инициализация значений для очереди, в стартовой точки расстояние, стоимость и время равны 0
+
+
+    while pq: #Алгоритм продолжается, пока в очереди есть значения
+        cur_weight, u, cur_length, cur_time, cur_cost = heapq.heappop(pq) #В отсортированной по убыванию очереди берется первое значение ребра с наименьшими параметрами
+
+        if cur_weight > dist[u]:
+            continue
+
+        if u == end: #Алгоритм завершается, если достигнутна конечная точка
+            total_length = cur_length
+            total_time = cur_time
+            total_cost = cur_cost
+            break
+
+        for e in graph.adj[u]: #Рассматриваем ребра для вершины u
+            weights = [e.length, e.time, e.cost] #Извлекаем метрики ребра
+            new_weight = cur_weight + weights[criterion] #Суммируем текущее значение для достигнутой точки со следующим по оптимизируемой метрике
+
+            if new_weight < dist[e.to]:#Если полученное значение меньше определенного на прошлых шагах минимального, то обновляем минимальное значение
+                dist[e.to] = new_weight
+                prev[e.to] = u
+                heapq.heappush(
+                    pq,
+                    (new_weight, e.to,cur_length + e.length,cur_time + e.time,cur_cost + e.cost)
+                ) #Добавляем в очередь значения полученной новой точки
+
+    return prev, total_length, total_time, total_cost
+
+'''
+Алгоритм Дейкстры со счётчиками операций stats. Рёбра перебираются через graph.neighbors в том же порядке,
+что и в обычном поиске, поэтому результат совпадает, а обычный поиск счётчиков не ведёт и не замедляется
+'''
+def _find_optimal_path_counted(graph: Graph, start: int, end: int, criterion: int, stats: SearchStats):
+    dist = {start: 0}
+    prev = {}
+
+    total_length = None
+    total_time = None
+    total_cost = None
+
+    pq = [(0, start, 0, 0, 0)]
+    stats.heap_pushes += 1
+
+    while pq:
+        cur_weight, u, cur_length, cur_time, cur_cost = heapq.heappop(pq)
+        stats.heap_pops += 1
+
+        if cur_weight > dist[u]:
+            stats.stale_pops += 1
+            continue
+        stats.settled += 1
+
+        if u == end:
+            total_length = cur_length
+            total_time = cur_time
+            total_cost = cur_cost
+            break
+
+        for v, length, time, cost in graph.neighbors(u):
+            stats.relaxations += 1
+            new_weight = cur_weight + (length, time, cost)[criterion]
+
+            if new_weight < dist.get(v, INF):
+                dist[v] = new_weight
+                prev[v] = u
+                heapq.heappush(pq, (new_weight, v, cur_length + length, cur_time + time, cur_cost + cost))
+                stats.heap_pushes += 1
+
+    return prev, total_length, total_time, total_cost
+
+'''
+Алгоритм Дейкстры по массивам CSRGraph: вершины нумеруются внутренними номерами,
+а словарь prev возвращается с идентификаторами городов, как и для Graph
+'''
+def _find_optimal_path_csr(graph: CSRGraph, start: int, end: int, criterion: int):
+    ids = graph.ids
+    offsets = graph.offsets
+    targets = graph.targets
+    lengths, times, costs = graph.lengths, graph.times, graph.costs
+    weights = (lengths, times, costs)[criterion]
+
+    source = graph.index[start]
+    target = graph.index[end]
+    dist = [INF] * len(ids)
+    dist[source] = 0
+    prev_index = {}
+
+    total_length = None
+    total_time = None
+    total_cost = None
+
+    pq = [(0, source, 0, 0, 0)]
+
+    while pq:
+        cur_weight, u, cur_length, cur_time, cur_cost = heapq.heappop(pq)
+
+        if cur_weight > dist[u]:
+            continue
+
+        if u == target:
+            total_length = cur_length
+            total_time = cur_time
+            total_cost = cur_cost
+            break
+
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            new_weight = cur_weight + weights[k]
+
+            if new_weight < dist[v]:
+                dist[v] = new_weight
+                prev_index[v] = u
+                heapq.heappush(
+                    pq,
+                    (new_weight, v, cur_length + lengths[k], cur_time + times[k], cur_cost + costs[k])
+                )
+
+    prev = {ids[v]: ids[u] for v, u in prev_index.items()}
+    return prev, total_length, total_time, total_cost
+
+'''
+Функция restore_path восстанавливает путь по предыдущим значения из алгоритма по поиску оптимизированного пути
+'''
+def restore_path(prev: dict[int, int], start: int, end: int) -> list[int]:
+    path = []
+    cur = end #Восстановление пути от конечной точки
+    visited = set() #Посещенные вершины
+
+    if cur not in prev:
+        raise RuntimeError("Путь не существует")
+
+    while cur != start:
+        if cur in visited:
+            raise RuntimeError("Цикл в prev — путь некорректен")
+
+        visited.add(cur)
+        path.append(cur)
+        cur = prev[cur] #Для текущей вершины берем значение предыдущей
+
+    path.append(start)
+    path.reverse() #Так как восстановление идет от конечной точки, то необходимо перевернуть путь
+    return path
+'''
+Функция для определения положения итогового параметра в зависимости от его порядка из запроса
+'''
+def compromise_key(result, priorities):
+    values = {"Д": result[0], "В": result[1], "С": result[2]}
+    return tuple(values[p] for p in priorities)
+
+'''
+Функция solve_route находит оптимальный путь по одному критерию и возвращает
+суммарные длину, время, стоимость и список вершин пути
+'''
+def solve_route(graph: Graph, start_id: int, end_id: int, crit: str, engine: str = "dijkstra",
+                landmarks: Landmarks | None = None, stats: SearchStats | None = None):
+    prev, total_length, total_time, total_cost = find_optimal_path(
+        graph, start_id, end_id, CRITERION_NAMES[crit], engine, landmarks, stats
+    )
+    path = restore_path(prev, start_id, end_id)
+    return total_length, total_time, total_cost, path
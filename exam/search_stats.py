@@ -0,0 +1,101 @@
+import csv
+import json
+import os
+from dataclasses import asdict, dataclass
+from time import perf_counter
+
+#Форматы файла статистики
+STATS_FORMATS = ("json", "csv")
+#Счётчики поиска в порядке столбцов CSV
+COUNTERS = ("heap_pushes", "heap_pops", "stale_pops", "relaxations", "settled")
+
+'''
+Счётчики одного поиска алгоритмом Дейкстры, в которых отражены:
+    heap_pushes, heap_pops - добавления в очередь и извлечения из неё
+    stale_pops - извлечённые устаревшие записи, отброшенные проверкой cur_weight > dist[u]
+    relaxations - просмотренные рёбра
+    settled - вершины, расстояние до которых найдено окончательно
+'''
+@dataclass
+class SearchStats:
+    heap_pushes: int = 0
+    heap_pops: int = 0
+    stale_pops: int = 0
+    relaxations: int = 0
+    settled: int = 0
+
+'''
+Пустая запись статистики запроса: время ответа целиком и по каждому критерию
+'''
+def new_record(request) -> dict:
+    start_name, end_name, priorities = request
+    return {"request": f"{start_name} -> {end_name}", "priorities": ",".join(priorities), "time": 0.0, "criteria": {}}
+
+'''
+Функция timed_solver оборачивает solve и сохраняет в record["criteria"] время поиска по каждому критерию.
+Если передан список current, перед поиском в current[0] кладутся новые счётчики SearchStats, которые solve
+передаёт в find_optimal_path, и после поиска они тоже попадают в запись
+'''
+def timed_solver(solve, record: dict, current: list | None = None):
+    def timed_solve(start_id, end_id, crit):
+        if current is not None:
+            current[0] = SearchStats()
+        started = perf_counter()
+        try:
+            return solve(start_id, end_id, crit)
+        finally:
+            entry = {"time": perf_counter() - started}
+            if current is not None:
+                entry.update(asdict(current[0]))
+                current[0] = None
+            record["criteria"][crit] = entry
+
+    return timed_solve
+
+'''
+Функция slowest возвращает top самых медленных запросов
+'''
+def slowest(records: list[dict], top: int = 5) -> list[dict]:
+    return sorted(records, key=lambda record: record["time"], reverse=True)[:top]
+
+'''
+Функция write_stats сохраняет статистику запросов рядом с выходным файлом (output.stats.json или output.stats.csv)
+и возвращает имя созданного файла. В JSON дополнительно записываются top самых медленных запросов
+'''
+def write_stats(records: list[dict], output_file: str, fmt: str = "json", top: int = 5) -> str:
+    if fmt not in STATS_FORMATS:
+        raise ValueError("Некорректный формат файла статистики")
+
+    filename = f"{os.path.splitext(output_file)[0]}.stats.{fmt}"
+    if fmt == "json":
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump({"requests": records, "slowest": slowest(records, top)}, f, ensure_ascii=False, indent=1)
+        return filename
+
+    columns = ["request", "priorities", "time"]
+    for crit in ("Д", "В", "С"):
+        columns += [f"{crit}_time"] + [f"{crit}_{name}" for name in COUNTERS]
+
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for record in records:
+            row = {"request": record["request"], "priorities": record["priorities"], "time": record["time"]}
+            for crit, entry in record["criteria"].items():
+                row.update({f"{crit}_{name}": value for name, value in entry.items()})
+            writer.writerow(row)
+    return filename
+
+'''
+Текстовая сводка по самым медленным запросам для вывода в консоль
+'''
+def format_slowest(records: list[dict], top: int = 5) -> str:
+    lines = ["Самые медленные запросы:"]
+    for record in slowest(records, top):
+        parts = []
+        for crit, entry in record["criteria"].items():
+            settled = f", вершин {entry['settled']}" if "settled" in entry else ""
+            parts.append(f"{crit} {1000 * entry['time']:.2f} мс{settled}")
+        details = f" ({'; '.join(parts)})" if parts else ""
+        lines.append(f"  {1000 * record['time']:.2f} мс  {record['request']} | ({record['priorities']}){details}")
+    return "\n".join(lines)
@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, field_validator
+
+from components import Components
+from graph import read_input
+from landmarks import build_landmarks
+from search import ENGINES, compromise_key, solve_route
+
+#Критерии в порядке вывода маршрутов
+CRITERIA = ("Д", "В", "С")
+
+class RouteRequest(BaseModel):
+    start: str
+    end: str
+    priorities: list[str] = list(CRITERIA)
+
+    @field_validator("priorities")
+    @classmethod
+    def check_priorities(cls, priorities: list[str]) -> list[str]:
+        if sorted(priorities) != sorted(CRITERIA):
+            raise ValueError("Приоритеты должны содержать каждый из критериев Д, В, С ровно один раз")
+        return priorities
+
+class BatchRequest(BaseModel):
+    requests: list[RouteRequest]
+
+class Route(BaseModel):
+    length: int
+    time: int
+    cost: int
+    path: list[str]
+
+class RouteResponse(BaseModel):
+    start: str
+    end: str
+    priorities: list[str]
+    routes: dict[str, Route] | None = None
+    compromise: str | None = None
+    error: str | None = None
+
+'''
+Граф и параметры поиска для процессов-обработчиков: (граф, компоненты связности, алгоритм, ориентиры).
+Процессы создаются через fork после загрузки графа и получают его копией памяти, как в iter_parallel
+'''
+_worker_state = None
+
+'''
+Поиск одного маршрута в процессе-обработчике, возвращает результат solve_route.
+Для городов разных компонент RuntimeError выбрасывается без поиска
+'''
+def _solve(start_id: int, end_id: int, crit: str):
+    graph, components, engine, landmarks = _worker_state
+    if not components.connected(start_id, end_id):
+        raise RuntimeError("Путь не существует")
+    return solve_route(graph, start_id, end_id, crit, engine, landmarks)
+
+'''
+Объединение одновременных одинаковых поисков: пока поиск по ключу выполняется, остальные запросы с тем же ключом
+ждут его результат, а не запускают свой. После завершения поиска ключ удаляется, результаты не кэшируются.
+Ожидание защищено asyncio.shield, поэтому отмена одного из запросов не отменяет общий поиск
+'''
+class Coalescer:
+    def __init__(self):
+        self.pending = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key, start):
+        future = self.pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(start())
+            self.pending[key] = future
+            future.add_done_callback(lambda _: self.pending.pop(key, None))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+'''
+Служба поиска маршрутов, в которой отражены:
+    cities, city_name_to_id - города из входного файла
+    executor - пул процессов (или потоков там, где нет fork), в котором выполняются поиски
+    coalescer - объединение одинаковых поисков
+Граф загружается один раз при создании службы, поэтому запросы не платят за чтение файла и построение графа
+'''
+class RoutingService:
+    def __init__(self, input_file: str, compact: bool = False, snapshot: str | None = None,
+                 engine: str = "dijkstra", workers: int = 1):
+        global _worker_state
+
+        if engine not in ENGINES:
+            raise ValueError("Некорректный алгоритм поиска")
+        if workers < 1:
+            raise ValueError("Некорректное число процессов")
+
+        if snapshot is not None:
+            from snapshot import load_snapshot
+            self.cities, self.city_name_to_id, graph = load_snapshot(snapshot)
+        else:
+            self.cities, self.city_name_to_id, graph, _ = read_input(input_file, compact, stream=True)
+
+        landmarks = build_landmarks(graph) if engine == "alt" else None
+        if engine == "bucket":
+            for criterion in range(3):
+                graph.weight_range(criterion)
+        _worker_state = (graph, Components.from_graph(graph), engine, landmarks)
+
+        if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+        else:
+            #Поиск в отдельном потоке не даёт заблокировать цикл событий
+            self.executor = ThreadPoolExecutor(workers)
+        self.coalescer = Coalescer()
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+    '''
+    Маршрут между городами start_id и end_id по критерию crit в пуле, одинаковые одновременные поиски объединяются
+    '''
+    async def solve(self, start_id: int, end_id: int, crit: str):
+        loop = asyncio.get_running_loop()
+
+        def start():
+            return loop.run_in_executor(self.executor, _solve, start_id, end_id, crit)
+
+        return await self.coalescer.run((start_id, end_id, crit), start)
+
+    '''
+    Ответ на запрос: маршруты по всем критериям и компромиссный маршрут по приоритетам, как в build_route_block.
+    Поиски по трём критериям выполняются одновременно. KeyError - неизвестный город
+    '''
+    async def route(self, request: RouteRequest) -> RouteResponse:
+        start_id = self.city_name_to_id[request.start]
+        end_id = self.city_name_to_id[request.end]
+        response = RouteResponse(start=request.start, end=request.end, priorities=request.priorities)
+
+        if start_id == end_id:
+            response.error = "Вы уже находитесь в конечной точке"
+            return response
+
+        try:
+            results = await asyncio.gather(*(self.solve(start_id, end_id, crit) for crit in CRITERIA))
+        except RuntimeError as e:
+            response.error = f"Ошибка восстановления пути: {e}"
+            return response
+
+        results = dict(zip(CRITERIA, results))
+        response.routes = {
+            crit: Route(length=d, time=t, cost=c, path=[self.cities[v] for v in path])
+            for crit, (d, t, c, path) in results.items()
+        }
+        response.compromise = min(CRITERIA, key=lambda crit: compromise_key(results[crit], request.priorities))
+        return response
+
+    '''
+    Число поисков, выполненных и объединённых с уже запущенными
+    '''
+    def stats(self) -> dict:
+        return {
+            "cities": len(self.cities),
+            "searches": self.coalescer.started,
+            "coalesced": self.coalescer.coalesced,
+            "in_progress": len(self.coalescer.pending),
+        }
+
+'''
+Создание приложения FastAPI. Граф загружается при запуске приложения, пул процессов закрывается при остановке
+'''
+def create_app(input_file: str = "input.txt", compact: bool = False, snapshot: str | None = None,
+               engine: str = "dijkstra", workers: int = 1) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.service = RoutingService(input_file, compact, snapshot, engine, workers)
+        try:
+            yield
+        finally:
+            app.state.service.close()
+
+    app = FastAPI(title="Route Search API", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health():
+        return app.state.service.stats()
+
+    @app.post("/route", response_model=RouteResponse)
+    async def route(request: RouteRequest):
+        try:
+            return await app.state.service.route(request)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=f"Город {e.args[0]} не найден")
+
+    @app.post("/routes", response_model=list[RouteResponse])
+    async def routes(batch: BatchRequest):
+        service = app.state.service
+
+        async def answer(request: RouteRequest) -> RouteResponse:
+            try:
+                return await service.route(request)
+            except KeyError as e:
+                return RouteResponse(start=request.start, end=request.end, priorities=request.priorities,
+                                     error=f"Город {e.args[0]} не найден")
+
+        return await asyncio.gather(*(answer(request) for request in batch.requests))
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP-служба поиска оптимальных маршрутов")
+    parser.add_argument("input_file", nargs="?", default="input.txt")
+    parser.add_argument("--compact", action="store_true", help="хранить граф в формате CSR")
+    parser.add_argument("--snapshot", metavar="SNAPSHOT_FILE", default=None, help="загрузить граф из двоичного снимка")
+    parser.add_argument("--engine", choices=ENGINES, default="dijkstra", help="алгоритм поиска пути")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="число процессов для поиска")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.input_file, args.compact, args.snapshot, args.engine, args.workers),
+                host=args.host, port=args.port)
@@ -0,0 +1,186 @@
+import heapq
+
+from graph import INF
+
+'''
+Упрощённый граф для поиска кратчайших путей, в котором отражены:
+    graph - исходный граф (Graph или CSRGraph)
+    adj - оставшиеся дороги между сохранёнными городами: {город: [(куда, длина, время, стоимость), ...]}
+    chains - сжатые цепочки городов степени 2, начинающиеся в городе: {город: [(конец, inner, sums, last), ...]},
+             где inner - города цепочки по порядку от начала, sums - суммарные (длина, время, стоимость),
+             last - значения последней дороги цепочки, ведущей в конец
+    removed - число удалённых дорог: доминируемых параллельных дорог и петель
+    contracted - число городов внутри сжатых цепочек
+Упрощение выполняется один раз после загрузки графа:
+1. Из параллельных дорог между парой городов удаляются доминируемые - не лучше другой дороги ни по длине,
+   ни по времени, ни по стоимости. Дорога удаляется, только если алгоритм Дейкстры никогда её не выберет:
+   доминирующая дорога должна стоять раньше или быть строго лучше по всем трём значениям. Петли тоже удаляются
+2. Города, у которых осталось ровно две дороги к двум разным соседям, сжимаются в цепочки: путь u - a1 - ... - ak - w
+   заменяется одной дорогой u - w, которая помнит города a1..ak
+Поиск по упрощённому графу даёт те же маршруты, что и find_optimal_path по исходному, включая выбор
+среди равных по весу путей (см. find_optimal_path)
+'''
+class SimplifiedGraph:
+    def __init__(self, graph, adj: dict, chains: dict, removed: int = 0, contracted: int = 0):
+        self.graph = graph
+        self.adj = adj
+        self.chains = chains
+        self.removed = removed
+        self.contracted = contracted
+
+    '''
+    Построение упрощённого графа. Города keep (например, начала и концы запросов) в цепочки не сжимаются.
+    Цепочки сжимаются только из дорог с положительными значениями: на дорогах нулевого веса
+    правило выбора среди равных путей не сохраняется
+    '''
+    @classmethod
+    def build(cls, graph, keep=()) -> "SimplifiedGraph":
+        adj = {}
+        removed = 0
+        for u in graph.vertices():
+            neighbors = list(graph.neighbors(u))
+            edges = [e for e in neighbors if e[0] != u]
+            adj[u] = _undominated(edges)
+            removed += len(neighbors) - len(edges)
+            removed += len(edges) - len(adj[u])
+        #Каждая дорога учтена с обоих концов, петля - дважды в списке одного города
+        removed //= 2
+
+        keep = set(keep)
+        inner = {
+            v for v, edges in adj.items()
+            if len(edges) == 2 and edges[0][0] != edges[1][0] and v not in keep
+            and min(edges[0][1:] + edges[1][1:]) > 0
+        }
+
+        chains = {}
+        walked = set()
+        for u, edges in adj.items():
+            if u in inner:
+                continue
+            for e in edges:
+                if e[0] not in inner:
+                    continue
+                chain = _walk(adj, inner, u, e)
+                walked.update(chain[1])
+                #Цепочка, вернувшаяся в свой начальный город, ничего не сокращает и отбрасывается
+                if chain[0] != u:
+                    chains.setdefault(u, []).append(chain)
+
+        #Цикл из одних городов степени 2 не имеет концов и остаётся как есть
+        inner &= walked
+        simplified = {
+            u: [e for e in edges if e[0] not in inner]
+            for u, edges in adj.items() if u not in inner
+        }
+        return cls(graph, simplified, chains, removed, len(inner))
+
+    def __contains__(self, v: int) -> bool:
+        return v in self.adj
+
+    '''
+    Алгоритм Дейкстры по упрощённому графу, возвращает то же, что и find_optimal_path: prev, длину, время
+    и стоимость. Предки городов сжатых цепочек тоже записываются в prev, поэтому restore_path восстанавливает
+    путь через все города. Сжатая цепочка u - ... - ak - w проходится не в момент извлечения u, а отдельной
+    записью очереди с ключом (расстояние до ak, ak) - ровно тогда, когда исходный поиск извлёк бы город ak,
+    поэтому среди равных путей выбирается тот же, что и в исходном графе.
+    Начало и конец должны быть сохранёнными городами, а не городами внутри цепочек
+    '''
+    def find_optimal_path(self, start: int, end: int, criterion: int):
+        if start not in self.graph or end not in self.graph:
+            raise ValueError("Начальная или конечная вершина отсутствует в графе")
+        if criterion not in (0, 1, 2):
+            raise ValueError("Некорректный критерий оптимизации")
+        if start not in self.adj or end not in self.adj:
+            raise ValueError("Начальная или конечная вершина находится внутри сжатой цепочки")
+
+        adj, chains = self.adj, self.chains
+        w = criterion + 1
+        dist = {start: 0}
+        totals = {start: (0, 0, 0)}
+        prev = {}
+        total_length = total_time = total_cost = None
+
+        #Записи городов - (расстояние, город), записи цепочек - (расстояние до ak, ak, начало, номер цепочки)
+        pq = [(0, start)]
+        while pq:
+            entry = heapq.heappop(pq)
+            if len(entry) == 4:
+                _, _, u, k = entry
+                v, inner, sums, _ = chains[u][k]
+                new_weight = dist[u] + sums[criterion]
+                if new_weight < dist.get(v, INF):
+                    dist[v] = new_weight
+                    prev[v] = inner[-1]
+                    for before, city in zip((u, *inner), inner):
+                        prev[city] = before
+                    length, time, cost = totals[u]
+                    totals[v] = (length + sums[0], time + sums[1], cost + sums[2])
+                    heapq.heappush(pq, (new_weight, v))
+                continue
+
+            cur_weight, u = entry
+            if cur_weight > dist[u]:
+                continue
+            if u == end:
+                total_length, total_time, total_cost = totals[u]
+                break
+
+            length, time, cost = totals[u]
+            for e in adj[u]:
+                new_weight = cur_weight + e[w]
+                if new_weight < dist.get(e[0], INF):
+                    dist[e[0]] = new_weight
+                    prev[e[0]] = u
+                    totals[e[0]] = (length + e[1], time + e[2], cost + e[3])
+                    heapq.heappush(pq, (new_weight, e[0]))
+
+            for k, (v, inner, sums, last) in enumerate(chains.get(u, ())):
+                #Расстояния только уменьшаются, поэтому цепочку, не улучшающую конец сейчас, можно не рассматривать
+                if cur_weight + sums[criterion] < dist.get(v, INF):
+                    heapq.heappush(pq, (cur_weight + sums[criterion] - last[criterion], inner[-1], u, k))
+
+        return prev, total_length, total_time, total_cost
+
+'''
+Дороги одного города без доминируемых параллельных дорог, порядок оставшихся сохраняется.
+Дорога i удаляется, если есть дорога j к тому же городу, не хуже по всем трём значениям и стоящая раньше
+или строго лучше по всем значениям: тогда по любому критерию алгоритм Дейкстры выберет не дорогу i.
+Порядок параллельных дорог в списках обоих городов одинаков, поэтому дорога удаляется с обоих концов
+'''
+def _undominated(edges: list) -> list:
+    parallel = {}
+    for e in edges:
+        parallel.setdefault(e[0], []).append(e)
+    if len(parallel) == len(edges):
+        return edges
+
+    dropped = set()
+    for group in parallel.values():
+        for i, e in enumerate(group):
+            for j, other in enumerate(group):
+                if i == j or any(a > b for a, b in zip(other[1:], e[1:])):
+                    continue
+                if j < i or all(a < b for a, b in zip(other[1:], e[1:])):
+                    dropped.add(id(e))
+                    break
+    return [e for e in edges if id(e) not in dropped]
+
+'''
+Проход по цепочке городов inner от города u по первой дороге e до ближайшего сохранённого города.
+Возвращает (конец, города цепочки, суммы значений, значения последней дороги)
+'''
+def _walk(adj: dict, inner: set, u: int, e: tuple) -> tuple:
+    cities = []
+    sums = [0, 0, 0]
+    before = u
+    while True:
+        for i in range(3):
+            sums[i] += e[i + 1]
+        v = e[0]
+        if v not in inner:
+            return v, cities, tuple(sums), tuple(e[1:])
+        cities.append(v)
+        first, second = adj[v]
+        e = second if first[0] == before else first
+        before = v
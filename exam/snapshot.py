@@ -0,0 +1,104 @@
+import argparse
+import mmap
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from graph import CSRGraph, read_input
+
+#Версия формата снимка, при изменении формата старые снимки перестают загружаться
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAGIC = b"RGSN"
+
+'''
+Заголовок снимка: сигнатура, версия, порядок байтов (1 - little-endian), число вершин, число рёбер CSR,
+число городов, размер таблицы названий в байтах и контрольная сумма CRC32 всех данных после заголовка.
+Размер заголовка кратен 8, поэтому все массивы в файле выровнены по 8 байт
+'''
+HEADER = struct.Struct("<4sIBxxxQQQQI4x")
+
+'''
+Функция save_snapshot записывает граф и таблицу городов в двоичный файл:
+заголовок, затем массивы CSRGraph (ids, offsets, targets, lengths, times, costs) в виде 64-битных целых,
+идентификаторы городов в порядке входного файла и названия городов в UTF-8 через перевод строки
+'''
+def save_snapshot(filename: str, cities: dict[int, str], graph: CSRGraph) -> None:
+    names = "\n".join(cities.values()).encode("utf-8")
+    columns = [graph.ids, graph.offsets, graph.targets, graph.lengths, graph.times, graph.costs,
+               memoryview(array("q", cities)), memoryview(names)]
+
+    checksum = 0
+    for column in columns:
+        checksum = zlib.crc32(column, checksum)
+
+    byteorder = 1 if sys.byteorder == "little" else 0
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, byteorder, len(graph.ids), len(graph.targets),
+                            len(cities), len(names), checksum))
+        for column in columns:
+            f.write(column)
+
+'''
+Функция load_snapshot отображает файл снимка в память (mmap) и возвращает cities, city_name_to_id и CSRGraph,
+массивы которого ссылаются прямо на страницы файла: копирования и разбора текста нет, а несколько процессов
+на одной машине используют одни и те же физические страницы. verify=False пропускает проверку контрольной суммы
+'''
+def load_snapshot(filename: str, verify: bool = True):
+    try:
+        with open(filename, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        raise RuntimeError(f"Файл {filename} не найден")
+    except ValueError:
+        raise RuntimeError("Файл снимка пуст")
+
+    if len(data) < HEADER.size:
+        raise RuntimeError("Ошибка формата файла снимка")
+    magic, version, byteorder, n, m, city_count, names_size, checksum = HEADER.unpack_from(data)
+
+    if magic != SNAPSHOT_MAGIC:
+        raise RuntimeError("Ошибка формата файла снимка")
+    if version != SNAPSHOT_VERSION:
+        raise RuntimeError("Неподдерживаемая версия файла снимка")
+    if byteorder != (1 if sys.byteorder == "little" else 0):
+        raise RuntimeError("Снимок сохранён на машине с другим порядком байтов")
+
+    sizes = [n, n + 1, m, m, m, m, city_count]
+    if len(data) != HEADER.size + 8 * sum(sizes) + names_size:
+        raise RuntimeError("Файл снимка повреждён")
+
+    view = memoryview(data)
+    if verify and zlib.crc32(view[HEADER.size:]) != checksum:
+        raise RuntimeError("Контрольная сумма файла снимка не совпадает")
+
+    columns = []
+    pos = HEADER.size
+    for size in sizes:
+        columns.append(view[pos:pos + 8 * size].cast("q"))
+        pos += 8 * size
+    *arrays, city_ids = columns
+
+    names = bytes(view[pos:]).decode("utf-8").split("\n") if city_count else []
+    cities = dict(zip(city_ids, names))
+    city_name_to_id = {name: city_id for city_id, name in cities.items()}
+
+    return cities, city_name_to_id, CSRGraph(*arrays)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Построение двоичного снимка графа")
+    parser.add_argument("input_file", nargs="?", default="input.txt")
+    parser.add_argument("snapshot_file", nargs="?", default="graph.snap")
+    args = parser.parse_args()
+
+    try:
+        started = time.perf_counter()
+        cities, city_name_to_id, graph, requests = read_input(args.input_file, compact=True, stream=True)
+        save_snapshot(args.snapshot_file, cities, graph)
+        print(f"Снимок {args.snapshot_file}: городов {len(cities)}, рёбер {len(graph.targets) // 2}, "
+              f"построен за {time.perf_counter() - started:.2f} с")
+
+    except Exception as e:
+        print(f"Ошибка: {e}\n")
@@ -0,0 +1,86 @@
+from array import array
+
+from components import Components
+from graph import Graph
+from search import restore_path
+from trees import find_shortest_path_tree
+
+#Значение в матрицах DistanceTable для пар городов, между которыми нет пути
+UNREACHABLE = -1
+
+'''
+Таблица кратчайших путей между начальными городами origins и конечными городами destinations по одному критерию,
+в которой отражены:
+    lengths, times, costs - матрицы len(origins) x len(destinations) по строкам в массивах array("q"),
+                            UNREACHABLE там, где пути нет
+    paths - список путей в том же порядке или None, если пути не запрашивались
+'''
+class DistanceTable:
+    def __init__(self, origins: list[int], destinations: list[int], lengths, times, costs, paths=None):
+        self.origins = origins
+        self.destinations = destinations
+        self.lengths = lengths
+        self.times = times
+        self.costs = costs
+        self.paths = paths
+
+    '''
+    Значения (длина, время, стоимость) для i-го начального и j-го конечного города или None, если пути нет
+    '''
+    def get(self, i: int, j: int):
+        k = i * len(self.destinations) + j
+        if self.lengths[k] == UNREACHABLE:
+            return None
+        return self.lengths[k], self.times[k], self.costs[k]
+
+    '''
+    Маршрут для i-го начального и j-го конечного города в формате solve_route: (длина, время, стоимость, путь),
+    путь равен None, если таблица построена без путей
+    '''
+    def route(self, i: int, j: int):
+        totals = self.get(i, j)
+        if totals is None:
+            raise RuntimeError("Путь не существует")
+        path = self.paths[i * len(self.destinations) + j] if self.paths is not None else None
+        return (*totals, path)
+
+'''
+Функция distance_table находит кратчайшие пути от каждого города origins до каждого города destinations
+по критерию criterion: из каждого начального города строится одно дерево кратчайших путей, поиск останавливается,
+как только найдены все конечные города. Если переданы компоненты связности components, конечные города из других
+компонент сразу отмечаются недостижимыми и не заставляют обходить всю компоненту начального города.
+При paths=True в таблице сохраняются и сами пути
+'''
+def distance_table(graph: Graph, origins, destinations, criterion: int, paths: bool = False,
+                   components: Components | None = None) -> DistanceTable:
+    origins = list(origins)
+    destinations = list(destinations)
+    if criterion not in (0, 1, 2):
+        raise ValueError("Некорректный критерий оптимизации")
+    for v in origins + destinations:
+        if v not in graph:
+            raise ValueError(f"Вершина {v} отсутствует в графе")
+
+    size = len(origins) * len(destinations)
+    lengths = array("q", [UNREACHABLE]) * size
+    times = array("q", [UNREACHABLE]) * size
+    costs = array("q", [UNREACHABLE]) * size
+    routes = [None] * size if paths else None
+
+    for i, origin in enumerate(origins):
+        if components is None:
+            targets = set(destinations)
+        else:
+            targets = {v for v in destinations if components.connected(origin, v)}
+        if not targets:
+            continue
+
+        prev, dist, totals = find_shortest_path_tree(graph, origin, criterion, targets)
+        row = i * len(destinations)
+        for j, v in enumerate(destinations):
+            if v in totals:
+                lengths[row + j], times[row + j], costs[row + j] = totals[v]
+                if paths:
+                    routes[row + j] = restore_path(prev, origin, v) if v != origin else [origin]
+
+    return DistanceTable(origins, destinations, lengths, times, costs, routes)
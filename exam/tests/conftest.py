@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+EXAM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, EXAM_DIR)
+
+from benchmarks.generator import write_input
+
+#Запросы, которых нет среди случайных: город другой компоненты, совпадающие города, таблица и достижимость
+EXTRA_INPUT = """
+[CITIES]
+9001: Остров
+[REQUESTS]
+Город 1 -> Остров | (Д,В,С)
+Город 5 -> Город 5 | (В,С,Д)
+Город 1,Город 20 -> Город 150,Город 199,Остров | (В,Д,С)
+Город 10 -> * | В<=40
+Город 10,Город 190 -> * | С<=60
+"""
+
+'''
+Входной файл со сгенерированной сетью из 200 городов и случайными запросами для сетки и геометрического графа.
+Времена в пути на сетке - небольшие целые числа, поэтому в ней много равных по весу путей
+'''
+@pytest.fixture(scope="session", params=["grid", "geometric"])
+def network_file(request, tmp_path_factory):
+    filename = str(tmp_path_factory.mktemp(request.param) / "input.txt")
+    write_input(filename, request.param, 200, 120, seed=7)
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write(EXTRA_INPUT)
+    return filename
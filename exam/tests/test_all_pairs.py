@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from all_pairs import AllPairs
+from graph import Graph
+from search import solve_route
+from test_engines import random_graph
+
+'''
+Маршрут в формате solve_route или None, если пути нет
+'''
+def solve(solver, start: int, end: int, crit: str):
+    try:
+        return solver(start, end, crit)
+    except RuntimeError:
+        return None
+
+'''
+Дороги нулевого веса: вершины 3, 2 и 1 находятся на одном расстоянии от 4
+'''
+def test_zero_weight_chain():
+    graph = Graph()
+    for v in (1, 2, 3, 4):
+        graph.add_vertex(v)
+    graph.add_edge(4, 3, 1, 1, 1)
+    graph.add_edge(3, 2, 0, 0, 0)
+    graph.add_edge(2, 1, 0, 0, 0)
+    for method in ("floyd", "dijkstra"):
+        assert AllPairs.build(graph, method=method).route(4, 1, "Д") == (1, 1, 1, [4, 3, 2, 1])
+
+'''
+Маршруты из таблиц обоих способов построения совпадают с solve_route, в том числе при дорогах нулевого веса
+'''
+@pytest.mark.parametrize("method", ["floyd", "dijkstra"])
+@pytest.mark.parametrize("low", [0, 1])
+def test_all_pairs_match_solve_route(method, low):
+    rnd = random.Random(low)
+    for _ in range(20):
+        graph = random_graph(rnd, 25, 50, low)
+        table = AllPairs.build(graph, method=method)
+        for start in range(1, 26):
+            for end in range(1, 26):
+                if start == end:
+                    continue
+                crit = rnd.choice("ДВС")
+                expected = solve(lambda *args: solve_route(graph, *args), start, end, crit)
+                assert solve(table.route, start, end, crit) == expected
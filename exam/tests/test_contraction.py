@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from contraction import ContractionHierarchy, build_index, load_index, save_index
+from graph import graph_fingerprint
+from search import find_optimal_path, restore_path
+from test_engines import random_graph
+
+'''
+Путь из запроса к иерархии: начинается в start, заканчивается в end, соседние города соединены дорогами,
+и по этим дорогам набираются суммы totals
+'''
+def check_query_path(graph, start: int, end: int, prev: dict, totals) -> None:
+    path = restore_path(prev, start, end) if start != end else [start]
+    assert path[0] == start and path[-1] == end
+    sums = {(0, 0, 0)}
+    for u, v in zip(path, path[1:]):
+        options = [values for w, *values in graph.neighbors(u) if w == v]
+        assert options, f"нет дороги {u} - {v}"
+        sums = {tuple(s + x for s, x in zip(total, option)) for total in sums for option in options}
+    assert tuple(totals) in sums
+
+'''
+Значение критерия совпадает с алгоритмом Дейкстры, а путь - цепочка настоящих дорог с теми же суммами,
+в том числе при малом ограничении поиска-свидетеля и дорогах нулевого веса
+'''
+@pytest.mark.parametrize("witness_limit", [1, 64])
+@pytest.mark.parametrize("low", [0, 1])
+def test_query_matches_dijkstra(witness_limit, low):
+    rnd = random.Random(witness_limit + low)
+    for _ in range(20):
+        graph = random_graph(rnd, 40, 90, low)
+        for criterion in (0, 1, 2):
+            ch = ContractionHierarchy.build(graph, criterion, witness_limit)
+            for _ in range(15):
+                start, end = rnd.randint(1, 40), rnd.randint(1, 40)
+                expected = find_optimal_path(graph, start, end, criterion)
+                prev, *totals = ch.query(start, end)
+                if expected[1] is None:
+                    assert totals == [None, None, None]
+                    continue
+                assert totals[criterion] == expected[1 + criterion]
+                check_query_path(graph, start, end, prev, totals)
+
+'''
+Каждое ребро иерархии разворачивается в цепочку настоящих дорог графа с теми же суммами метрик
+'''
+@pytest.mark.parametrize("low", [0, 1])
+def test_unpack_gives_road_chain(low):
+    rnd = random.Random(10 + low)
+    for _ in range(10):
+        graph = random_graph(rnd, 40, 90, low)
+        for criterion in (0, 1, 2):
+            ch = ContractionHierarchy.build(graph, criterion)
+            for v, edges in ch.up.items():
+                for w, edge in edges.items():
+                    steps = ch._unpack(v, w, edge)
+                    assert steps[-1][0] == w
+                    sums = [0, 0, 0, 0]
+                    u = v
+                    for x, road in steps:
+                        assert road[4] is None
+                        assert tuple(road[1:4]) in [tuple(values) for y, *values in graph.neighbors(u) if y == x]
+                        sums = [total + value for total, value in zip(sums, road)]
+                        u = x
+                    assert sums == list(edge[:4])
+
+'''
+Индекс, сохранённый в файл и загруженный для того же графа, отвечает так же, как построенный
+'''
+def test_index_round_trip(tmp_path):
+    rnd = random.Random(1)
+    graph = random_graph(rnd, 40, 90, 1)
+    index = build_index(graph)
+    filename = str(tmp_path / "ch_index.json")
+    save_index(index, filename, graph_fingerprint(graph))
+
+    loaded = load_index(filename, graph)
+    assert set(loaded) == set(index)
+    for crit, ch in index.items():
+        assert loaded[crit].criterion == ch.criterion
+        for _ in range(30):
+            start, end = rnd.randint(1, 40), rnd.randint(1, 40)
+            assert loaded[crit].query(start, end) == ch.query(start, end)
+
+'''
+Индекс другого графа, повреждённый файл и отсутствующий файл не загружаются
+'''
+def test_load_index_rejects_other_graph(tmp_path):
+    rnd = random.Random(2)
+    graph = random_graph(rnd, 30, 60, 1)
+    filename = str(tmp_path / "ch_index.json")
+    save_index(build_index(graph), filename, graph_fingerprint(graph))
+
+    other = random_graph(rnd, 30, 60, 1)
+    with pytest.raises(RuntimeError, match="другого графа"):
+        load_index(filename, other)
+
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("{")
+    with pytest.raises(RuntimeError):
+        load_index(filename, graph)
+    with pytest.raises(RuntimeError):
+        load_index(str(tmp_path / "missing.json"), graph)
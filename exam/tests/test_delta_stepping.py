@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from delta_stepping import delta_stepping, delta_stepping_routes
+from graph import CSRGraph
+from search import restore_path
+from test_engines import random_graph
+from trees import find_shortest_path_tree
+
+'''
+Дерево и маршруты delta-stepping при любой ширине корзины совпадают с деревом алгоритма Дейкстры,
+включая выбор среди равных путей и параллельных дорог
+'''
+@pytest.mark.parametrize("delta", [None, 1, 2, 7])
+def test_delta_stepping_matches_dijkstra(delta):
+    rnd = random.Random(delta or 0)
+    for _ in range(30):
+        graph = CSRGraph.from_graph(random_graph(rnd, 40, 90, 1))
+        ids = list(graph.ids)
+        for _ in range(5):
+            start, criterion = rnd.randint(1, 40), rnd.randint(0, 2)
+            prev, dist, totals = find_shortest_path_tree(graph, start, criterion)
+
+            tree_dist, tree_prev = delta_stepping(graph, start, criterion, delta)
+            assert {ids[i]: int(d) for i, d in enumerate(tree_dist) if d >= 0} == dist
+            assert {ids[i]: ids[p] for i, p in enumerate(tree_prev) if p >= 0} == prev
+
+            routes = delta_stepping_routes(graph, start, criterion, ids, delta)
+            for v in ids:
+                expected = (*totals[v], restore_path(prev, start, v) if v != start else [start]) if v in dist else None
+                assert routes[v] == expected
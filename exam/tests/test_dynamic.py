@@ -0,0 +1,39 @@
+import random
+
+from dynamic import DynamicRouter
+from test_engines import random_graph
+from trees import find_shortest_path_tree
+
+'''
+Случайная существующая дорога графа (u, v) или None, если дорог нет
+'''
+def random_road(rnd: random.Random, graph):
+    roads = [(u, e.to) for u, edges in graph.adj.items() for e in edges]
+    return rnd.choice(roads) if roads else None
+
+'''
+После каждого изменения дорог исправленные деревья совпадают с деревьями, построенными заново,
+в том числе на графах с равными по весу путями, параллельными дорогами и петлями
+'''
+def test_repair_matches_rebuild():
+    rnd = random.Random(5)
+    for _ in range(20):
+        graph = random_graph(rnd, 30, 60, 1)
+        router = DynamicRouter(graph)
+        for start in rnd.sample(range(1, 31), 4):
+            for criterion in (0, 1, 2):
+                router.tree(start, criterion)
+
+        for _ in range(40):
+            action = rnd.randint(0, 2)
+            road = random_road(rnd, graph)
+            if action == 0 and road is not None:
+                values = [rnd.choice([None, rnd.randint(1, 3)]) for _ in range(3)]
+                router.update_road(*road, *values)
+            elif action == 1 and road is not None:
+                router.close_road(*road)
+            else:
+                router.add_road(rnd.randint(1, 30), rnd.randint(1, 30), *(rnd.randint(1, 3) for _ in range(3)))
+
+            for (start, criterion), tree in router.trees.items():
+                assert (tree.prev, tree.dist, tree.totals) == find_shortest_path_tree(graph, start, criterion)
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from graph import CSRGraph, Graph
+from landmarks import build_landmarks
+from search import ENGINES, find_optimal_path, restore_path
+
+'''
+Случайный граф с малыми весами, в котором много равных по весу путей, параллельных дорог и дорог нулевого веса
+'''
+def random_graph(rnd: random.Random, cities: int, roads: int, low: int) -> Graph:
+    graph = Graph()
+    for v in range(1, cities + 1):
+        graph.add_vertex(v)
+    for _ in range(roads):
+        u, v = rnd.randint(1, cities), rnd.randint(1, cities)
+        graph.add_edge(u, v, rnd.randint(low, 3), rnd.randint(low, 3), rnd.randint(low, 3))
+    return graph
+
+'''
+Маршрут (путь, длина, время, стоимость) или None, если пути нет
+'''
+def route(graph, start: int, end: int, criterion: int, engine: str, landmarks):
+    prev, *totals = find_optimal_path(graph, start, end, criterion, engine, landmarks)
+    if totals[0] is None:
+        return None
+    return restore_path(prev, start, end) if start != end else [start], *totals
+
+'''
+Все алгоритмы выбирают среди равных путей тот же маршрут, что и алгоритм Дейкстры
+'''
+@pytest.mark.parametrize("low", [0, 1])
+@pytest.mark.parametrize("compact", [False, True])
+def test_engines_match_dijkstra(low, compact):
+    rnd = random.Random(low * 10 + compact)
+    for _ in range(30):
+        graph = random_graph(rnd, 40, 90, low)
+        if compact:
+            graph = CSRGraph.from_graph(graph)
+        landmarks = build_landmarks(graph, 4)
+        for _ in range(20):
+            start, end = rnd.randint(1, 40), rnd.randint(1, 40)
+            criterion = rnd.randint(0, 2)
+            expected = route(graph, start, end, criterion, "dijkstra", None)
+            for engine in ENGINES:
+                assert route(graph, start, end, criterion, engine, landmarks) == expected, engine
@@ -0,0 +1,79 @@
+import filecmp
+import random
+
+import pytest
+
+import Main
+from benchmarks.generator import write_input
+
+#Режимы Main.main, которые не должны менять output.txt
+MODES = [
+    {"compact": True},
+    {"stream": True},
+    {"stream": True, "compact": True},
+    {"workers": 2, "chunk_size": 16},
+    {"batch": True},
+    {"batch": True, "compact": True},
+    {"engine": "bucket"},
+    {"engine": "bidirectional"},
+    {"engine": "alt", "landmark_count": 4},
+    {"engine": "alt", "compact": True},
+    {"simplify": True},
+    {"cache_size": 8},
+    {"all_pairs": True},
+    {"components": False},
+]
+
+'''
+Ответы на запросы в обычном режиме, с которыми сравниваются остальные режимы
+'''
+@pytest.fixture(scope="session")
+def expected_output(network_file, tmp_path_factory):
+    filename = str(tmp_path_factory.mktemp("expected") / "output.txt")
+    Main.main(network_file, filename)
+    return filename
+
+'''
+Каждый режим записывает в output.txt те же ответы, что и обычный запуск
+'''
+@pytest.mark.parametrize("mode", MODES, ids=lambda mode: ",".join(f"{k}={v}" for k, v in mode.items()))
+def test_mode_matches_default(network_file, expected_output, tmp_path, mode):
+    output = str(tmp_path / "output.txt")
+    Main.main(network_file, output, **mode)
+    assert filecmp.cmp(output, expected_output, shallow=False)
+
+'''
+Пакетный режим на графе от DELTA_STEPPING_MIN_VERTICES городов строит деревья delta-stepping
+и отвечает так же, как обычный поиск
+'''
+@pytest.mark.parametrize("topology", ["grid", "geometric"])
+def test_batch_delta_stepping_matches_default(tmp_path, topology):
+    pytest.importorskip("numpy")
+    input_file = str(tmp_path / "input.txt")
+    write_input(input_file, topology, Main.DELTA_STEPPING_MIN_VERTICES + 200, 60, seed=11)
+
+    expected = str(tmp_path / "expected.txt")
+    output = str(tmp_path / "output.txt")
+    Main.main(input_file, expected)
+    Main.main(input_file, output, batch=True, compact=True)
+    assert filecmp.cmp(output, expected, shallow=False)
+
+'''
+С кэшем ответы на запрос и следующий за ним обратный запрос те же, что и без кэша: на сетке с малыми весами
+много равных по времени путей, и развёрнутый маршрут A -> B часто отличается от найденного из B
+'''
+def test_cache_with_reverse_requests(tmp_path):
+    input_file = str(tmp_path / "input.txt")
+    write_input(input_file, "grid", 400, 0, seed=3)
+    rnd = random.Random(3)
+    with open(input_file, "a", encoding="utf-8") as f:
+        for _ in range(100):
+            start, end = rnd.randint(1, 400), rnd.randint(1, 400)
+            for a, b in ((start, end), (end, start)):
+                f.write(f"Город {a} -> Город {b} | (В,Д,С)\n")
+
+    expected = str(tmp_path / "expected.txt")
+    output = str(tmp_path / "output.txt")
+    Main.main(input_file, expected)
+    Main.main(input_file, output, cache_size=1000)
+    assert filecmp.cmp(output, expected, shallow=False)
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from pareto import find_pareto_front, solve_pareto
+from search import compromise_key
+from test_engines import random_graph
+
+'''
+Значения (длина, время, стоимость) всех простых путей из start в end полным перебором
+'''
+def all_path_values(graph, start: int, end: int) -> set:
+    values = set()
+
+    def visit(u, visited, length, time, cost):
+        if u == end:
+            values.add((length, time, cost))
+            return
+        for v, l, t, c in graph.neighbors(u):
+            if v not in visited:
+                visit(v, visited | {v}, length + l, time + t, cost + c)
+
+    visit(start, {start}, 0, 0, 0)
+    return values
+
+'''
+Недоминируемые значения из values по возрастанию
+'''
+def pareto_values(values: set) -> list:
+    return sorted(a for a in values if not any(b != a and all(x <= y for x, y in zip(b, a)) for b in values))
+
+'''
+Путь path простой и по дорогам между его соседними городами можно набрать суммы totals
+'''
+def is_valid_path(graph, path: list, totals) -> bool:
+    sums = {(0, 0, 0)}
+    for u, v in zip(path, path[1:]):
+        options = [values for w, *values in graph.neighbors(u) if w == v]
+        sums = {tuple(s + x for s, x in zip(total, option)) for total in sums for option in options}
+    return len(path) == len(set(path)) and tuple(totals) in sums
+
+'''
+Точный фронт совпадает с перебором, ограниченный состоит из недоминируемых путей,
+а solve_pareto выбирает из него лексикографически лучший в порядке приоритетов путь
+'''
+@pytest.mark.parametrize("max_labels", [None, 1, 2])
+def test_pareto_front_matches_brute_force(max_labels):
+    rnd = random.Random(max_labels or 0)
+    for _ in range(40):
+        graph = random_graph(rnd, 10, 22, 1)
+        start, end = rnd.sample(range(1, 11), 2)
+        priorities = rnd.choice(["ДВС", "ДСВ", "ВДС", "ВСД", "СДВ", "СВД"])
+        exact = pareto_values(all_path_values(graph, start, end))
+
+        front = find_pareto_front(graph, start, end, max_labels, priorities)
+        values = [result[:3] for result in front]
+        if max_labels is None:
+            assert values == exact
+        else:
+            assert set(values) <= set(exact)
+        assert all(is_valid_path(graph, result[3], result[:3]) for result in front)
+
+        for crit in priorities:
+            if not exact:
+                with pytest.raises(RuntimeError):
+                    solve_pareto(graph, start, end, crit, list(priorities), max_labels=max_labels)
+                continue
+            order = [crit] + [p for p in priorities if p != crit]
+            result = solve_pareto(graph, start, end, crit, list(priorities), max_labels=max_labels)
+            assert result[:3] == min(exact, key=lambda totals: compromise_key(totals, order))
+            assert is_valid_path(graph, result[3], result[:3])
@@ -0,0 +1,18 @@
+import random
+
+from reach import find_reachable, find_reachable_many
+from test_engines import random_graph
+
+'''
+Пакетный поиск возвращает для каждого начального города то же, что и отдельный find_reachable
+'''
+def test_reachable_many_matches_single():
+    rnd = random.Random(3)
+    for _ in range(30):
+        graph = random_graph(rnd, 40, 90, 0)
+        starts = [rnd.randint(1, 40) for _ in range(4)]
+        criterion, budget = rnd.randint(0, 2), rnd.randint(0, 6)
+        results = find_reachable_many(graph, starts, criterion, budget)
+        assert sorted(results) == sorted(set(starts))
+        for start in starts:
+            assert results[start] == find_reachable(graph, start, criterion, budget)
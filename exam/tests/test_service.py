@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from graph import read_input
+from search import compromise_key, solve_route
+from service import Coalescer, create_app
+
+'''
+Клиент службы по сгенерированной сети, граф загружается при входе в контекст
+'''
+@pytest.fixture
+def client(network_file):
+    with TestClient(create_app(network_file)) as client:
+        yield client
+
+'''
+Ожидаемый ответ службы: маршруты solve_route по всем критериям и компромисс по приоритетам
+'''
+def expected_response(network_file, start: str, end: str, priorities: list[str]) -> dict:
+    cities, city_name_to_id, graph, _ = read_input(network_file)
+    results = {crit: solve_route(graph, city_name_to_id[start], city_name_to_id[end], crit) for crit in "ДВС"}
+    return {
+        "start": start,
+        "end": end,
+        "priorities": priorities,
+        "routes": {crit: {"length": d, "time": t, "cost": c, "path": [cities[v] for v in path]}
+                   for crit, (d, t, c, path) in results.items()},
+        "compromise": min("ДВС", key=lambda crit: compromise_key(results[crit], priorities)),
+        "error": None,
+    }
+
+'''
+Маршрут по всем критериям совпадает с solve_route
+'''
+def test_route(client, network_file):
+    response = client.post("/route", json={"start": "Город 1", "end": "Город 150", "priorities": ["В", "Д", "С"]})
+    assert response.status_code == 200
+    assert response.json() == expected_response(network_file, "Город 1", "Город 150", ["В", "Д", "С"])
+
+'''
+Пакетный запрос отвечает на каждый запрос отдельно: маршрут, город другой компоненты и неизвестный город
+'''
+def test_batch_routes(client, network_file):
+    response = client.post("/routes", json={"requests": [
+        {"start": "Город 20", "end": "Город 199"},
+        {"start": "Город 1", "end": "Остров"},
+        {"start": "Город 1", "end": "Атлантида"},
+        {"start": "Город 5", "end": "Город 5"},
+    ]})
+    assert response.status_code == 200
+    routed, unreachable, unknown, same = response.json()
+    assert routed == expected_response(network_file, "Город 20", "Город 199", ["Д", "В", "С"])
+    assert unreachable["routes"] is None and "Путь не существует" in unreachable["error"]
+    assert unknown["routes"] is None and "Атлантида" in unknown["error"]
+    assert same["error"] == "Вы уже находитесь в конечной точке"
+
+'''
+Для города другой компоненты связности возвращается ошибка, а не маршрут
+'''
+def test_unreachable_route(client):
+    response = client.post("/route", json={"start": "Город 1", "end": "Остров"})
+    assert response.status_code == 200
+    assert response.json()["routes"] is None
+    assert "Путь не существует" in response.json()["error"]
+
+'''
+Неизвестный город и некорректные приоритеты - ошибки клиента
+'''
+def test_invalid_requests(client):
+    assert client.post("/route", json={"start": "Атлантида", "end": "Город 1"}).status_code == 404
+    invalid = {"start": "Город 1", "end": "Город 2", "priorities": ["Д", "Д", "С"]}
+    assert client.post("/route", json=invalid).status_code == 422
+
+'''
+Одновременные одинаковые запросы выполняют поиск один раз, а после его завершения ключ снова запускает поиск
+'''
+def test_coalescer_runs_identical_requests_once():
+    calls = []
+
+    async def scenario():
+        coalescer = Coalescer()
+        release = asyncio.Event()
+
+        async def search():
+            calls.append(1)
+            await release.wait()
+            return 42
+
+        tasks = [asyncio.ensure_future(coalescer.run("key", search)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        assert results == [42] * 5
+        assert (coalescer.started, coalescer.coalesced, coalescer.pending) == (1, 4, {})
+
+        assert await coalescer.run("key", search) == 42
+        assert coalescer.started == 2
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
@@ -0,0 +1,28 @@
+import filecmp
+import subprocess
+import sys
+
+from conftest import EXAM_DIR
+
+'''
+Запуск скрипта из каталога exam как из командной строки, возвращает вывод в консоль.
+Main.py сообщает об ошибке в консоль, а не кодом возврата, поэтому вывод проверяется отдельно
+'''
+def run_script(*args) -> str:
+    result = subprocess.run([sys.executable, *args], cwd=EXAM_DIR, capture_output=True, text=True, check=True)
+    assert "Ошибка" not in result.stdout
+    return result.stdout
+
+'''
+Ответы по графу из снимка совпадают с ответами по входному файлу, в том числе при потоковой обработке
+'''
+def test_snapshot_cli_matches_input_file(network_file, tmp_path):
+    snapshot = str(tmp_path / "graph.snap")
+    expected = str(tmp_path / "expected.txt")
+    run_script("snapshot.py", network_file, snapshot)
+    run_script("Main.py", network_file, expected)
+
+    for extra in ([], ["--stream"]):
+        output = str(tmp_path / "output.txt")
+        run_script("Main.py", network_file, output, "--snapshot", snapshot, *extra)
+        assert filecmp.cmp(output, expected, shallow=False)
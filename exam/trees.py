@@ -0,0 +1,64 @@
+import heapq
+
+from graph import INF, Graph
+
+'''
+Функция find_shortest_path_tree строит полное дерево кратчайших путей из точки start по критерию criterion.
+Возвращает:
+1. prev - предыдущие вершины для восстановления пути до любой достижимой вершины
+2. dist - значение оптимизируемой метрики для каждой достижимой вершины
+3. totals - суммарные длина, время и стоимость пути до каждой достижимой вершины
+Очередь хранит только пары (значение, вершина), а суммы метрик переносятся по дереву при релаксации.
+Порядок обхода совпадает с find_optimal_path, поэтому и восстановленные пути совпадают.
+Если задано множество targets, поиск останавливается, как только все вершины из него достигнуты окончательно
+'''
+def find_shortest_path_tree(graph: Graph, start: int, criterion: int, targets=None):
+
+    if start not in graph:
+        raise ValueError("Начальная вершина отсутствует в графе")
+
+    if criterion not in (0, 1, 2):
+        raise ValueError("Некорректный критерий оптимизации")
+
+    dist = {start: 0}
+    prev = {}
+    totals = {start: (0, 0, 0)}
+    remaining = set(targets) if targets is not None else None
+
+    pq = [(0, start)]
+
+    while pq:
+        cur_weight, u = heapq.heappop(pq)
+
+        if cur_weight > dist[u]:
+            continue
+
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+
+        cur_length, cur_time, cur_cost = totals[u]
+
+        if isinstance(graph, Graph):
+            #Для Graph рёбра читаются напрямую из объектов Edge без промежуточных кортежей
+            for e in graph.adj[u]:
+                new_weight = cur_weight + (e.length if criterion == 0 else e.time if criterion == 1 else e.cost)
+
+                if new_weight < dist.get(e.to, INF):
+                    dist[e.to] = new_weight
+                    prev[e.to] = u
+                    totals[e.to] = (cur_length + e.length, cur_time + e.time, cur_cost + e.cost)
+                    heapq.heappush(pq, (new_weight, e.to))
+            continue
+
+        for v, length, time, cost in graph.neighbors(u):
+            new_weight = cur_weight + (length, time, cost)[criterion]
+
+            if new_weight < dist.get(v, INF):
+                dist[v] = new_weight
+                prev[v] = u
+                totals[v] = (cur_length + length, cur_time + time, cur_cost + cost)
+                heapq.heappush(pq, (new_weight, v))
+
+    return prev, dist, totals
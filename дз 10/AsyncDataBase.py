@@ -0,0 +1,126 @@
+from typing import AsyncIterator, List, Tuple, Optional
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from contextlib import asynccontextmanager
+from models import Student, Base, create_indexes
+
+
+class AsyncDataBase:
+    """Асинхронный вариант DataBase на AsyncSession и aiosqlite: запросы к SQLite не блокируют цикл событий"""
+
+    def __init__(self, db_url: str = None):
+        if db_url is None:
+            db_url = 'sqlite+aiosqlite:///students.db'
+
+        self.engine = create_async_engine(db_url, echo=False)
+        # Объекты остаются доступными после commit: в асинхронном режиме ленивая загрузка атрибутов невозможна
+        self.SessionLocal = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    async def create_db_and_tables(self) -> None:
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+                await connection.run_sync(create_indexes)
+            print("База данных и таблицы успешно созданы!")
+        except Exception as e:
+            print(f"Ошибка при создании базы данных: {e}")
+
+    @asynccontextmanager
+    async def get_session(self):
+        session = self.SessionLocal()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def create_student(self, student: Student) -> Student:
+        async with self.get_session() as session:
+
+            new_student = Student(
+                first_name=student.first_name,
+                last_name=student.last_name,
+                faculty=student.faculty,
+                course=student.course,
+                grade=student.grade
+            )
+            session.add(new_student)
+            await session.commit()
+            return new_student
+
+    async def iter_students(self, after_id: int = 0, limit: Optional[int] = None, faculty: Optional[str] = None,
+                            course: Optional[str] = None, batch_size: int = 1000) -> AsyncIterator[Student]:
+        """Студенты с id больше after_id по возрастанию id, не больше limit, с необязательными фильтрами.
+
+        Постраничный вывод по ключу (keyset): следующая страница начинается после id последнего студента
+        предыдущей, поэтому запрос не пропускает строки через OFFSET. Строки читаются курсором порциями
+        по batch_size (yield_per), и в памяти никогда не бывает всей таблицы.
+        """
+        statement = select(Student).where(Student.id > after_id)
+        if faculty is not None:
+            statement = statement.where(Student.faculty == faculty)
+        if course is not None:
+            statement = statement.where(Student.course == course)
+        statement = statement.order_by(Student.id)
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        async with self.get_session() as session:
+            result = await session.stream_scalars(statement.execution_options(yield_per=batch_size))
+            async for student in result:
+                yield student
+                # Выданные объекты больше не нужны сессии
+                session.expunge(student)
+
+    async def get_by_faculty(self, faculty: str) -> List[Student]:
+        async with self.get_session() as session:
+            statement = select(Student).where(Student.faculty == faculty)
+            return (await session.scalars(statement)).all()
+
+    async def get_unic_course(self) -> List[str]:
+        async with self.get_session() as session:
+            statement = select(Student.course).distinct()
+            return (await session.scalars(statement)).all()
+
+    async def get_facult_grade_avg(self) -> List[Tuple[str, float]]:
+        async with self.get_session() as session:
+            statement = select(
+                Student.faculty,
+                func.avg(Student.grade).label('avg_grade')
+            ).group_by(Student.faculty)
+
+            result = (await session.execute(statement)).all()
+            return [(row.faculty, float(row.avg_grade)) for row in result]
+
+    async def get_student_by_id(self, student_id: int) -> Optional[Student]:
+        async with self.get_session() as session:
+            return await session.get(Student, student_id)
+
+    async def update_student(self, student_id: int, student_data: dict) -> Optional[Student]:
+        async with self.get_session() as session:
+            student = await session.get(Student, student_id)
+            if not student:
+                return None
+
+            for key, value in student_data.items():
+                if value is not None:
+                    setattr(student, key, value)
+
+            await session.flush()
+            await session.refresh(student)
+            return student
+
+    async def delete_student(self, student_id: int) -> bool:
+        async with self.get_session() as session:
+            student = await session.get(Student, student_id)
+            if not student:
+                return False
+
+            await session.delete(student)
+            return True
+
+    async def close_connection(self) -> None:
+        await self.engine.dispose()
@@ -1,8 +1,10 @@
-from typing import Optional, List
-from fastapi import FastAPI, HTTPException, Depends
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from models import Student
 from DataBase import DataBase
+import json
 import uvicorn
 
 class StudentCreate(BaseModel):
@@ -22,15 +24,21 @@ class StudentUpdate(BaseModel):
 def get_db():
     return database
 
+# Обработчики синхронные: FastAPI выполняет их в пуле потоков, поэтому запросы к SQLite не блокируют цикл событий.
+# AsyncDataBase на этой нагрузке медленнее (см. bench_async.py и README.md)
 app = FastAPI(title="Student Management API")
 database = DataBase()
 
 @app.on_event("startup")
-async def startup_event():
+def startup_event():
     database.create_db_and_tables()
 
+@app.on_event("shutdown")
+def shutdown_event():
+    database.close_connection()
+
 @app.post("/students/", response_model=StudentCreate)
-async def create_student(student: StudentCreate, db: DataBase = Depends(get_db)):
+def create_student(student: StudentCreate, db: DataBase = Depends(get_db)):
     db_student = Student(
         first_name=student.first_name,
         last_name=student.last_name,
@@ -41,19 +49,42 @@ async def create_student(student: StudentCreate, db: DataBase = Depends(get_db))
     created_student = db.create_student(db_student)
     return created_student
 
-@app.get("/students/", response_model=List[StudentCreate])
-async def read_all_students(db: DataBase = Depends(get_db)):
-    return db.get_all_students()
+@app.get("/students/")
+def read_all_students(
+    after_id: int = Query(0, ge=0, description="id последнего студента предыдущей страницы"),
+    limit: Optional[int] = Query(None, ge=1),
+    faculty: Optional[str] = None,
+    course: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: DataBase = Depends(get_db)
+):
+    # Ответ формируется по мере чтения строк из базы, вся таблица не загружается в память
+    students = db.iter_students(after_id, limit, faculty, course)
+
+    def ndjson():
+        for student in students:
+            yield json.dumps(student.to_dict(), ensure_ascii=False) + "\n"
+
+    def json_array():
+        separator = "["
+        for student in students:
+            yield separator + json.dumps(student.to_dict(), ensure_ascii=False)
+            separator = ","
+        yield "[]" if separator == "[" else "]"
+
+    if format == "ndjson":
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    return StreamingResponse(json_array(), media_type="application/json")
 
 @app.get("/students/{student_id}")
-async def read_student(student_id: int, db: DataBase = Depends(get_db)):
+def read_student(student_id: int, db: DataBase = Depends(get_db)):
     student = db.get_student_by_id(student_id)
     if student is None:
         raise HTTPException(status_code=404, detail="Student not found")
     return student
 
 @app.put("/students/{student_id}")
-async def update_student(student_id: int, student_update: StudentUpdate, db: DataBase = Depends(get_db)):
+def update_student(student_id: int, student_update: StudentUpdate, db: DataBase = Depends(get_db)):
     # Убираем None значения
     update_data = student_update.dict(exclude_unset=True)
 
@@ -64,7 +95,7 @@ async def update_student(student_id: int, student_update: StudentUpdate, db: Dat
     return updated_student
 
 @app.delete("/students/{student_id}")
-async def delete_student(student_id: int, db: DataBase = Depends(get_db)):
+def delete_student(student_id: int, db: DataBase = Depends(get_db)):
     success = db.delete_student(student_id)
     if not success:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -73,19 +104,19 @@ async def delete_student(student_id: int, db: DataBase = Depends(get_db)):
 
 
 @app.get("/students/faculty/{faculty}")
-async def get_students_by_faculty(faculty: str, db: DataBase = Depends(get_db)):
+def get_students_by_faculty(faculty: str, db: DataBase = Depends(get_db)):
     return db.get_by_faculty(faculty)
 
 
 @app.get("/courses/unique/")
-async def get_unique_courses(db: DataBase = Depends(get_db)):
+def get_unique_courses(db: DataBase = Depends(get_db)):
     return db.get_unic_course()
 
 
 @app.get("/faculty/average-grades/")
-async def get_faculty_average_grades(db: DataBase = Depends(get_db)):
+def get_faculty_average_grades(db: DataBase = Depends(get_db)):
     return db.get_facult_grade_avg()
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,132 @@
+from AsyncDataBase import AsyncDataBase
+from DataBase import DataBase
+from app import app, get_db
+from fastapi import FastAPI, Depends
+import argparse
+import asyncio
+import httpx
+import os
+import random
+import tempfile
+import time
+
+
+def blocking_app(db: DataBase) -> FastAPI:
+    """Первый вариант app.py: async-обработчики вызывают синхронный DataBase и блокируют цикл событий"""
+    blocking = FastAPI()
+
+    def get_sync_db():
+        return db
+
+    @blocking.get("/students/{student_id}")
+    async def read_student(student_id: int, db: DataBase = Depends(get_sync_db)):
+        return db.get_student_by_id(student_id)
+
+    @blocking.get("/faculty/average-grades/")
+    async def get_faculty_average_grades(db: DataBase = Depends(get_sync_db)):
+        return db.get_facult_grade_avg()
+
+    return blocking
+
+
+def async_app(db: AsyncDataBase) -> FastAPI:
+    """Те же обработчики на AsyncDataBase: запросы к SQLite выполняются aiosqlite в отдельном потоке"""
+    concurrent = FastAPI()
+
+    def get_async_db():
+        return db
+
+    @concurrent.get("/students/{student_id}")
+    async def read_student(student_id: int, db: AsyncDataBase = Depends(get_async_db)):
+        return await db.get_student_by_id(student_id)
+
+    @concurrent.get("/faculty/average-grades/")
+    async def get_faculty_average_grades(db: AsyncDataBase = Depends(get_async_db)):
+        return await db.get_facult_grade_avg()
+
+    return concurrent
+
+
+async def load(asgi_app: FastAPI, students: int, requests: int, clients: int, slow_share: float, seed: int) -> dict:
+    """clients одновременных клиентов выполняют requests запросов: доля slow_share - средние оценки по факультетам
+    (агрегат по всей таблице), остальные - студент по id. Возвращает пропускную способность и задержки быстрых запросов"""
+    rnd = random.Random(seed)
+    paths = ["/faculty/average-grades/" if rnd.random() < slow_share else f"/students/{rnd.randint(1, students)}"
+             for _ in range(requests)]
+    queue = iter(paths)
+    fast = []
+
+    async def client(http: httpx.AsyncClient):
+        for path in queue:
+            started = time.perf_counter()
+            response = await http.get(path)
+            response.raise_for_status()
+            if path.startswith("/students/"):
+                fast.append(time.perf_counter() - started)
+
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    fast.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50": fast[len(fast) // 2] if fast else 0.0,
+        "p95": fast[int(len(fast) * 0.95)] if fast else 0.0,
+    }
+
+
+def report(name: str, result: dict) -> None:
+    print(f"{name}: {result['throughput']:.0f} запросов/с, "
+          f"задержка по id p50 {1000 * result['p50']:.1f} мс, p95 {1000 * result['p95']:.1f} мс")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пропускная способность API: синхронный DataBase против AsyncDataBase")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=50, help="число одновременных клиентов")
+    parser.add_argument("--slow-share", type=float, default=0.05, help="доля запросов средних оценок")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "students.db")
+        sync_db = DataBase(f"sqlite:///{path}")
+        sync_db.create_db_and_tables()
+        rnd = random.Random(args.seed)
+        sync_db.bulk_create_students({
+            "first_name": f"Имя{i}", "last_name": f"Фамилия{i}", "faculty": f"Факультет {rnd.randint(1, 10)}",
+            "course": str(rnd.randint(1, 4)), "grade": rnd.randint(2, 5)
+        } for i in range(args.students))
+
+        def run(asgi_app: FastAPI) -> dict:
+            return asyncio.run(load(asgi_app, args.students, args.requests, args.clients, args.slow_share, args.seed))
+
+        results = {"DataBase в async-обработчиках (блокирующий)": run(blocking_app(sync_db))}
+
+        # app.py: синхронные обработчики в пуле потоков FastAPI
+        app.dependency_overrides[get_db] = lambda: sync_db
+        try:
+            results["DataBase в синхронных обработчиках (app.py)"] = run(app)
+        finally:
+            app.dependency_overrides.clear()
+
+        async def run_async():
+            async_db = AsyncDataBase(f"sqlite+aiosqlite:///{path}")
+            try:
+                return await load(async_app(async_db), args.students, args.requests, args.clients,
+                                  args.slow_share, args.seed)
+            finally:
+                await async_db.close_connection()
+
+        results["AsyncDataBase"] = asyncio.run(run_async())
+        sync_db.close_connection()
+
+    base = next(iter(results.values()))
+    for name, result in results.items():
+        report(name, result)
+        print(f"    относительно блокирующего: пропускная способность {result['throughput'] / base['throughput']:.2f}x, "
+              f"p95 задержки по id {result['p95'] / base['p95']:.2f}x")
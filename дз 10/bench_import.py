@@ -0,0 +1,70 @@
+from DataBase import DataBase
+from main import read_students
+from models import Student
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+
+def write_csv(path: str, rows: int, seed: int = 1) -> None:
+    """Случайный CSV в формате импорта main.py"""
+    rnd = random.Random(seed)
+    faculties = ["Информатика", "Физика", "Математика", "Экономика", "Химия"]
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Фамилия", "Имя", "Факультет", "Курс", "Оценка"])
+        for i in range(rows):
+            writer.writerow([f"Фамилия{i}", f"Имя{i}", rnd.choice(faculties), f"Курс {rnd.randint(1, 4)}",
+                             rnd.randint(2, 5)])
+
+
+def import_loop(db: DataBase, path: str) -> int:
+    """Прежний импорт: объект Student и отдельная транзакция create_student на каждую строку"""
+    count = 0
+    with open(path, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            db.create_student(Student(
+                first_name=row['Фамилия'],
+                last_name=row['Имя'],
+                faculty=row['Факультет'],
+                course=row.get('Курс'),
+                grade=int(row.get('Оценка'))
+            ))
+            count += 1
+    return count
+
+
+def measure(name: str, rows: int, run) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        db = DataBase(f"sqlite:///{os.path.join(directory, 'students.db')}")
+        db.create_db_and_tables()
+        started = time.perf_counter()
+        run(db)
+        elapsed = time.perf_counter() - started
+        db.close_connection()
+    print(f"{name}: {elapsed:.2f} с ({rows / elapsed:.0f} строк/с)")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Импорт студентов: create_student в цикле против bulk_create_students")
+    parser.add_argument("--rows", type=int, default=100000, help="число строк для пакетного импорта")
+    parser.add_argument("--loop-rows", type=int, default=2000, help="число строк для импорта в цикле")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        loop_path = os.path.join(directory, "loop.csv")
+        bulk_path = os.path.join(directory, "bulk.csv")
+        write_csv(loop_path, args.loop_rows)
+        write_csv(bulk_path, args.rows)
+
+        loop = measure(f"create_student в цикле, {args.loop_rows} строк", args.loop_rows,
+                       lambda db: import_loop(db, loop_path))
+        bulk = measure(f"bulk_create_students, {args.rows} строк", args.rows,
+                       lambda db: db.bulk_create_students(read_students(bulk_path), args.chunk_size))
+
+    print(f"Ускорение на строку: {(loop / args.loop_rows) / (bulk / args.rows):.0f}x")
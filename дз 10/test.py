@@ -1,5 +1,13 @@
+from AsyncDataBase import AsyncDataBase
 from DataBase import DataBase
+from main import read_students, record_lines
 from models import Student
+from sqlalchemy import event, text
+import asyncio
+import json
+import os
+import re
+import tempfile
 
 
 def test_database_with_student_table():
@@ -36,5 +44,242 @@ def test_database_with_student_table():
         print(f"   ❌ Ошибка: {e}")
 
 
+# Полный просмотр таблицы: "SCAN student" без индекса ("SCAN TABLE student" в старых версиях SQLite)
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?student$")
+
+
+def captured_queries(db: DataBase, call) -> list:
+    """SQL-запросы и параметры, которые выполняет call(db)"""
+    queries = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        queries.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        result = call(db)
+        if hasattr(result, "__next__"):
+            list(result)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+    return queries
+
+
+def test_query_plans():
+    """EXPLAIN QUERY PLAN для запросов DataBase: ни один не должен просматривать таблицу student целиком"""
+    print("=== ПЛАНЫ ЗАПРОСОВ ===")
+
+    db = DataBase('sqlite:///:memory:')
+    db.create_db_and_tables()
+    db.bulk_create_students({
+        "first_name": f"Имя{i}", "last_name": f"Фамилия{i}", "faculty": f"Факультет {i % 5}",
+        "course": str(i % 4 + 1), "grade": i % 4 + 2
+    } for i in range(200))
+
+    calls = {
+        "get_by_faculty": lambda db: db.get_by_faculty("Факультет 1"),
+        "get_unic_course": lambda db: db.get_unic_course(),
+        "get_facult_grade_avg": lambda db: db.get_facult_grade_avg(),
+        "iter_students(faculty)": lambda db: db.iter_students(faculty="Факультет 1"),
+        "iter_students(course)": lambda db: db.iter_students(course="2"),
+    }
+
+    full_scans = []
+    with db.engine.connect() as connection:
+        for name, call in calls.items():
+            for statement, parameters in captured_queries(db, call):
+                plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+                details = [row[3] for row in plan]
+                print(f"   {name}: {'; '.join(details)}")
+                if any(FULL_SCAN.match(detail) for detail in details):
+                    full_scans.append(name)
+
+    assert not full_scans, f"Полный просмотр таблицы student: {', '.join(full_scans)}"
+    print("   ✅ Все запросы используют индексы")
+
+
+def test_index_migration():
+    """Индексы добавляются в базу, созданную до их появления в модели"""
+    print("=== МИГРАЦИЯ ИНДЕКСОВ ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = DataBase(f"sqlite:///{os.path.join(directory, 'students.db')}")
+        with db.engine.begin() as connection:
+            # Схема students.db без вторичных индексов
+            connection.execute(text(
+                "CREATE TABLE student (id INTEGER NOT NULL, last_name VARCHAR(50) NOT NULL, "
+                "first_name VARCHAR(50) NOT NULL, faculty VARCHAR(50) NOT NULL, course VARCHAR(50) NOT NULL, "
+                "grade INTEGER NOT NULL, PRIMARY KEY (id))"
+            ))
+
+        db.create_db_and_tables()
+        with db.engine.connect() as connection:
+            indexes = set(connection.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'student'"
+            )).scalars())
+        db.close_connection()
+
+    assert {"ix_student_faculty", "ix_student_course", "ix_student_faculty_grade"} <= indexes, f"Индексы не созданы: {indexes}"
+    print(f"   ✅ Созданы индексы: {', '.join(sorted(indexes))}")
+
+
+def test_async_database():
+    """Методы AsyncDataBase на aiosqlite: добавление, чтение, изменение, удаление и выборки"""
+    print("=== ТЕСТ ASYNCDATABASE ===")
+
+    async def scenario(db: AsyncDataBase):
+        await db.create_db_and_tables()
+        created = []
+        for i in range(6):
+            created.append(await db.create_student(Student(
+                first_name=f"Имя{i}", last_name=f"Фамилия{i}", faculty=f"Факультет {i % 2}",
+                course=str(i % 3 + 1), grade=i % 4 + 2
+            )))
+        assert [student.id for student in created] == [1, 2, 3, 4, 5, 6]
+
+        student = await db.get_student_by_id(2)
+        assert (student.first_name, student.faculty, student.grade) == ("Имя1", "Факультет 1", 3)
+        assert await db.get_student_by_id(100) is None
+
+        updated = await db.update_student(2, {"grade": 5, "course": None})
+        assert (updated.grade, updated.course) == (5, "2")
+        assert (await db.get_student_by_id(2)).grade == 5
+        assert await db.update_student(100, {"grade": 5}) is None
+
+        assert await db.delete_student(3) is True
+        assert await db.delete_student(3) is False
+        assert await db.get_student_by_id(3) is None
+
+        assert sorted(s.id for s in await db.get_by_faculty("Факультет 1")) == [2, 4, 6]
+        assert sorted(await db.get_unic_course()) == ["1", "2", "3"]
+        averages = dict(await db.get_facult_grade_avg())
+        assert averages == {"Факультет 0": (2 + 2) / 2, "Факультет 1": (5 + 5 + 3) / 3}
+
+        assert [s.id async for s in db.iter_students()] == [1, 2, 4, 5, 6]
+        assert [s.id async for s in db.iter_students(after_id=2, limit=2)] == [4, 5]
+        assert [s.id async for s in db.iter_students(faculty="Факультет 0", batch_size=1)] == [1, 5]
+        assert [s.id async for s in db.iter_students(after_id=6)] == []
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = AsyncDataBase(f"sqlite+aiosqlite:///{os.path.join(directory, 'students.db')}")
+
+        async def run():
+            try:
+                await scenario(db)
+            finally:
+                await db.close_connection()
+
+        asyncio.run(run())
+    print("   ✅ Все методы AsyncDataBase работают")
+
+
+def test_bulk_create_errors():
+    """Ошибочные строки не прерывают загрузку: порция с ошибкой базы данных добавляется по одной строке"""
+    print("=== ТЕСТ ЗАГРУЗКИ С ОШИБКАМИ ===")
+
+    db = DataBase('sqlite:///:memory:')
+    db.create_db_and_tables()
+    rows = [{
+        "first_name": f"Имя{i}", "last_name": f"Фамилия{i}", "faculty": "Факультет", "course": "1", "grade": 4
+    } for i in range(1, 8)]
+    rows[1]["grade"] = "пять"  # ошибка проверки, строка 2 не попадает в порцию
+    rows[4]["course"] = None   # ошибка NOT NULL, порция со строкой 5 не вставляется целиком
+
+    progress = []
+    inserted, errors = db.bulk_create_students(rows, chunk_size=4, progress=lambda *state: progress.append(state))
+
+    assert inserted == 5
+    assert [number for number, _ in errors] == [2, 5]
+    assert "оценка" in errors[0][1] and "NOT NULL" in errors[1][1]
+    assert progress == [(3, 2), (5, 2)]
+    names = sorted(student.first_name for student in db.iter_students())
+    assert names == ["Имя1", "Имя3", "Имя4", "Имя6", "Имя7"]
+    print(f"   ✅ Добавлено {inserted}, ошибки в строках {', '.join(str(number) for number, _ in errors)}")
+
+
+def test_csv_error_lines():
+    """Номера строк ошибок в CSV-файле учитывают значения в кавычках на нескольких строках и пустые строки"""
+    print("=== НОМЕРА СТРОК CSV ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "students.csv")
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write('Фамилия,Имя,Факультет,Курс,Оценка\n'
+                       'Петров,Иван,"Информатика\nи математика",1,5\n'
+                       '\n'
+                       'Сидоров,Пётр,Физика,2,пять\n'
+                       'Иванова,Анна,Химия,3,4\n')
+
+        rows = list(read_students(path))
+        assert [row["grade"] for row in rows] == ["5", "пять", "4"]
+        assert record_lines(path, [1, 2, 3]) == {1: 2, 2: 5, 3: 6}
+        assert record_lines(path, []) == {}
+    print("   ✅ Номера строк верны")
+
+
+def test_students_stream_pages():
+    """GET /students/ отдаёт корректный JSON-массив и NDJSON, а страницы по after_id и limit не пересекаются
+    и не пропускают студентов"""
+    print("=== ПОСТРАНИЧНЫЙ ВЫВОД СТУДЕНТОВ ===")
+
+    from fastapi.testclient import TestClient
+    import app as student_app
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = DataBase(f"sqlite:///{os.path.join(directory, 'students.db')}")
+        db.create_db_and_tables()
+        db.bulk_create_students({
+            "first_name": f"Имя{i}", "last_name": f"Фамилия{i}", "faculty": f"Факультет {i % 3}",
+            "course": str(i % 4 + 1), "grade": i % 4 + 2
+        } for i in range(25))
+        # Удалённый студент оставляет пропуск в id, постраничный вывод его не замечает
+        db.delete_student(7)
+        all_ids = [student.id for student in db.iter_students()]
+
+        student_app.app.dependency_overrides[student_app.get_db] = lambda: db
+        try:
+            client = TestClient(student_app.app)
+
+            response = client.get("/students/")
+            assert response.headers["content-type"].startswith("application/json")
+            assert [student["id"] for student in json.loads(response.text)] == all_ids
+
+            response = client.get("/students/", params={"format": "ndjson", "faculty": "Факультет 1"})
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            students = [json.loads(line) for line in response.text.splitlines()]
+            assert students and all(student["faculty"] == "Факультет 1" for student in students)
+            assert [student["id"] for student in students] == [i for i in all_ids if (i - 1) % 3 == 1]
+
+            for page_format in ("json", "ndjson"):
+                pages, after_id = [], 0
+                while True:
+                    response = client.get("/students/", params={"after_id": after_id, "limit": 5, "format": page_format})
+                    assert response.status_code == 200
+                    if page_format == "json":
+                        page = [student["id"] for student in json.loads(response.text)]
+                    else:
+                        page = [json.loads(line)["id"] for line in response.text.splitlines()]
+                    pages.append(page)
+                    if not page:
+                        break
+                    after_id = page[-1]
+                # Последняя непустая страница неполная, за ней следует пустая
+                assert [len(page) for page in pages] == [5] * 4 + [4, 0]
+                assert [i for page in pages for i in page] == all_ids
+
+            assert client.get("/students/", params={"after_id": all_ids[-1]}).text == "[]"
+            assert client.get("/students/", params={"limit": 0}).status_code == 422
+        finally:
+            student_app.app.dependency_overrides.clear()
+            db.close_connection()
+    print("   ✅ Страницы не пересекаются и не пропускают студентов")
+
+
 if __name__ == "__main__":
-    test_database_with_student_table()
\ No newline at end of file
+    test_database_with_student_table()
+    test_query_plans()
+    test_index_migration()
+    test_async_database()
+    test_bulk_create_errors()
+    test_csv_error_lines()
+    test_students_stream_pages()
\ No newline at end of file
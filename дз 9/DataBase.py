@@ -1,8 +1,9 @@
-from typing import List, Tuple
-from sqlalchemy import create_engine, select, func
+from typing import Callable, Iterable, List, Tuple, Optional
+from sqlalchemy import create_engine, select, func, insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
-from models import Student, Base
+from models import Student, Base, create_indexes
 
 
 class DataBase:
@@ -15,7 +16,9 @@ class DataBase:
 
     def create_db_and_tables(self) -> None:
         try:
-            Base.metadata.create_all(self.engine)
+            with self.engine.begin() as connection:
+                Base.metadata.create_all(connection)
+                create_indexes(connection)
             print("База данных и таблицы успешно созданы!")
         except Exception as e:
             print(f"Ошибка при создании базы данных: {e}")
@@ -36,6 +39,72 @@ class DataBase:
         with self.get_session() as session:
             session.add(student)
 
+    def bulk_create_students(self, rows: Iterable[dict], chunk_size: int = 10000,
+                             progress: Optional[Callable[[int, int], None]] = None) -> Tuple[int, List[Tuple[int, str]]]:
+        """Добавление студентов из rows (словари с полями модели Student) порциями по chunk_size строк.
+
+        Каждая порция вставляется одним executemany insert() в одной транзакции. Некорректная строка
+        не прерывает загрузку: она пропускается и попадает в список ошибок (номер строки с 1, текст ошибки).
+        После каждой порции вызывается progress(добавлено, ошибок).
+        Возвращает число добавленных студентов и список ошибок.
+        """
+        if chunk_size < 1:
+            raise ValueError("Размер порции должен быть положительным")
+
+        inserted = 0
+        errors = []
+        chunk = []
+        for number, row in enumerate(rows, start=1):
+            try:
+                chunk.append((number, self._student_values(row)))
+            except ValueError as e:
+                errors.append((number, str(e)))
+
+            if len(chunk) >= chunk_size:
+                inserted += self._insert_chunk(chunk, errors)
+                chunk = []
+                if progress is not None:
+                    progress(inserted, len(errors))
+
+        if chunk:
+            inserted += self._insert_chunk(chunk, errors)
+        if progress is not None:
+            progress(inserted, len(errors))
+        return inserted, errors
+
+    @staticmethod
+    def _student_values(row: dict) -> dict:
+        values = {}
+        for field in ("first_name", "last_name", "faculty"):
+            if not row.get(field):
+                raise ValueError(f"Не заполнено поле {field}")
+            values[field] = row[field]
+        values["course"] = row.get("course")
+
+        try:
+            values["grade"] = int(row.get("grade"))
+        except (TypeError, ValueError):
+            raise ValueError(f"Некорректная оценка: {row.get('grade')!r}")
+        return values
+
+    def _insert_chunk(self, chunk: List[Tuple[int, dict]], errors: List[Tuple[int, str]]) -> int:
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(insert(Student), [values for _, values in chunk])
+            return len(chunk)
+        except SQLAlchemyError:
+            pass
+
+        # Порция не вставилась целиком: добавляем строки по одной, чтобы найти ошибочные
+        inserted = 0
+        for number, values in chunk:
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(insert(Student), values)
+                inserted += 1
+            except SQLAlchemyError as e:
+                errors.append((number, str(getattr(e, "orig", e))))
+        return inserted
 
     def get_by_faculty(self, faculty: str) -> List[Student]:
         with self.get_session() as session:
@@ -1,31 +1,47 @@
-from models import Student
 from DataBase import DataBase
+import argparse
 import csv
 
 csv_file_path = 'C:\\Users\\eleon\\Downloads\\students.csv'
 
-try:
-    students = []
-    with open(csv_file_path, 'r', encoding='utf-8') as file:
-        csv_reader = csv.DictReader(file)
 
-        for row in csv_reader:
+def read_students(path: str):
+    """Построчное чтение CSV: строки не накапливаются в памяти, а сразу передаются в базу порциями"""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            yield {
+                'first_name': row.get('Фамилия'),
+                'last_name': row.get('Имя'),
+                'faculty': row.get('Факультет'),
+                'course': row.get('Курс'),
+                'grade': row.get('Оценка')
+            }
 
-            student = Student(
-                first_name=row['Фамилия'],
-                last_name=row['Имя'],
-                faculty=(row['Факультет']),
-                course=row.get('Курс'),
-                grade = int(row.get('Оценка'))
-            )
-            students.append(student)
 
-    db = DataBase()
-    db.create_db_and_tables()
-    for i in students:
-        db.create_student(i)
+def show_progress(inserted: int, errors: int) -> None:
+    print(f"\rДобавлено студентов: {inserted}, ошибок: {errors}", end='', flush=True)
 
-    print(f"Успешно добавлено {len(students)} студентов в базу")
 
-except Exception as e:
-    print(f"Ошибка: {e}")
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Импорт студентов из CSV-файла")
+    parser.add_argument("csv_file", nargs="?", default=csv_file_path)
+    parser.add_argument("--chunk-size", type=int, default=10000, help="число строк в одной транзакции")
+    parser.add_argument("--max-errors", type=int, default=20, help="сколько ошибочных строк вывести")
+    args = parser.parse_args()
+
+    try:
+        db = DataBase()
+        db.create_db_and_tables()
+        inserted, errors = db.bulk_create_students(read_students(args.csv_file), args.chunk_size, show_progress)
+        print()
+
+        # Номер строки в файле на 1 больше номера записи из-за строки заголовка
+        for number, message in errors[:args.max_errors]:
+            print(f"Строка {number + 1}: {message}")
+        if len(errors) > args.max_errors:
+            print(f"... и ещё {len(errors) - args.max_errors} ошибок")
+
+        print(f"Успешно добавлено {inserted} студентов в базу")
+
+    except Exception as e:
+        print(f"Ошибка: {e}")